@@ -3,15 +3,39 @@ BIFPCL Admin Configuration - User-friendly admin panel.
 Includes all models with enhanced UI, search, filters, and actions.
 """
 
+import io
+import json
+from datetime import MAXYEAR, MINYEAR, date, datetime
+
+from django import forms
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.admin import AdminSite
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.auth import get_permission_codename
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.db.models.deletion import ProtectedError, RestrictedError
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.db.models import Count
 from .models import (
     Tender, News, Career, ContactMessage, ProjectStat,
     BoardMember, Project, Milestone, SustainabilityStat, CSRInitiative,
-    JobApplication
+    JobApplication, Notification, Task, ArchivedRecord, OPEN
 )
+from .dashboard import get_dashboard_stats, invalidate_dashboard_stats
+from .portfolio import invalidate_portfolio_summary
+from .files import StreamingUploadHandler
+from .importers import TenderImporter, detect_format, format_errors
+from .deletion import BatchedDeletion, cascade_plan, check_protected, count_rows
+from .tasks import delete_rows, recount_career_applications
 
 
 # ==================== Custom Admin Site ====================
@@ -26,15 +50,8 @@ class BIFPCLAdminSite(AdminSite):
         """Add dashboard statistics to admin index."""
         extra_context = extra_context or {}
         
-        # Dashboard statistics
-        extra_context['stats'] = {
-            'tenders': Tender.objects.filter(is_active=True).count(),
-            'news': News.objects.filter(is_active=True).count(),
-            'careers': Career.objects.filter(is_active=True).count(),
-            'messages': ContactMessage.objects.filter(is_read=False).count(),
-            'projects': Project.objects.filter(is_active=True).count(),
-            'board_members': BoardMember.objects.filter(is_active=True).count(),
-        }
+        # Dashboard statistics (one aggregate query, served from cache)
+        extra_context['stats'] = get_dashboard_stats()
         
         return super().index(request, extra_context)
 
@@ -50,21 +67,226 @@ class ActiveStatusMixin:
     
     @admin.action(description='✅ Activate selected items')
     def make_active(self, request, queryset):
-        count = queryset.update(is_active=True)
+        count = queryset.update(is_active=True, updated_at=timezone.now())
+        invalidate_dashboard_stats()
+        if queryset.model is Project:
+            invalidate_portfolio_summary()
         self.message_user(request, f'✅ {count} item(s) activated successfully.')
     
     @admin.action(description='❌ Deactivate selected items')
     def make_inactive(self, request, queryset):
-        count = queryset.update(is_active=False)
+        count = queryset.update(is_active=False, updated_at=timezone.now())
+        invalidate_dashboard_stats()
+        if queryset.model is Project:
+            invalidate_portfolio_summary()
         self.message_user(request, f'❌ {count} item(s) deactivated.')
 
 
+class BatchedDeleteMixin:
+    """
+    Deletes through api.deletion instead of Django's collector. The confirmation page shows
+    row counts instead of listing every related object; deletions bigger than one batch
+    hide the rows at once and are finished by a background task. Admins whose rows have no
+    is_active toggle of their own set hide_inactive so hidden rows leave the changelist.
+    """
+
+    hide_inactive = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.filter(is_active=True) if self.hide_inactive else queryset
+
+    def get_deleted_objects(self, objs, request):
+        queryset = objs if isinstance(objs, models.QuerySet) else self.model._base_manager.filter(pk__in=[o.pk for o in objs])
+        counts = {model: count for model, count in count_rows(queryset).items() if count}
+        perms_needed = {
+            model._meta.verbose_name for model in counts
+            if not request.user.has_perm(f'{model._meta.app_label}.{get_permission_codename("delete", model._meta)}')
+        }
+        try:
+            check_protected(queryset, cascade_plan(self.model))
+            protected = []
+        except (ProtectedError, RestrictedError) as exc:
+            protected = [exc.args[0]]
+        summary = [f'{count} {model._meta.verbose_name_plural}' for model, count in counts.items()]
+        return summary, {model._meta.verbose_name_plural: count for model, count in counts.items()}, perms_needed, protected
+
+    def delete_model(self, request, obj):
+        self.delete_batched(request, [obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        self.delete_batched(request, list(queryset.values_list('pk', flat=True)))
+
+    def delete_batched(self, request, pks):
+        queryset = self.model._base_manager.filter(pk__in=pks)
+        if sum(count_rows(queryset).values()) <= settings.DELETE_BATCH_SIZE:
+            BatchedDeletion(queryset, settings.DELETE_BATCH_SIZE).run()
+            return
+        queryset.update(is_active=False, updated_at=timezone.now())
+        task = delete_rows.enqueue(self.model._meta.label_lower, pks)
+        self.message_user(request, format_html(
+            '🗑️ Hidden now; the rest is deleted in the background as <a href="{}">task #{}</a>.',
+            reverse('admin:api_task_change', args=[task.pk]), task.pk
+        ))
+
+
+# ==================== Scale Mode ====================
+
+class EstimatedCountPaginator(Paginator):
+    """Use the planner's row estimate instead of COUNT(*) once a result set is large."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if connections[queryset.db].vendor == 'postgresql':
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            estimate = int(plan[0]['Plan']['Plan Rows'])
+            if estimate >= settings.ADMIN_EXACT_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class DateDrilldownFilter(admin.FieldListFilter):
+    """
+    Year -> month drill-down for a date field.
+    Replaces date_hierarchy, which runs a DISTINCT date scan over the whole table;
+    this needs only an index-served MIN/MAX (cached) and range filters.
+    """
+    bounds_timeout = 600
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.year_param = f'{field_path}__year'
+        self.month_param = f'{field_path}__month'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.year = self._int_param(self.year_param)
+        self.month = self._int_param(self.month_param) if self.year else None
+        # MINYEAR itself is excluded: its local midnight can fall before datetime.min in UTC.
+        if self.year is not None and not MINYEAR < self.year < MAXYEAR:
+            raise IncorrectLookupParameters(f'{self.year_param} must be between {MINYEAR + 1} and {MAXYEAR - 1}.')
+        if self.month is not None and not 1 <= self.month <= 12:
+            raise IncorrectLookupParameters(f'{self.month_param} must be between 1 and 12.')
+
+    def _int_param(self, name):
+        value = self.used_parameters.get(name)
+        if isinstance(value, list):
+            value = value[-1] if value else None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def expected_parameters(self):
+        return [self.year_param, self.month_param]
+
+    def _boundary(self, year, month):
+        if isinstance(self.field, models.DateTimeField):
+            return timezone.make_aware(datetime(year, month, 1))
+        return date(year, month, 1)
+
+    def queryset(self, request, queryset):
+        if not self.year:
+            return queryset
+        if self.month:
+            start = self._boundary(self.year, self.month)
+            end = self._boundary(self.year + self.month // 12, self.month % 12 + 1)
+        else:
+            start = self._boundary(self.year, 1)
+            end = self._boundary(self.year + 1, 1)
+        return queryset.filter(**{f'{self.field_path}__gte': start, f'{self.field_path}__lt': end})
+
+    def _year_bounds(self, model):
+        key = f'admin:drilldown:{model._meta.label_lower}:{self.field_path}'
+        bounds = cache.get(key)
+        if bounds is None:
+            # Two index-edge lookups: SQLite scans the whole index for MIN and MAX in one query.
+            values = model._default_manager.exclude(**{f'{self.field_path}__isnull': True}).values_list(
+                self.field_path, flat=True
+            )
+            bounds = {
+                'first': values.order_by(self.field_path).first(),
+                'last': values.order_by(f'-{self.field_path}').first(),
+            }
+            cache.set(key, bounds, self.bounds_timeout)
+        if bounds['first'] is None:
+            return []
+        return range(bounds['last'].year, bounds['first'].year - 1, -1)
+
+    def choices(self, changelist):
+        yield {
+            'selected': not self.year,
+            'query_string': changelist.get_query_string(remove=[self.year_param, self.month_param]),
+            'display': 'Any date',
+        }
+        if not self.year:
+            for year in self._year_bounds(changelist.model):
+                yield {
+                    'selected': False,
+                    'query_string': changelist.get_query_string({self.year_param: year}, [self.month_param]),
+                    'display': str(year),
+                }
+            return
+        yield {
+            'selected': not self.month,
+            'query_string': changelist.get_query_string({self.year_param: self.year}, [self.month_param]),
+            'display': f'All of {self.year}',
+        }
+        for month in range(1, 13):
+            yield {
+                'selected': month == self.month,
+                'query_string': changelist.get_query_string({self.year_param: self.year, self.month_param: month}),
+                'display': date(self.year, month, 1).strftime('%B %Y'),
+            }
+
+
+class ScaleModeMixin:
+    """
+    Changelist settings for very large tables, enabled with ADMIN_SCALE_MODE.
+    Counts come from planner statistics and date_hierarchy becomes a DateDrilldownFilter.
+    """
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        if settings.ADMIN_SCALE_MODE:
+            self.paginator = EstimatedCountPaginator
+            self.show_full_result_count = False
+            if self.date_hierarchy:
+                field = self.date_hierarchy
+                self.date_hierarchy = None
+                self.list_filter = [
+                    (item, DateDrilldownFilter) if item == field else item
+                    for item in self.list_filter
+                ]
+
+
 # ==================== Tender Admin ====================
 
+class TenderImportForm(forms.Form):
+    """Upload form for the ERP tender dump."""
+    file = forms.FileField(help_text='CSV, JSON array (.json) or JSON Lines (.jsonl) export.')
+    deactivate_missing = forms.BooleanField(
+        required=False, initial=True,
+        help_text='Deactivate tenders that are not in this file (full dumps only).',
+    )
+
+
+class TenderDocumentForm(forms.Form):
+    """Upload form for a tender's bidding document."""
+    file = forms.FileField(required=False, help_text='PDF or ZIP. Identical files are stored only once.')
+    remove = forms.BooleanField(required=False, help_text='Detach the current document.')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('file') and not cleaned_data.get('remove'):
+            raise forms.ValidationError('Choose a file to upload or tick "remove".')
+        return cleaned_data
+
+
 @admin.register(Tender)
-class TenderAdmin(ActiveStatusMixin, admin.ModelAdmin):
+class TenderAdmin(ScaleModeMixin, ActiveStatusMixin, admin.ModelAdmin):
+    change_list_template = 'admin/api/tender/change_list.html'
     list_display = ['reference_number', 'title_short', 'category_badge', 'deadline', 'status_badge', 'is_active']
-    list_filter = ['category', 'is_active', 'deadline', 'created_at']
+    list_filter = ['status', 'category', 'is_active', 'deadline', 'created_at']
+    readonly_fields = ['status', 'document_info', 'download_count']
     search_fields = ['title', 'reference_number', 'description']
     ordering = ['-deadline']
     list_per_page = 20
@@ -78,8 +300,11 @@ class TenderAdmin(ActiveStatusMixin, admin.ModelAdmin):
         ('📝 Details', {
             'fields': ('description', 'document_url')
         }),
+        ('📎 Document', {
+            'fields': ('document_info', 'download_count')
+        }),
         ('📅 Timeline', {
-            'fields': ('deadline',)
+            'fields': ('deadline', 'status')
         }),
         ('⚙️ Status', {
             'fields': ('is_active',),
@@ -105,18 +330,99 @@ class TenderAdmin(ActiveStatusMixin, admin.ModelAdmin):
             obj.get_category_display()
         )
     
-    @admin.display(description='Status')
+    @admin.display(description='Status', ordering='status')
     def status_badge(self, obj):
-        from django.utils import timezone
-        if obj.deadline > timezone.now():
+        if obj.status == OPEN:
             return format_html('<span style="color: #22c55e; font-weight: bold;">🟢 Open</span>')
         return format_html('<span style="color: #ef4444; font-weight: bold;">🔴 Closed</span>')
 
+    @admin.display(description='Document')
+    def document_info(self, obj):
+        if obj.pk is None:
+            return 'Save the tender first, then upload its document.'
+        upload_url = reverse('admin:api_tender_document', args=[obj.pk])
+        if obj.document is None:
+            return format_html('<a href="{}">📤 Upload document</a>', upload_url)
+        return format_html(
+            '<a href="{}">📎 {} ({} MB)</a> &nbsp; <a href="{}">Replace</a>',
+            reverse('tender-document', args=[obj.pk]), obj.document,
+            round(obj.document.size / (1024 * 1024), 1), upload_url
+        )
+
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='api_tender_import'),
+            path('<path:object_id>/document/', self.admin_site.admin_view(self.document_view),
+                 name='api_tender_document'),
+        ]
+        return urls + super().get_urls()
+
+    @csrf_exempt
+    def document_view(self, request, object_id):
+        # Upload handlers must be replaced before the CSRF check reads request.POST,
+        # so CSRF is enforced inside instead (see Django's upload handler docs).
+        handler = StreamingUploadHandler(request, settings.TENDER_DOCUMENT_MAX_SIZE, settings.TENDER_DOCUMENT_TYPES)
+        request.upload_handlers = [handler]
+        return csrf_protect(self._document_view)(request, object_id, handler)
+
+    def _document_view(self, request, object_id, handler):
+        """Stream a bidding document to content-addressed storage and attach it."""
+        tender = self.get_object(request, object_id)
+        if tender is None or not self.has_change_permission(request, tender):
+            return redirect('admin:api_tender_changelist')
+
+        form = TenderDocumentForm(request.POST or None, request.FILES or None)
+        for error in handler.errors.get('file', []):
+            form.add_error('file', error)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            tender.document = upload.store() if upload else None
+            tender.save(update_fields=['document', 'updated_at'])
+            self.message_user(request, f'📎 Document {"attached" if upload else "removed"} for {tender.reference_number}.')
+            return redirect('admin:api_tender_change', tender.pk)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'original': tender,
+            'form': form,
+            'title': f'Document for {tender.reference_number}',
+        }
+        return TemplateResponse(request, 'admin/api/tender/document_form.html', context)
+
+    def import_view(self, request):
+        """Upload an ERP dump and upsert tenders from it."""
+        if not self.has_change_permission(request) or not self.has_add_permission(request):
+            return redirect('admin:api_tender_changelist')
+
+        form = TenderImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            importer = TenderImporter(deactivate_missing=form.cleaned_data['deactivate_missing'])
+            stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            try:
+                report = importer.run(stream, detect_format(upload.name))
+            except ValueError as exc:
+                self.message_user(request, f'❌ Import failed: {exc}', level='error')
+            else:
+                self.message_user(request, f'📥 {report.summary()}.')
+                for line, reference, errors in report.rejects[:20]:
+                    self.message_user(request, f'Line {line} ({reference or "no reference"}): {format_errors(errors)}', level='warning')
+                return redirect('admin:api_tender_changelist')
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'form': form,
+            'title': 'Import tenders',
+        }
+        return TemplateResponse(request, 'admin/api/tender/import_form.html', context)
+
 
 # ==================== News Admin ====================
 
 @admin.register(News)
-class NewsAdmin(ActiveStatusMixin, admin.ModelAdmin):
+class NewsAdmin(ScaleModeMixin, ActiveStatusMixin, admin.ModelAdmin):
     list_display = ['title', 'featured_badge', 'created_at', 'is_active']
     list_filter = ['is_featured', 'is_active', 'created_at']
     search_fields = ['title', 'content', 'summary']
@@ -158,14 +464,16 @@ class NewsAdmin(ActiveStatusMixin, admin.ModelAdmin):
 # ==================== Career Admin ====================
 
 @admin.register(Career)
-class CareerAdmin(ActiveStatusMixin, admin.ModelAdmin):
-    list_display = ['title', 'department', 'job_type_badge', 'location', 'vacancies', 'deadline', 'is_active']
-    list_filter = ['department', 'job_type', 'is_active', 'location']
+class CareerAdmin(ScaleModeMixin, ActiveStatusMixin, BatchedDeleteMixin, admin.ModelAdmin):
+    list_display = ['title', 'department', 'job_type_badge', 'location', 'vacancies', 'deadline', 'status',
+                    'application_count', 'unreviewed_application_count', 'is_active']
+    list_filter = ['status', 'department', 'job_type', 'is_active', 'location']
     search_fields = ['title', 'description', 'requirements', 'department']
     ordering = ['-created_at']
     list_per_page = 20
     list_editable = ['vacancies']
-    actions = ['make_active', 'make_inactive']
+    readonly_fields = ['status', 'application_count', 'unreviewed_application_count', 'last_application_at']
+    actions = ['make_active', 'make_inactive', 'recount_applications']
     
     fieldsets = (
         ('💼 Job Information', {
@@ -175,7 +483,10 @@ class CareerAdmin(ActiveStatusMixin, admin.ModelAdmin):
             'fields': ('description', 'requirements')
         }),
         ('📊 Vacancy Details', {
-            'fields': ('vacancies', 'deadline')
+            'fields': ('vacancies', 'deadline', 'status')
+        }),
+        ('📨 Applications', {
+            'fields': ('application_count', 'unreviewed_application_count', 'last_application_at')
         }),
         ('⚙️ Status', {
             'fields': ('is_active',),
@@ -197,11 +508,18 @@ class CareerAdmin(ActiveStatusMixin, admin.ModelAdmin):
             obj.get_job_type_display()
         )
 
+    @admin.action(description='🔢 Recount applications (background)')
+    def recount_applications(self, request, queryset):
+        task = recount_career_applications.enqueue(list(queryset.values_list('pk', flat=True)))
+        self.message_user(request, format_html(
+            '🔢 Recount queued as <a href="{}">task #{}</a>.', reverse('admin:api_task_change', args=[task.pk]), task.pk
+        ))
+
 
 # ==================== Contact Message Admin ====================
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(ScaleModeMixin, BatchedDeleteMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'read_status', 'created_at']
     list_filter = ['is_read', 'created_at']
     search_fields = ['name', 'email', 'subject', 'message']
@@ -210,6 +528,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_per_page = 30
     date_hierarchy = 'created_at'
     actions = ['mark_as_read', 'mark_as_unread']
+    hide_inactive = True
     
     fieldsets = (
         ('👤 Sender Information', {
@@ -231,12 +550,14 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     @admin.action(description='✓ Mark as Read')
     def mark_as_read(self, request, queryset):
-        count = queryset.update(is_read=True)
+        count = queryset.update(is_read=True, updated_at=timezone.now())
+        invalidate_dashboard_stats()
         self.message_user(request, f'✓ {count} message(s) marked as read.')
     
     @admin.action(description='Mark as Unread')
     def mark_as_unread(self, request, queryset):
-        count = queryset.update(is_read=False)
+        count = queryset.update(is_read=False, updated_at=timezone.now())
+        invalidate_dashboard_stats()
         self.message_user(request, f'{count} message(s) marked as unread.')
     
     def has_add_permission(self, request):
@@ -444,17 +765,39 @@ class CSRInitiativeAdmin(ActiveStatusMixin, admin.ModelAdmin):
 
 # ==================== Job Application Admin ====================
 
+class OpenCareerListFilter(admin.SimpleListFilter):
+    """
+    Career filter listing the newest open careers instead of every row in the table.
+    A career chosen through the URL (e.g. a closed one) is added so it shows as selected.
+    """
+    title = 'career'
+    parameter_name = 'career__id__exact'
+    max_choices = 30
+
+    def lookups(self, request, model_admin):
+        careers = list(Career.objects.open().order_by('-created_at').values_list('id', 'title')[:self.max_choices])
+        selected = self.value()
+        if selected and selected.isdigit() and all(str(pk) != selected for pk, _ in careers):
+            careers += Career.objects.filter(pk=selected).values_list('id', 'title')
+        return careers
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(career_id=self.value())
+        return queryset
+
 @admin.register(JobApplication)
-class JobApplicationAdmin(admin.ModelAdmin):
+class JobApplicationAdmin(ScaleModeMixin, BatchedDeleteMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'career_title', 'experience_years', 'review_status', 'created_at']
-    list_filter = ['is_reviewed', 'career', 'created_at']
+    list_filter = ['is_reviewed', OpenCareerListFilter, ('created_at', DateDrilldownFilter)]
+    list_select_related = ['career']
     search_fields = ['name', 'email', 'phone', 'current_position', 'career__title']
-    readonly_fields = ['name', 'email', 'phone', 'cover_letter', 'resume_url', 
+    readonly_fields = ['name', 'email', 'phone', 'cover_letter', 'resume_url', 'resume_download',
                        'experience_years', 'current_position', 'career', 'created_at']
     ordering = ['-created_at']
     list_per_page = 30
-    date_hierarchy = 'created_at'
     actions = ['mark_as_reviewed', 'mark_as_unreviewed']
+    hide_inactive = True
     
     fieldsets = (
         ('👤 Applicant Information', {
@@ -464,7 +807,7 @@ class JobApplicationAdmin(admin.ModelAdmin):
             'fields': ('career', 'experience_years')
         }),
         ('📝 Application Details', {
-            'fields': ('cover_letter', 'resume_url')
+            'fields': ('cover_letter', 'resume_url', 'resume_download')
         }),
         ('📅 Metadata', {
             'fields': ('created_at', 'is_reviewed')
@@ -475,6 +818,15 @@ class JobApplicationAdmin(admin.ModelAdmin):
     def career_title(self, obj):
         return obj.career.title
     
+    @admin.display(description='Resume file')
+    def resume_download(self, obj):
+        if obj.resume_file is None:
+            return '-'
+        return format_html(
+            '<a href="{}">📎 Download ({} KB)</a>',
+            reverse('application-resume', args=[obj.pk]), max(1, obj.resume_file.size // 1024)
+        )
+    
     @admin.display(description='Status')
     def review_status(self, obj):
         if obj.is_reviewed:
@@ -483,13 +835,114 @@ class JobApplicationAdmin(admin.ModelAdmin):
     
     @admin.action(description='✓ Mark as Reviewed')
     def mark_as_reviewed(self, request, queryset):
-        count = queryset.update(is_reviewed=True)
+        count = queryset.set_reviewed(True)
+        invalidate_dashboard_stats()
         self.message_user(request, f'✓ {count} application(s) marked as reviewed.')
     
     @admin.action(description='Mark as Unreviewed')
     def mark_as_unreviewed(self, request, queryset):
-        count = queryset.update(is_reviewed=False)
+        count = queryset.set_reviewed(False)
+        invalidate_dashboard_stats()
         self.message_user(request, f'{count} application(s) marked as unreviewed.')
     
     def has_add_permission(self, request):
         return False  # Applications are from frontend only
+
+
+# ==================== Notification Admin ====================
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'kind', 'delivery_status', 'attempts', 'next_attempt_at', 'created_at']
+    list_filter = ['status', 'kind', 'created_at']
+    search_fields = ['subject', 'reply_to']
+    readonly_fields = ['kind', 'object_id', 'recipients', 'reply_to', 'subject', 'body', 'status', 'attempts',
+                       'next_attempt_at', 'last_error', 'created_at', 'sent_at']
+    ordering = ['-created_at']
+    list_per_page = 50
+    actions = ['retry_now']
+
+    @admin.display(description='Status')
+    def delivery_status(self, obj):
+        colors = {Notification.PENDING: '#f59e0b', Notification.SENT: '#22c55e', Notification.FAILED: '#ef4444'}
+        return format_html('<span style="color: {}; font-weight: bold;">{}</span>',
+                           colors.get(obj.status, '#6b7280'), obj.get_status_display())
+
+    @admin.action(description='📧 Retry now')
+    def retry_now(self, request, queryset):
+        count = queryset.exclude(status=Notification.SENT).update(
+            status=Notification.PENDING, next_attempt_at=timezone.now(), claim_token=None
+        )
+        self.message_user(request, f'📧 {count} notification(s) queued for the next send_notifications pass.')
+
+    def has_add_permission(self, request):
+        return False  # Written by the contact and application signals only
+
+
+# ==================== Background Task Admin ====================
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'task_status', 'progress_bar', 'priority', 'attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'dedupe_key']
+    readonly_fields = ['name', 'args', 'kwargs', 'priority', 'status', 'run_at', 'attempts', 'max_attempts',
+                       'dedupe_key', 'claimed_by', 'lease_until', 'progress', 'progress_message', 'result',
+                       'error', 'created_at', 'started_at', 'finished_at']
+    ordering = ['-created_at']
+    list_per_page = 50
+    actions = ['retry_tasks', 'cancel_tasks']
+
+    @admin.display(description='Status')
+    def task_status(self, obj):
+        colors = {Task.QUEUED: '#6b7280', Task.RUNNING: '#3b82f6', Task.SUCCEEDED: '#22c55e',
+                  Task.FAILED: '#ef4444', Task.CANCELLED: '#9ca3af'}
+        return format_html('<span style="color: {}; font-weight: bold;">{}</span>',
+                           colors.get(obj.status, '#6b7280'), obj.get_status_display())
+
+    @admin.display(description='Progress')
+    def progress_bar(self, obj):
+        # Live value: GET /api/tasks/<id>/ (one primary-key lookup) is cheap enough to poll.
+        return format_html(
+            '<progress value="{}" max="100" title="{}"></progress> {}%', obj.progress, obj.progress_message, obj.progress
+        )
+
+    @admin.action(description='↻ Retry')
+    def retry_tasks(self, request, queryset):
+        count = queryset.filter(status__in=[Task.FAILED, Task.CANCELLED]).update(
+            # Without its dedupe key: a newer run may already hold it.
+            status=Task.QUEUED, run_at=timezone.now(), attempts=0, error='', finished_at=None, dedupe_key=None
+        )
+        self.message_user(request, f'↻ {count} task(s) queued again.')
+
+    @admin.action(description='✕ Cancel queued')
+    def cancel_tasks(self, request, queryset):
+        count = queryset.filter(status=Task.QUEUED).update(status=Task.CANCELLED, finished_at=timezone.now())
+        self.message_user(request, f'✕ {count} task(s) cancelled.')
+
+    def has_add_permission(self, request):
+        return False  # Queued from code (api.tasks)
+
+
+# ==================== Archive Admin ====================
+
+@admin.register(ArchivedRecord)
+class ArchivedRecordAdmin(admin.ModelAdmin):
+    list_display = ['email', 'model', 'object_id', 'original_created_at', 'archived_at']
+    list_filter = ['model']
+    search_fields = ['=email', '=object_id']  # Exact matches only: both are indexed
+    readonly_fields = ['model', 'object_id', 'email', 'original_created_at', 'archived_at', 'attachment', 'archived_data']
+    exclude = ['data']
+    ordering = ['-original_created_at']
+    list_per_page = 50
+    show_full_result_count = False
+
+    @admin.display(description='Archived row')
+    def archived_data(self, obj):
+        return format_html('<pre style="white-space: pre-wrap;">{}</pre>', json.dumps(obj.payload, indent=2))
+
+    def has_add_permission(self, request):
+        return False  # Written by archive_submissions only
+
+    def has_change_permission(self, request, obj=None):
+        return False
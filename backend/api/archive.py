@@ -0,0 +1,64 @@
+"""
+Archival of old contact messages and job applications.
+Rows older than ARCHIVE_AFTER_DAYS that staff have already handled (read / reviewed)
+are copied into ArchivedRecord as compressed JSON and deleted from the hot table, a
+small batch per transaction, so inbox lists and counts only scan recent rows.
+"""
+
+from django.db import connections, transaction
+from django.db.models import Q
+
+from .models import ArchivedRecord, Career, ContactMessage, JobApplication, Tombstone
+
+
+# Model -> rows that may be archived once old enough
+ARCHIVE_RULES = {
+    ContactMessage: Q(is_read=True),
+    JobApplication: Q(is_reviewed=True),
+}
+
+# ?model= values of the lookup API
+ARCHIVE_MODEL_NAMES = {'contact': ContactMessage, 'application': JobApplication}
+
+
+def eligible(model, cutoff):
+    return model.objects.filter(ARCHIVE_RULES[model], created_at__lt=cutoff).order_by('created_at', 'pk')
+
+
+def to_record(row):
+    payload = {field.attname: field.value_from_object(row) for field in row._meta.concrete_fields}
+    if isinstance(row, JobApplication):
+        payload['career_title'] = row.career.title  # The career may be gone by the time anyone looks
+    return ArchivedRecord(
+        model=row._meta.label_lower,
+        object_id=row.pk,
+        email=row.email,
+        original_created_at=row.created_at,
+        data=ArchivedRecord.pack(payload),
+        attachment_id=getattr(row, 'resume_file_id', None),
+    )
+
+
+def archive_batch(model, cutoff, batch_size):
+    """
+    Move up to batch_size eligible rows in one short transaction; returns how many moved.
+    Rows locked by someone else are skipped (where the database can) rather than waited for.
+    """
+    rows = eligible(model, cutoff)
+    if model is JobApplication:
+        rows = rows.select_related('career')
+    if connections['default'].features.has_select_for_update_skip_locked:
+        rows = rows.select_for_update(skip_locked=True, of=('self',))
+
+    with transaction.atomic():
+        batch = list(rows[:batch_size])
+        if not batch:
+            return 0
+        pks = [row.pk for row in batch]
+        ArchivedRecord.objects.bulk_create([to_record(row) for row in batch])
+        Tombstone.objects.bulk_create([Tombstone(model=model._meta.label_lower, object_id=pk) for pk in pks])
+        # A plain DELETE: the per-row delete signals (tombstone, counters) are done in bulk here.
+        model.objects.filter(pk__in=pks)._raw_delete('default')
+        if model is JobApplication:
+            Career.objects.filter(pk__in={row.career_id for row in batch}).refresh_application_counters()
+    return len(batch)
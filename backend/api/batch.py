@@ -0,0 +1,129 @@
+"""
+Batched API reads.
+/api/batch/ runs several GETs against the API viewsets in one HTTP round trip. Each
+sub-request goes straight to its view (no middleware pass), with the caller's user,
+cookies and read database, and sub-requests run concurrently on a small thread pool.
+"""
+
+import contextvars
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+MAX_AGE = re.compile(r'(?:^|,)\s*max-age=(\d+)')
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix='api-batch')
+    return _executor
+
+
+class BatchSubRequest(HttpRequest):
+    """GET for one batched path, sharing the parent request's identity."""
+
+    def __init__(self, parent, path, query):
+        super().__init__()
+        self._parent_scheme = parent.scheme
+        self.method = 'GET'
+        self.path = self.path_info = path
+        self.GET = QueryDict(query)
+        self.COOKIES = parent.COOKIES
+        self.META = {
+            key: value for key, value in parent.META.items()
+            if key.startswith('HTTP_') or key in ('REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT')
+        }
+        self.META.update({'REQUEST_METHOD': 'GET', 'QUERY_STRING': query, 'HTTP_ACCEPT': 'application/json'})
+        self.META.pop('CONTENT_TYPE', None)
+        self.META.pop('CONTENT_LENGTH', None)
+        if hasattr(parent, 'user'):  # Not set without auth middleware (API profile).
+            self.user = parent.user
+        if hasattr(parent, 'session'):
+            self.session = parent.session
+
+    def _get_scheme(self):
+        return self._parent_scheme
+
+
+def validate_path(path):
+    """Return an error message if path may not be batched, else None."""
+    if not isinstance(path, str) or not path.startswith('/api/'):
+        return 'Paths must be strings starting with /api/.'
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return None  # Reported per item as 404.
+    if not hasattr(match.func, 'cls') or match.url_name in settings.BATCH_EXCLUDED_URL_NAMES:
+        return f'{path} cannot be batched.'
+    return None
+
+
+def run_one(parent, path):
+    """Execute one GET; returns the item for the batch response."""
+    parts = urlsplit(path)
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        return {'status': 404, 'body': {'detail': 'Not found.'}}
+    request = BatchSubRequest(parent, parts.path, parts.query)
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+    except Exception:  # noqa: BLE001 - one failing path must not fail the whole batch
+        logger.exception('Batched GET %s failed', path)
+        return {'status': 500, 'body': {'detail': 'A server error occurred.'}}
+    item = {'status': response.status_code, 'body': getattr(response, 'data', None)}
+    if response.has_header('Cache-Control'):
+        item['cache_control'] = response['Cache-Control']
+    return item
+
+
+def _run_in_worker(parent, path):
+    # Pool threads keep their connections between tasks, like request threads do.
+    close_old_connections()
+    try:
+        return run_one(parent, path)
+    finally:
+        close_old_connections()
+
+
+def run_batch(parent, paths):
+    """Run every path, concurrently when there is more than one; returns {path: item}."""
+    # Resolve the lazy user once, before worker threads share it (there is none in the API profile).
+    getattr(getattr(parent, 'user', None), 'is_authenticated', None)
+    unique = list(dict.fromkeys(paths))
+    if len(unique) == 1 or settings.BATCH_MAX_WORKERS <= 1:
+        return {path: run_one(parent, path) for path in unique}
+    # Each task gets a copy of the caller's context so the read-replica choice carries over.
+    futures = {
+        path: get_executor().submit(contextvars.copy_context().run, _run_in_worker, parent, path)
+        for path in unique
+    }
+    return {path: future.result() for path, future in futures.items()}
+
+
+def combined_cache_control(items):
+    """
+    Cache-Control for the whole batch: the most restrictive of its items. Any item without
+    a cacheable 200 makes the batch uncacheable.
+    """
+    max_ages, private = [], False
+    for item in items:
+        header = item.get('cache_control', '')
+        match = MAX_AGE.search(header)
+        if item['status'] != 200 or 'no-store' in header or match is None:
+            return 'no-store'
+        private = private or 'private' in header
+        max_ages.append(int(match.group(1)))
+    return f"{'private' if private else 'public'}, max-age={min(max_ages)}"
@@ -0,0 +1,132 @@
+"""
+HTTP cache policies for the API.
+Each viewset response gets Cache-Control (and Vary) from settings.API_CACHE_POLICIES,
+looked up by router basename and action. Header strings are built once per policy and
+reused, so adding them costs no queries and almost no work per request.
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import OPEN
+
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+@lru_cache(maxsize=None)
+def get_policy(basename, action):
+    """Merged policy for 'basename.action', falling back to 'basename', then 'default'."""
+    policies = settings.API_CACHE_POLICIES
+    policy = dict(policies.get('default', {}))
+    policy.update(policies.get(basename, {}))
+    policy.update(policies.get(f'{basename}.{action}', {}))
+    return policy
+
+
+@lru_cache(maxsize=512)
+def cache_control(basename, action, ttl_cap=None):
+    """Cache-Control value for a policy, with its TTLs lowered to ttl_cap if given."""
+    policy = get_policy(basename, action)
+    if policy.get('no_store'):
+        return 'no-store'
+
+    max_age = policy.get('max_age', 0)
+    s_maxage = policy.get('s_maxage')
+    stale_while_revalidate = policy.get('stale_while_revalidate')
+    if ttl_cap is not None:
+        max_age = min(max_age, ttl_cap)
+        s_maxage = None if s_maxage is None else min(s_maxage, ttl_cap)
+        stale_while_revalidate = stale_while_revalidate and min(stale_while_revalidate, ttl_cap)
+
+    public = policy.get('public', True)
+    parts = ['public' if public else 'private', f'max-age={max_age}']
+    if public and s_maxage is not None:
+        parts.append(f's-maxage={s_maxage}')
+    if stale_while_revalidate:
+        parts.append(f'stale-while-revalidate={stale_while_revalidate}')
+    if policy.get('stale_if_error'):
+        parts.append(f"stale-if-error={policy['stale_if_error']}")
+    return ', '.join(parts)
+
+
+@receiver(setting_changed)
+def clear_cached_policies(setting, **kwargs):
+    if setting == 'API_CACHE_POLICIES':
+        get_policy.cache_clear()
+        cache_control.cache_clear()
+
+
+def _payload_items(data):
+    if isinstance(data, dict):
+        return data.get('results', [data])
+    return data if isinstance(data, list) else []
+
+
+def seconds_to_deadline(data, floor):
+    """
+    Seconds until the earliest open deadline among the serialized rows, rounded down to
+    a multiple of floor (and never below it), or None if no row in the payload is open.
+    A date-only deadline (Career) lasts until the end of that day in TIME_ZONE.
+    Reads the response data only.
+    """
+    now = timezone.now()
+    earliest = None
+    for item in _payload_items(data):
+        if not isinstance(item, dict) or item.get('status') != OPEN:
+            continue
+        deadline = item.get('deadline')
+        if isinstance(deadline, str):
+            deadline = parse_date(deadline) or parse_datetime(deadline)
+        if isinstance(deadline, date) and not isinstance(deadline, datetime):
+            deadline = timezone.make_aware(
+                datetime.combine(deadline + timedelta(days=1), time.min), timezone.get_default_timezone()
+            )
+        if not isinstance(deadline, datetime):
+            continue
+        if timezone.is_naive(deadline):
+            deadline = timezone.make_aware(deadline)
+        remaining = (deadline - now).total_seconds()
+        if earliest is None or remaining < earliest:
+            earliest = remaining
+    if earliest is None:
+        return None
+    return max(floor, int(earliest) // floor * floor)
+
+
+class CachePolicyMixin:
+    """
+    Sets Cache-Control/Vary on viewset responses from settings.API_CACHE_POLICIES.
+    Responses that already carry Cache-Control (e.g. file downloads) are left alone.
+    Policies with 'deadline_floor' shorten the TTL so cached copies expire when an open
+    row in the payload closes.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.has_header('Cache-Control'):
+            return response
+
+        basename = getattr(self, 'basename', None) or 'default'
+        action = getattr(self, 'action', None) or 'default'
+        policy = get_policy(basename, action)
+        if policy.get('no_store'):
+            response['Cache-Control'] = cache_control(basename, action)
+            return response
+        if request.method not in SAFE_METHODS or response.status_code != 200:
+            return response
+
+        ttl_cap = None
+        if policy.get('deadline_floor'):
+            ttl_cap = seconds_to_deadline(getattr(response, 'data', None), policy['deadline_floor'])
+        response['Cache-Control'] = cache_control(basename, action, ttl_cap)
+        if policy.get('vary'):
+            patch_vary_headers(response, policy['vary'])
+        return response
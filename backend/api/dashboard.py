@@ -0,0 +1,60 @@
+"""
+Admin dashboard statistics.
+All counters are computed in one SQL statement and cached; model signals
+invalidate the cached copy when the underlying rows change.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .models import (
+    Tender, News, Career, ContactMessage, Project, BoardMember, JobApplication
+)
+
+
+STATS_CACHE_KEY = 'admin:dashboard-stats'
+
+# Models whose changes make the cached statistics stale.
+STATS_MODELS = (Tender, News, Career, ContactMessage, Project, BoardMember, JobApplication)
+
+
+def _stat_querysets():
+    return {
+        'tenders': Tender.objects.filter(is_active=True),
+        'open_tenders': Tender.objects.open(),
+        'news': News.objects.filter(is_active=True),
+        'careers': Career.objects.filter(is_active=True),
+        'messages': ContactMessage.objects.filter(is_read=False),
+        'projects': Project.objects.filter(is_active=True),
+        'board_members': BoardMember.objects.filter(is_active=True),
+        'applications': JobApplication.objects.filter(is_reviewed=False),
+    }
+
+
+def compute_dashboard_stats(using=DEFAULT_DB_ALIAS):
+    """Count every dashboard statistic as scalar subqueries of a single SELECT."""
+    columns, params = [], []
+    for key, queryset in _stat_querysets().items():
+        sql, sql_params = queryset.order_by().values('pk').query.sql_with_params()
+        columns.append(f'(SELECT COUNT(*) FROM ({sql}) {key}_rows) AS {key}')
+        params.extend(sql_params)
+
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT ' + ', '.join(columns), params)
+        row = cursor.fetchone()
+    return dict(zip(_stat_querysets().keys(), row))
+
+
+def get_dashboard_stats():
+    """Return cached statistics, recomputing them on a miss."""
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(STATS_CACHE_KEY, stats, settings.ADMIN_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Drop the cached statistics once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(STATS_CACHE_KEY))
@@ -0,0 +1,139 @@
+"""
+Batched deletion for large cascades and purges.
+Instead of Django's collector (which loads every related row and deletes everything in
+one transaction), children are deleted first, BATCH rows per short transaction, with
+plain DELETE statements. The per-row delete signals that matter are applied in bulk:
+tombstones for delta sync, career counters, and one cache/snapshot refresh at the end.
+Each batch commits on its own, so an interrupted run is resumed by running it again.
+"""
+
+import time
+
+from django.db import models, transaction
+from django.db.models.deletion import ProtectedError, RestrictedError
+
+from .dashboard import STATS_MODELS, invalidate_dashboard_stats
+from .models import BaseModel, Career, JobApplication, Project, Tombstone
+from .portfolio import invalidate_portfolio_summary
+from .snapshots import SNAPSHOT_ENDPOINTS, schedule_publish
+
+
+def cascade_plan(model, seen=()):
+    """
+    [(relation, child plan)] for model's reverse foreign keys, recursing through CASCADE ones.
+    Raises ValueError for on_delete behaviours this engine does not reproduce.
+    """
+    plan = []
+    for relation in model._meta.related_objects:
+        if relation.many_to_many or relation.related_model in seen:
+            continue
+        on_delete = relation.on_delete
+        if on_delete not in (models.CASCADE, models.SET_NULL, models.PROTECT, models.RESTRICT, models.DO_NOTHING):
+            raise ValueError(f'{relation.related_model.__name__}.{relation.field.name}: unsupported on_delete for batched deletion')
+        child_plan = cascade_plan(relation.related_model, (*seen, model)) if on_delete is models.CASCADE else []
+        plan.append((relation, child_plan))
+    return plan
+
+
+def _related(relation, parents):
+    return relation.related_model._base_manager.filter(**{f'{relation.field.name}__in': parents.values('pk')})
+
+
+def count_rows(queryset, plan=None):
+    """{model: rows} the deletion would remove, from COUNT queries (no rows are loaded)."""
+    plan = cascade_plan(queryset.model) if plan is None else plan
+    counts = {}
+    for relation, child_plan in plan:
+        if relation.on_delete is models.CASCADE:
+            for model, count in count_rows(_related(relation, queryset), child_plan).items():
+                counts[model] = counts.get(model, 0) + count
+    counts[queryset.model] = counts.get(queryset.model, 0) + queryset.count()
+    return counts
+
+
+def check_protected(queryset, plan):
+    """Refuse up front, like the collector would, if a PROTECT/RESTRICT row points at the deletion."""
+    for relation, child_plan in plan:
+        children = _related(relation, queryset)
+        if relation.on_delete in (models.PROTECT, models.RESTRICT) and children.exists():
+            error = ProtectedError if relation.on_delete is models.PROTECT else RestrictedError
+            raise error(
+                f'Cannot delete: {relation.related_model._meta.verbose_name_plural} still refer to these rows.',
+                set(children[:10]),
+            )
+        if relation.on_delete is models.CASCADE:
+            check_protected(children, child_plan)
+
+
+class BatchedDeletion:
+    """
+    Delete queryset and everything cascading from it. progress(done, total, message) is
+    called after every batch; pause sleeps between batches to leave room for other writers.
+    """
+
+    def __init__(self, queryset, batch_size=500, pause=0.0, progress=None):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.batch_size = batch_size
+        self.pause = pause
+        self.progress = progress
+        self.plan = cascade_plan(self.model)
+        self.deleted = {}
+        self.done = 0
+        self.total = 0
+
+    def run(self):
+        """Returns {model: rows deleted}."""
+        check_protected(self.queryset, self.plan)
+        self.total = sum(count_rows(self.queryset, self.plan).values())
+        self._delete(self.queryset, self.plan)
+        self._refresh_derived_data()
+        return self.deleted
+
+    def _delete(self, queryset, plan):
+        # Depth first: a parent row goes only after all of its children are gone.
+        for relation, child_plan in plan:
+            if relation.on_delete is models.CASCADE:
+                self._delete(_related(relation, queryset), child_plan)
+            elif relation.on_delete is models.SET_NULL:
+                self._batched(_related(relation, queryset),
+                              lambda rows, pks, field=relation.field.name: rows.update(**{field: None}))
+        self._batched(queryset, self._delete_batch)
+
+    def _batched(self, queryset, operation):
+        model = queryset.model
+        pks = queryset.order_by('pk').values_list('pk', flat=True)
+        while True:
+            with transaction.atomic():
+                batch = list(pks[:self.batch_size])
+                if not batch:
+                    return
+                operation(model._base_manager.filter(pk__in=batch), batch)
+            if self.progress:
+                self.progress(self.done, self.total, f'{model._meta.verbose_name_plural}: {self.deleted.get(model, 0)}')
+            if self.pause:
+                time.sleep(self.pause)
+
+    def _delete_batch(self, rows, pks):
+        model = rows.model
+        if issubclass(model, BaseModel):
+            label = model._meta.label_lower
+            Tombstone.objects.bulk_create([Tombstone(model=label, object_id=pk) for pk in pks])
+        career_ids = set()
+        if model is JobApplication and self.model is not Career:
+            career_ids = set(rows.values_list('career_id', flat=True).distinct())
+        count = rows._raw_delete(rows.db)
+        if career_ids:
+            # The collector path recounts per deleted application (api.signals); once per batch here.
+            Career.objects.filter(pk__in=career_ids).refresh_application_counters()
+        self.deleted[model] = self.deleted.get(model, 0) + count
+        self.done += count
+
+    def _refresh_derived_data(self):
+        if any(model in STATS_MODELS for model in self.deleted):
+            invalidate_dashboard_stats()
+        for model in self.deleted:
+            if model in SNAPSHOT_ENDPOINTS:
+                schedule_publish(model)
+            if model is Project:
+                invalidate_portfolio_summary()
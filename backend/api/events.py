@@ -0,0 +1,258 @@
+"""
+Server-Sent Events change feed for the staff inbox and dashboard.
+One poller per process reads ContactMessage/JobApplication rows by updated_at and
+fans compact events out to every connected client, so open admin tabs cost one
+indexed query per tick in total instead of a list refetch each. Event ids are
+updated_at in epoch microseconds, which is also the Last-Event-ID resume cursor.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+
+from .dashboard import get_dashboard_stats
+from .models import ContactMessage, JobApplication
+
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# Event name -> (model, fields sent to clients). Keep these small: full rows
+# are one GET /api/<prefix>/<id>/ away.
+FEED_SOURCES = {
+    'contact': (ContactMessage, ('id', 'name', 'email', 'subject', 'is_read', 'created_at', 'updated_at')),
+    'application': (JobApplication, (
+        'id', 'career_id', 'career__title', 'name', 'email', 'is_reviewed', 'created_at', 'updated_at'
+    )),
+}
+
+# Rows read per model and poll; a bigger backlog is read over several ticks.
+POLL_BATCH_SIZE = 500
+
+
+def to_cursor(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def from_cursor(cursor):
+    return EPOCH + timedelta(microseconds=cursor)
+
+
+def parse_cursor(value):
+    """Last-Event-ID header value -> cursor, or None if missing or malformed."""
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cursor if cursor >= 0 else None
+
+
+def fetch_changes(since, limit):
+    """
+    Rows of every feed model with updated_at >= since (a cursor), oldest first.
+    Returns (events, complete); complete is False when some model had more than limit rows,
+    in which case events stop at the oldest cut-off so nothing is skipped.
+    """
+    events, horizon = [], None
+    for event, (model, fields) in FEED_SOURCES.items():
+        rows = list(
+            model.objects.filter(updated_at__gte=from_cursor(since))
+            .order_by('updated_at', 'pk').values(*fields)[:limit + 1]
+        )
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = to_cursor(rows[-1]['updated_at'])
+            horizon = last if horizon is None else min(horizon, last)
+        for row in rows:
+            if 'career__title' in row:
+                row['career_title'] = row.pop('career__title')
+            events.append((to_cursor(row['updated_at']), event, row))
+    events.sort(key=lambda item: item[0])
+    if horizon is not None:
+        events = [item for item in events if item[0] <= horizon]
+    return events, horizon is None
+
+
+def commit_window():
+    """SSE_COMMIT_WINDOW_SECONDS in cursor units."""
+    return int(settings.SSE_COMMIT_WINDOW_SECONDS * 1_000_000)
+
+
+def format_event(cursor, event, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    lines = [f'event: {event}', f'data: {payload}']
+    if cursor is not None:
+        lines.insert(0, f'id: {cursor}')
+    return '\n'.join(lines) + '\n\n'
+
+
+HEARTBEAT = ': keep-alive\n\n'
+RESET = object()  # Queue marker: the client fell behind and must refetch its lists.
+
+
+class ChangeHub:
+    """
+    Per-process fan-out. The poller runs only while clients are connected; a recent-event
+    ring buffer answers most Last-Event-ID resumes without touching the database.
+    """
+
+    def __init__(self):
+        self.clients = set()
+        self.recent = deque(maxlen=settings.SSE_REPLAY_LIMIT)
+        self.seen = {}
+        self.position = None
+        self.loop = None
+        self.task = None
+        self.wake = None
+
+    # ---- database side (runs in a worker thread) ----
+
+    def poll(self):
+        """
+        Read rows changed since the last poll; returns the ones not sent yet, or None
+        after a burst too big for one batch (clients are then told to refetch).
+        """
+        close_old_connections()
+        # Rows can commit out of updated_at order; re-read a short window to catch them.
+        window = commit_window()
+        events, complete = fetch_changes(self.position - window, POLL_BATCH_SIZE)
+        if not complete:
+            self.position = to_cursor(datetime.now(dt_timezone.utc))
+            self.seen.clear()
+            self.recent.clear()
+            return None
+        fresh = []
+        for cursor, event, data in events:
+            key = (event, data['id'])
+            if self.seen.get(key, -1) >= cursor:
+                continue
+            self.seen[key] = cursor
+            fresh.append((cursor, event, data))
+        if events:
+            self.position = max(self.position, events[-1][0])
+        oldest = self.position - window
+        self.seen = {key: cursor for key, cursor in self.seen.items() if cursor >= oldest}
+        return fresh
+
+    def stats(self):
+        close_old_connections()
+        return get_dashboard_stats()
+
+    # ---- event loop side ----
+
+    def ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.loop is not loop:
+            self.loop = loop
+            self.wake = asyncio.Event()
+            if self.position is None:
+                self.position = to_cursor(datetime.now(dt_timezone.utc))
+            self.task = loop.create_task(self.run())
+
+    def notify(self):
+        """Wake the poller early (called from any thread after a local commit)."""
+        loop, wake = self.loop, self.wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    async def run(self):
+        while self.clients:
+            try:
+                fresh = await sync_to_async(self.poll, thread_sensitive=False)()
+                if fresh is None:
+                    fresh = [(None, 'reset', {})]
+                else:
+                    self.recent.extend(fresh)
+                if fresh:
+                    stats = await sync_to_async(self.stats, thread_sensitive=False)()
+                    for item in (*fresh, (None, 'stats', stats)):
+                        self.broadcast(item)
+            except Exception:  # noqa: BLE001 - keep serving heartbeats; retry next tick
+                logger.exception('Change feed poll failed')
+            try:
+                await asyncio.wait_for(self.wake.wait(), settings.SSE_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+        # Nobody is listening, so the buffer stops being gap-free; start over on the next client.
+        self.position = None
+        self.seen.clear()
+        self.recent.clear()
+
+    def broadcast(self, item):
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # Slow client: drop what it has queued and tell it to resync.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESET)
+
+    async def replay(self, cursor):
+        """Events at or after cursor, or None if there are too many to replay."""
+        if self.recent and self.recent[0][0] <= cursor:
+            return [item for item in self.recent if item[0] >= cursor]
+        events, complete = await sync_to_async(fetch_changes, thread_sensitive=False)(
+            cursor, settings.SSE_REPLAY_LIMIT
+        )
+        return events if complete else None
+
+    async def stream(self, cursor):
+        """Async iterator of SSE text for one client."""
+        queue = asyncio.Queue(maxsize=settings.SSE_REPLAY_LIMIT)
+        self.clients.add(queue)
+        self.ensure_running()
+        try:
+            yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+            # Subscribed before replaying, so nothing falls in between (duplicates are harmless:
+            # every event is an upsert by id).
+            backlog = [] if cursor is None else await self.replay(cursor)
+            if backlog is None:
+                yield format_event(None, 'reset', {})
+            else:
+                for item in backlog:
+                    yield format_event(*item)
+            # The first stats event carries an id so a client that connected without one can resume.
+            resume_from = max([self.position - commit_window(), *(item[0] for item in backlog or ())])
+            stats = await sync_to_async(self.stats, thread_sensitive=False)()
+            yield format_event(resume_from, 'stats', stats)
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                if item is RESET:
+                    yield format_event(None, 'reset', {})
+                    return
+                yield format_event(*item)
+        finally:
+            self.clients.discard(queue)
+
+
+hub = ChangeHub()
+
+
+def replay_once(cursor):
+    """Whole response body for servers without streaming support (WSGI): backlog, stats, retry."""
+    parts = [f'retry: {settings.SSE_WSGI_RETRY_MS}\n\n']
+    resume_from = to_cursor(datetime.now(dt_timezone.utc)) - commit_window()
+    if cursor is not None:
+        events, complete = fetch_changes(cursor, settings.SSE_REPLAY_LIMIT)
+        if complete:
+            parts.extend(format_event(*item) for item in events)
+            resume_from = max([resume_from, *(item[0] for item in events)])
+        else:
+            parts.append(format_event(None, 'reset', {}))
+    parts.append(format_event(resume_from, 'stats', get_dashboard_stats()))
+    return parts
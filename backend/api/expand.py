@@ -0,0 +1,108 @@
+"""
+?expand= support for API viewsets.
+A viewset lists the relations it can embed; the ORM work is planned from the model's
+fields (select_related for foreign keys, a sliced Prefetch for reverse relations), so a
+page costs the same number of queries however many rows it expands.
+"""
+
+from functools import lru_cache
+
+from django.db.models import Prefetch
+from rest_framework.exceptions import PermissionDenied, ValidationError
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class Expand:
+    """
+    One embeddable relation. Reverse relations return at most `limit` rows per parent,
+    ordered by `ordering`; `staff_only` relations are refused to everyone else.
+    """
+
+    def __init__(self, serializer_class, limit=None, ordering=None, select_related=(), staff_only=False):
+        self.serializer_class = serializer_class
+        self.limit = limit
+        self.ordering = ordering
+        self.select_related = select_related
+        self.staff_only = staff_only
+
+
+def prefetch_attr(name):
+    return f'expanded_{name}'
+
+
+def plan_expansions(queryset, specs):
+    """Add the joins and prefetches that serializing the expanded relations will need."""
+    for name, spec in specs.items():
+        field = queryset.model._meta.get_field(name)
+        if field.many_to_one or (field.one_to_one and not field.auto_created):
+            queryset = queryset.select_related(name)
+            continue
+        related = field.related_model._default_manager.all()
+        if spec.select_related:
+            related = related.select_related(*spec.select_related)
+        if spec.ordering:
+            related = related.order_by(*spec.ordering)
+        if spec.limit:
+            related = related[:spec.limit]  # Per parent: Django prefetches slices with a window function.
+        queryset = queryset.prefetch_related(Prefetch(name, queryset=related, to_attr=prefetch_attr(name)))
+    return queryset
+
+
+@lru_cache(maxsize=None)
+def expanded_serializer(base, viewset_class, names):
+    """Subclass of base with each expanded relation as a nested, read-only serializer."""
+    attrs, extra_fields = {}, []
+    for name in names:
+        spec = viewset_class.expandable[name]
+        field = base.Meta.model._meta.get_field(name)
+        if field.many_to_one or field.one_to_one:
+            attrs[name] = spec.serializer_class(read_only=True)
+        else:
+            attrs[name] = spec.serializer_class(many=True, read_only=True, source=prefetch_attr(name))
+        if name not in base.Meta.fields:
+            extra_fields.append(name)
+    attrs['Meta'] = type('Meta', (base.Meta,), {'fields': [*base.Meta.fields, *extra_fields]})
+    return type(f"{base.__name__.removesuffix('Serializer')}Expanded{''.join(n.title() for n in names)}Serializer",
+                (base,), attrs)
+
+
+class ExpandMixin:
+    """
+    Adds ?expand=a,b to a viewset. Declare embeddable relations in `expandable`
+    ({'career': Expand(CareerSerializer)}); unknown names are a 400.
+    """
+    expandable = {}
+
+    def get_expand(self):
+        if not hasattr(self, '_expand'):
+            raw = self.request.query_params.get('expand', '') if self.request.method in SAFE_METHODS else ''
+            names = tuple(sorted({name.strip() for name in raw.split(',') if name.strip()}))
+            unknown = [name for name in names if name not in self.expandable]
+            if unknown:
+                choices = ', '.join(sorted(self.expandable)) or 'none'
+                raise ValidationError({'expand': f"Unknown relation(s): {', '.join(unknown)}. Choose from: {choices}."})
+            if any(self.expandable[name].staff_only for name in names) and not getattr(self.request.user, 'is_staff', False):
+                raise PermissionDenied('Only staff can expand these relations.')
+            self._expand = names
+        return self._expand
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        names = self.get_expand()
+        if names:
+            queryset = plan_expansions(queryset, {name: self.expandable[name] for name in names})
+        return queryset
+
+    def get_serializer_class(self):
+        base = super().get_serializer_class()
+        names = self.get_expand()
+        return expanded_serializer(base, type(self), names) if names else base
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, '_expand', None) and any(self.expandable[name].staff_only for name in self._expand):
+            # Staff-only data must not land in shared caches.
+            response['Cache-Control'] = 'private, no-store'
+        return response
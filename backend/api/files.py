@@ -0,0 +1,421 @@
+"""
+File uploads and downloads.
+Uploads stream to disk while being hashed and checked, are stored once per SHA-256,
+and downloads are handed off to the web server (X-Accel-Redirect / X-Sendfile).
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+
+from .models import StoredFile, UploadSession
+
+
+logger = logging.getLogger(__name__)
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Extension -> (leading magic bytes, content type). The sniffed bytes decide the type,
+# never the client-supplied Content-Type or filename.
+FILE_TYPES = {
+    'pdf': (b'%PDF-', 'application/pdf'),
+    'docx': (b'PK\x03\x04', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+    'rtf': (b'{\\rtf', 'application/rtf'),
+    'zip': (b'PK\x03\x04', 'application/zip'),
+}
+SNIFF_BYTES = max(len(magic) for magic, _ in FILE_TYPES.values())
+
+
+class UploadRejected(Exception):
+    """An upload broke a size or type rule."""
+
+
+class UploadConflict(Exception):
+    """A resumable upload chunk did not start at the session's current offset."""
+
+
+class UploadRestart(UploadConflict):
+    """The bytes received so far are gone (part file purged or lost); the session is back at offset 0."""
+
+
+def detect_type(head, allowed):
+    """Return the allowed extension whose magic bytes start head, or raise UploadRejected."""
+    for extension in allowed:
+        magic, _ = FILE_TYPES[extension]
+        if head.startswith(magic):
+            return extension
+    raise UploadRejected(f"Unsupported file type. Allowed: {', '.join(allowed)}.")
+
+
+def check_size(size, max_size):
+    if size > max_size:
+        raise UploadRejected(f'File is larger than {max_size // (1024 * 1024)} MB.')
+
+
+def storage_path(relative_path):
+    return os.path.join(settings.FILE_STORAGE_ROOT, relative_path)
+
+
+def temp_dir():
+    path = os.path.join(settings.FILE_STORAGE_ROOT, 'tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_file(path, sha256, size, extension):
+    """
+    Move a finished file into content-addressed storage and return its StoredFile.
+    If the same content is already stored, the new copy is discarded.
+    """
+    existing = StoredFile.objects.filter(sha256=sha256).first()
+    if existing is None:
+        final_path = storage_path(f'files/{sha256[:2]}/{sha256}')
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(path, final_path)
+        try:
+            with transaction.atomic():
+                return StoredFile.objects.create(
+                    sha256=sha256, size=size, extension=extension,
+                    content_type=FILE_TYPES[extension][1],
+                )
+        except IntegrityError:
+            # A concurrent upload of the same content won; the bytes are identical.
+            return StoredFile.objects.get(sha256=sha256)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    return existing
+
+
+# ==================== Streaming Uploads ====================
+
+class HashedUploadedFile(UploadedFile):
+    """Upload written to a temp file under FILE_STORAGE_ROOT, with its SHA-256 and sniffed type."""
+
+    def __init__(self, name, content_type, charset, content_type_extra=None):
+        file = tempfile.NamedTemporaryFile(suffix='.upload', dir=temp_dir())
+        super().__init__(file, name, content_type, 0, charset, content_type_extra)
+        self.sha256 = None
+        self.extension = None
+
+    def temporary_file_path(self):
+        return self.file.name
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # The temp file was moved into storage before it could be unlinked.
+            pass
+
+    def store(self):
+        self.file.flush()
+        return store_file(self.temporary_file_path(), self.sha256, self.size, self.extension)
+
+
+class StreamingUploadHandler(FileUploadHandler):
+    """
+    Write each chunk to disk as it arrives, hashing it and enforcing size and type limits.
+    Nothing is buffered in memory; rejected files are skipped and reported in .errors.
+    """
+
+    def __init__(self, request, max_size, allowed_types):
+        super().__init__(request)
+        self.max_size = max_size
+        self.allowed_types = allowed_types
+        self.errors = {}
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.file = HashedUploadedFile(self.file_name, self.content_type, self.charset, self.content_type_extra)
+        self.digest = hashlib.sha256()
+        self.head = b''
+        self.received = 0
+        if self.content_length is not None:
+            self._check(check_size, self.content_length, self.max_size)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self._check(check_size, self.received, self.max_size)
+        if len(self.head) < SNIFF_BYTES:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self.file.extension = self._check(detect_type, self.head, self.allowed_types)
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.file.extension is None:
+            try:
+                self.file.extension = self._check(detect_type, self.head, self.allowed_types)
+            except SkipFile:
+                return None  # Too short to identify; reported in .errors.
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
+
+    def _check(self, check, *args):
+        try:
+            return check(*args)
+        except UploadRejected as exc:
+            self.errors[self.field_name] = [str(exc)]
+            self.file.close()
+            raise SkipFile()
+
+
+# ==================== Resumable Uploads ====================
+
+def session_part_path(session):
+    return os.path.join(temp_dir(), f'{session.pk}.part')
+
+
+def append_chunk(session, stream, start, length, max_size, allowed_types):
+    """
+    Write length bytes from stream at offset start of the session's part file.
+    Progress is saved even if the client disconnects mid-chunk, so it can resume from there.
+    When the last byte arrives the file is hashed, type-checked and stored.
+    """
+    path = session_part_path(session)
+    written = 0
+    try:
+        part = open(path, 'r+b' if start else 'wb')
+    except FileNotFoundError:
+        UploadSession.objects.filter(pk=session.pk, received=start).update(received=0, updated_at=timezone.now())
+        session.received = 0
+        raise UploadRestart('The bytes received so far were lost; upload again from offset 0.')
+    try:
+        with part:
+            part.seek(start)
+            while written < length:
+                chunk = stream.read(min(READ_CHUNK_SIZE, length - written))
+                if not chunk:
+                    break
+                if start == 0 and written == 0:
+                    detect_type(chunk[:SNIFF_BYTES], allowed_types)
+                part.write(chunk)
+                written += len(chunk)
+    finally:
+        # Compare-and-set on the offset instead of holding a row lock for the whole transfer.
+        claimed = UploadSession.objects.filter(pk=session.pk, received=start).update(
+            received=start + written, updated_at=timezone.now()
+        )
+    if not claimed:
+        raise UploadConflict('Another request changed this upload; fetch the current offset and resume.')
+    session.received = start + written
+
+    if session.received >= session.size:
+        with open(path, 'rb') as part:
+            extension = detect_type(part.read(SNIFF_BYTES), allowed_types)
+        check_size(session.received, max_size)
+        session.stored_file = store_file(path, hash_file(path), session.received, extension)
+        session.save(update_fields=['stored_file', 'updated_at'])
+    return session
+
+
+def discard_session(session):
+    try:
+        os.unlink(session_part_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+# ==================== Downloads ====================
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range 'bytes=' Range header into inclusive (start, end).
+    Returns None when the whole file should be sent (other units, multiple or malformed
+    ranges) and raises RangeNotSatisfiable when the range starts past the end.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix == 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, end
+
+
+def _etag_matches(header, etag):
+    return any(tag.strip().removeprefix('W/') in (etag, '*') for tag in header.split(','))
+
+
+def _if_range_allows(request, etag, last_modified):
+    """If-Range only honours Range when the client's copy is still current."""
+    condition = request.headers.get('If-Range')
+    if condition is None:
+        return True
+    if condition.startswith(('"', 'W/')):
+        return condition == etag  # Strong comparison; weak tags never match.
+    return parse_http_date_safe(condition) == last_modified
+
+
+def _read_range(file, length):
+    with file:
+        while length > 0:
+            chunk = file.read(min(READ_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def sendfile_response(request, stored_file, filename, cache_control='private, no-cache'):
+    """
+    Respond with a stored file. With a sendfile backend configured the web server sends
+    the bytes and handles Range and conditional requests itself; the 'django' fallback
+    implements ETag/If-None-Match, Range and If-Range in Python (development).
+    """
+    backend = settings.FILE_SENDFILE_BACKEND
+    if backend in ('nginx', 'apache'):
+        response = HttpResponse(content_type=stored_file.content_type)
+        if backend == 'nginx':
+            response['X-Accel-Redirect'] = settings.FILE_SENDFILE_URL_PREFIX + stored_file.relative_path
+        else:
+            response['X-Sendfile'] = storage_path(stored_file.relative_path)
+    else:
+        response = _django_file_response(request, stored_file)
+    if response.status_code != 304:
+        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename)}"
+        response['X-Content-Type-Options'] = 'nosniff'
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def _django_file_response(request, stored_file):
+    # Stored files never change, so the content hash is a strong ETag.
+    etag = f'"{stored_file.sha256}"'
+    last_modified = int(stored_file.created_at.timestamp())
+    validators = {'ETag': etag, 'Last-Modified': http_date(last_modified)}
+
+    if _etag_matches(request.headers.get('If-None-Match', ''), etag):
+        return HttpResponseNotModified(headers=validators)
+
+    size = stored_file.size
+    byte_range = None
+    if 'Range' in request.headers and _if_range_allows(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except RangeNotSatisfiable:
+            return HttpResponse(status=416, headers={'Content-Range': f'bytes */{size}', **validators})
+
+    file = open(storage_path(stored_file.relative_path), 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=stored_file.content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = StreamingHttpResponse(
+            _read_range(file, end - start + 1), status=206, content_type=stored_file.content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    for header, value in validators.items():
+        response[header] = value
+    return response
+
+
+def is_new_download(request, response):
+    """True for a GET that starts a download, not a resumed range or a revalidation."""
+    if request.method != 'GET' or response.status_code not in (200, 206):
+        return False
+    return request.headers.get('Range', 'bytes=0-').replace(' ', '').startswith('bytes=0-')
+
+
+# ==================== Download Counters ====================
+
+class DownloadCounter:
+    """
+    Per-process download counts for model.field, flushed with one F() update per distinct
+    increment once DOWNLOAD_COUNT_FLUSH_EVERY downloads or DOWNLOAD_COUNT_FLUSH_SECONDS
+    have accumulated, and at exit. Counts are kept for the next flush if the write fails.
+    """
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self._counts = Counter()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def add(self, pk):
+        with self._lock:
+            self._counts[pk] += 1
+            self._pending += 1
+            due = (
+                self._pending >= settings.DOWNLOAD_COUNT_FLUSH_EVERY
+                or time.monotonic() - self._last_flush >= settings.DOWNLOAD_COUNT_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        if not counts:
+            return
+        by_increment = defaultdict(list)
+        for pk, n in counts.items():
+            by_increment[n].append(pk)
+        try:
+            with transaction.atomic():
+                for n, pks in by_increment.items():
+                    self.model.objects.filter(pk__in=pks).update(**{self.field: F(self.field) + n})
+        except DatabaseError:
+            logger.exception('Could not flush %s.%s counts', self.model.__name__, self.field)
+            with self._lock:
+                self._counts.update(counts)
+                self._pending += sum(counts.values())
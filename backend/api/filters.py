@@ -0,0 +1,34 @@
+"""
+Query-string filters for API list endpoints.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class NumericRangeFilter(BaseFilterBackend):
+    """
+    ?<field>_min= and ?<field>_max= (inclusive) for each field in the view's range_filter_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        lookups, errors = {}, {}
+        for field in getattr(view, 'range_filter_fields', ()):
+            for suffix, lookup in (('min', 'gte'), ('max', 'lte')):
+                param = f'{field}_{suffix}'
+                value = request.query_params.get(param)
+                if value in (None, ''):
+                    continue
+                try:
+                    number = Decimal(value)
+                except InvalidOperation:
+                    number = None
+                if number is None or not number.is_finite():
+                    errors[param] = 'A number is required.'
+                else:
+                    lookups[f'{field}__{lookup}'] = number
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**lookups) if lookups else queryset
@@ -0,0 +1,32 @@
+"""
+Content fingerprints for duplicate detection.
+submission_fingerprint() hashes the identifying fields of a form submission with case and
+whitespace folded; request_fingerprint() hashes a whole request body, files by content.
+"""
+
+import hashlib
+import json
+
+
+def submission_fingerprint(*parts):
+    """sha256 hex of the parts, so trivial variations ("A  b" vs "a b") still match."""
+    normalized = '\x1f'.join(' '.join(str(part if part is not None else '').split()).casefold() for part in parts)
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _file_token(value):
+    # HashedUploadedFile already carries the digest of its content.
+    digest = getattr(value, 'sha256', None)
+    if digest:
+        return f'sha256:{digest}'
+    if hasattr(value, 'read'):
+        return f'file:{value.name}:{value.size}'
+    return str(value)
+
+
+def request_fingerprint(data):
+    """sha256 hex of a parsed request body (QueryDict or JSON), independent of field order."""
+    if hasattr(data, 'lists'):
+        data = {key: values for key, values in data.lists()}
+    payload = json.dumps(data, sort_keys=True, default=_file_token)
+    return hashlib.sha256(payload.encode()).hexdigest()
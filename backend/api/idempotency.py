@@ -0,0 +1,120 @@
+"""
+Duplicate suppression for public POSTs.
+Clients may send an Idempotency-Key header: the first response is stored and replayed
+for retries with the same key. A key whose request died mid-way is freed when its lease ends. Independently, contact messages and job applications
+whose content fingerprint matches a recent submission are rejected with 409.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from .fingerprints import request_fingerprint
+from .models import IdempotencyRecord
+
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+class DuplicateSubmission(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'This was already submitted.'
+    default_code = 'duplicate_submission'
+
+
+class DuplicateSubmissionMixin(serializers.Serializer):
+    """
+    For SubmissionModel serializers: rejects a create whose fingerprint matches a row
+    created in the last DUPLICATE_SUBMISSION_WINDOW_MINUTES (one index probe).
+    """
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if self.instance is None:
+            model = self.Meta.model
+            probe = model(**{name: attrs[name] for name in model.fingerprint_fields if name in attrs})
+            window = timedelta(minutes=settings.DUPLICATE_SUBMISSION_WINDOW_MINUTES)
+            if model.find_duplicate(probe.compute_submission_hash(), window) is not None:
+                raise DuplicateSubmission()
+        return attrs
+
+
+def purge_expired(**filters):
+    cutoff = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    return IdempotencyRecord.objects.filter(created_at__lt=cutoff, **filters).delete()[0]
+
+
+def replay(record, fingerprint):
+    if record.request_hash != fingerprint:
+        return Response(
+            {'detail': f'{HEADER} was already used for a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status_code is None:
+        return Response(
+            {'detail': f'A request with this {HEADER} is still being processed.'},
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response(record.response_body, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+def reclaim(record, fingerprint, now, lease):
+    """Take over an unfinished record whose lease has run out (its request died). True if taken."""
+    if record.status_code is not None or record.request_hash != fingerprint:
+        return False
+    if record.locked_until is not None and record.locked_until > now:
+        return False
+    # Compare-and-set on the old lease, so only one of several concurrent retries wins.
+    return IdempotencyRecord.objects.filter(
+        pk=record.pk, status_code__isnull=True, locked_until=record.locked_until
+    ).update(locked_until=lease) == 1
+
+
+class IdempotentCreateMixin:
+    """
+    Honours Idempotency-Key on a viewset's create. Only successful responses are kept
+    (for IDEMPOTENCY_KEY_TTL_HOURS); after an error the client may retry with the same key.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER, '').strip()
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({HEADER: f'Must be at most {MAX_KEY_LENGTH} characters.'})
+
+        scope, fingerprint = self.basename, request_fingerprint(request.data)
+        purge_expired(scope=scope, key=key)
+        now = timezone.now()
+        lease = now + timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+        try:
+            # The unique (scope, key) row is the lock: a concurrent retry fails here.
+            with transaction.atomic():
+                record = IdempotencyRecord.objects.create(
+                    scope=scope, key=key, request_hash=fingerprint, locked_until=lease
+                )
+        except IntegrityError:
+            record = IdempotencyRecord.objects.filter(scope=scope, key=key).first()
+            if record is None:
+                raise DuplicateSubmission(f'A request with this {HEADER} is still being processed.')
+            if not reclaim(record, fingerprint, now, lease):
+                return replay(record, fingerprint)
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if status.is_success(response.status_code):
+            record.status_code, record.response_body = response.status_code, response.data
+            record.locked_until = None
+            record.save(update_fields=['status_code', 'response_body', 'locked_until'])
+        else:
+            record.delete()
+        return response
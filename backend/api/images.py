@@ -0,0 +1,97 @@
+"""
+Responsive image pipeline.
+Variants of News/Project/BoardMember/CSRInitiative images are rendered off the request
+path by the render_image_variants task (queued at save time, or on first use) and
+stored content-addressed under MEDIA_ROOT/variants/.
+"""
+
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.utils import timezone
+
+from . import imaging
+from .models import ImageAsset
+
+
+def _render_args(source_url):
+    return (
+        source_url,
+        str(settings.IMAGE_SOURCE_ROOT),
+        str(settings.MEDIA_ROOT),
+        settings.IMAGE_VARIANT_WIDTHS,
+        settings.IMAGE_VARIANT_FORMATS,
+        settings.IMAGE_SOURCE_HOSTS,
+    )
+
+
+def store_result(result):
+    """Save a render_variants() result as an ImageAsset, clearing any earlier failure."""
+    defaults = {key: result[key] for key in ('content_hash', 'width', 'height', 'variants')}
+    ImageAsset.objects.update_or_create(
+        source_url=result['source_url'],
+        defaults={**defaults, 'failures': 0, 'last_error': '', 'retry_at': None},
+    )
+
+
+def record_failure(source_url, exc):
+    """Remember a failed render so the URL is not retried before its backoff runs out."""
+    asset, _ = ImageAsset.objects.get_or_create(source_url=source_url)
+    asset.failures += 1
+    asset.last_error = f'{type(exc).__name__}: {exc}'[:500]
+    delay = min(settings.IMAGE_RETRY_SECONDS * 2 ** (asset.failures - 1), 86400)
+    asset.retry_at = timezone.now() + timedelta(seconds=delay)
+    asset.save(update_fields=['failures', 'last_error', 'retry_at', 'updated_at'])
+
+
+def needs_render(asset):
+    """True when an image has no asset yet, or its last failure's retry time has passed."""
+    return asset is None or (asset.retry_at is not None and asset.retry_at <= timezone.now())
+
+
+def schedule_variants(source_urls):
+    """
+    Queue a render_image_variants task per image URL; returns immediately. A URL that
+    is already queued or rendering is not queued again.
+    """
+    from .tasks import render_image_variants  # api.tasks imports this module
+
+    if not imaging.available_formats(settings.IMAGE_VARIANT_FORMATS):
+        return
+    for source_url in dict.fromkeys(url for url in source_urls if url):
+        digest = hashlib.sha256(source_url.encode()).hexdigest()
+        render_image_variants.enqueue([source_url], dedupe_key=f'image-variants:{digest}')
+
+
+def render_now(source_urls):
+    """Render variants for many URLs on a process pool and wait (used by management commands)."""
+    # Spawned, like the task worker's pool: forked children would share this process's connections.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(settings.IMAGE_PIPELINE_WORKERS, mp_context=context, initializer=django.setup) as pool:
+        futures = {url: pool.submit(imaging.render_variants, *_render_args(url)) for url in source_urls}
+        failures = {}
+        for url, future in futures.items():
+            try:
+                store_result(future.result())
+            except Exception as exc:  # noqa: BLE001 - reported to the caller
+                record_failure(url, exc)
+                failures[url] = exc
+    return failures
+
+
+def variant_map(asset):
+    """srcset strings per format plus intrinsic size, for <picture>/<img srcset>."""
+    if asset is None or not asset.variants:
+        return None
+    srcset = {
+        fmt: ', '.join(
+            f'{settings.MEDIA_URL}{path} {width}w'
+            for width, path in sorted(paths.items(), key=lambda item: int(item[0]))
+        )
+        for fmt, paths in asset.variants.items()
+    }
+    return {'width': asset.width, 'height': asset.height, 'srcset': srcset}
@@ -0,0 +1,129 @@
+"""
+Image variant rendering.
+Pure Pillow code with no Django imports, so it can run in worker processes.
+Pillow is optional: without it no variants are produced.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import urllib.parse
+import urllib.request
+
+try:
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+    features = None
+
+
+FORMAT_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 60},
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'progressive': True, 'optimize': True},
+}
+
+MAX_SOURCE_BYTES = 25 * 1024 * 1024
+
+
+def available_formats(formats):
+    """Formats from the list that this Pillow build can encode."""
+    if Image is None:
+        return []
+    return [fmt for fmt in formats if fmt == 'jpeg' or features.check(fmt)]
+
+
+class _AllowedHostsRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Follow redirects only to hosts that may be fetched themselves."""
+
+    def __init__(self, allowed_hosts):
+        self.allowed_hosts = allowed_hosts
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _check_host(newurl, self.allowed_hosts)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def _check_host(source_url, allowed_hosts):
+    parts = urllib.parse.urlsplit(source_url)
+    if parts.scheme not in ('http', 'https') or (parts.hostname or '') not in allowed_hosts:
+        raise ValueError(f'{source_url} is not on an allowed image host')
+
+
+def read_source(source_url, source_root, allowed_hosts=()):
+    """
+    Load source bytes from a site-relative path under source_root, or from an http(s) URL
+    whose host (and every redirect's host) is in allowed_hosts.
+    """
+    if source_url.startswith(('http://', 'https://')):
+        _check_host(source_url, allowed_hosts)
+        opener = urllib.request.build_opener(_AllowedHostsRedirectHandler(allowed_hosts))
+        with opener.open(source_url, timeout=15) as response:
+            data = response.read(MAX_SOURCE_BYTES + 1)
+    else:
+        root = os.path.realpath(source_root)
+        path = os.path.realpath(os.path.join(root, source_url.lstrip('/')))
+        if not path.startswith(root + os.sep):
+            raise ValueError(f'{source_url} is outside the image source root')
+        with open(path, 'rb') as source:
+            data = source.read(MAX_SOURCE_BYTES + 1)
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ValueError(f'{source_url} is larger than {MAX_SOURCE_BYTES} bytes')
+    return data
+
+
+def _write_atomic(image, path, options):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            image.save(out, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_variants(source_url, source_root, output_root, widths, formats, allowed_hosts=()):
+    """
+    Render resized variants of one image.
+
+    Output is content-addressed: variants/<hash[:2]>/<hash>/<width>.<ext>, where hash
+    is the SHA-256 of the source bytes, so existing files are reused and never change.
+    Returns {'source_url', 'content_hash', 'width', 'height', 'variants': {fmt: {width: path}}}.
+    """
+    data = read_source(source_url, source_root, allowed_hosts)
+    digest = hashlib.sha256(data).hexdigest()
+    base = os.path.join('variants', digest[:2], digest)
+
+    with Image.open(io.BytesIO(data)) as opened:
+        original = opened.convert('RGBA') if opened.mode not in ('RGB', 'RGBA') else opened
+        original.load()
+        width, height = original.size
+        targets = sorted({w for w in widths if w < width} | {min(width, max(widths))})
+        variants = {}
+        for fmt in available_formats(formats):
+            variants[fmt] = {}
+            for target in targets:
+                relative = os.path.join(base, f'{target}.{fmt}')
+                path = os.path.join(output_root, relative)
+                if not os.path.exists(path):
+                    image = original
+                    if target < width:
+                        image = original.resize((target, round(height * target / width)), Image.LANCZOS)
+                    if fmt == 'jpeg' and image.mode == 'RGBA':
+                        background = Image.new('RGB', image.size, (255, 255, 255))
+                        background.paste(image, mask=image.getchannel('A'))
+                        image = background
+                    _write_atomic(image, path, FORMAT_OPTIONS[fmt])
+                variants[fmt][str(target)] = relative.replace(os.sep, '/')
+
+    return {
+        'source_url': source_url,
+        'content_hash': digest,
+        'width': width,
+        'height': height,
+        'variants': variants,
+    }
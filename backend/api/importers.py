@@ -0,0 +1,406 @@
+"""
+Tender import pipeline.
+Streams the nightly ERP dump (CSV, JSON array or JSON Lines) and upserts
+tenders keyed on reference_number, writing only rows that changed.
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core import validators as django_validators
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework import validators as drf_validators
+from rest_framework.settings import ISO_8601, api_settings
+from rest_framework.utils.timezone import valid_datetime
+
+from .dashboard import invalidate_dashboard_stats
+from .models import CLOSED, OPEN, Tender
+from .serializers import TenderSerializer
+from .snapshots import schedule_publish
+
+
+IMPORT_FIELDS = ['title', 'description', 'reference_number', 'deadline', 'document_url', 'category']
+# Stored as NULL when blank, so '' from a file and NULL in the table compare equal
+NULLABLE_FIELDS = [name for name in IMPORT_FIELDS if Tender._meta.get_field(name).null]
+DEFAULT_BATCH_SIZE = 5000
+
+
+class TenderImportSerializer(TenderSerializer):
+    """TenderSerializer rules without the per-row uniqueness query (the importer diffs instead)."""
+    document = None
+
+    class Meta(TenderSerializer.Meta):
+        fields = IMPORT_FIELDS
+        extra_kwargs = {'reference_number': {'validators': []}}
+
+
+class FastRowValidator:
+    """
+    The TenderImportSerializer rules for the common case, without DRF's per-field overhead.
+    validate() returns the same data the serializer would, or None when the row is anything
+    but plainly valid (wrong type, too long, bad choice...); such rows go through the
+    serializer, which produces the error messages. Built from the serializer's own fields,
+    and only used while they carry no validators or hooks it does not know about.
+    """
+    KNOWN_VALIDATORS = (
+        django_validators.MaxLengthValidator, django_validators.ProhibitNullCharactersValidator,
+        drf_validators.ProhibitSurrogateCharactersValidator, django_validators.URLValidator,
+    )
+    REJECTED_CHARACTERS = re.compile('[\ud800-\udfff\x00]')
+
+    def __init__(self, serializer):
+        self.specs = []
+        self.supported = self._build(serializer)
+        self.url_validator = django_validators.URLValidator()
+
+    def _build(self, serializer):
+        if type(serializer).validate is not serializers.Serializer.validate or serializer.validators:
+            return False
+        for name, field_obj in serializer.fields.items():
+            if field_obj.read_only:
+                continue
+            if hasattr(serializer, f'validate_{name}') or not all(
+                isinstance(validator, self.KNOWN_VALIDATORS) for validator in field_obj.validators
+            ):
+                return False
+            if isinstance(field_obj, serializers.ChoiceField):
+                kind = 'choice'
+            elif (isinstance(field_obj, serializers.DateTimeField) and settings.USE_TZ
+                  and not hasattr(field_obj, 'input_formats') and not hasattr(field_obj, 'timezone')
+                  and list(api_settings.DATETIME_INPUT_FORMATS) == [ISO_8601]):
+                kind = 'datetime'
+            elif type(field_obj) in (serializers.CharField, serializers.URLField) and field_obj.trim_whitespace:
+                kind = 'url' if isinstance(field_obj, serializers.URLField) else 'text'
+            else:
+                return False
+            self.specs.append((name, kind, field_obj))
+        return True
+
+    def validate(self, row, tz):
+        if not self.supported or not isinstance(row, dict):
+            return None
+        data = {}
+        for name, kind, field_obj in self.specs:
+            if name not in row:
+                if field_obj.required:
+                    return None
+                continue
+            value = row[name]
+            if type(value) is not str:
+                return None
+            if kind == 'choice':
+                if value not in field_obj.choice_strings_to_values:
+                    return None
+                data[name] = field_obj.choice_strings_to_values[value]
+            elif kind == 'datetime':
+                try:
+                    parsed = parse_datetime(value)
+                    parsed = parsed.astimezone(tz) if timezone.is_aware(parsed) else timezone.make_aware(parsed, tz)
+                except (ValueError, TypeError, AttributeError, OverflowError):
+                    return None
+                if not valid_datetime(parsed):
+                    return None
+                data[name] = parsed
+            else:
+                value = value.strip()
+                if not value:
+                    if not field_obj.allow_blank:
+                        return None
+                elif (field_obj.max_length is not None and len(value) > field_obj.max_length) or self.REJECTED_CHARACTERS.search(value):
+                    return None
+                elif kind == 'url':
+                    try:
+                        self.url_validator(value)
+                    except DjangoValidationError:
+                        return None
+                data[name] = value
+        return data
+
+
+# ==================== Readers ====================
+
+def detect_format(filename):
+    """Guess the dump format from a file name."""
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if ext == '.json':
+        return 'json'
+    return 'csv'
+
+
+def _read_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _read_jsonl(stream):
+    for line_num, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_num, json.loads(line)
+
+
+def _read_json_array(stream, chunk_size=64 * 1024):
+    """
+    Decode a top-level JSON array one element at a time without loading the whole file.
+    Elements must be separated by exactly one comma.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    expect = '['  # then 'first' (an element or ']'), 'element', 'separator' (',' or ']')
+    index = 0
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if buffer:
+            token = buffer[0]
+            if expect == '[':
+                if token != '[':
+                    raise ValueError('Expected a JSON array.')
+                buffer, expect = buffer[1:], 'first'
+                continue
+            if token == ']' and expect in ('first', 'separator'):
+                return
+            if expect == 'separator':
+                if token != ',':
+                    raise ValueError(f'Expected "," or "]" after element {index}.')
+                buffer, expect = buffer[1:], 'element'
+                continue
+            if token in ',]':
+                raise ValueError(f'Expected an element after element {index}.' if index else 'Expected an element.')
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A value ending exactly at the buffer end (e.g. a number) may continue in the next chunk.
+                if end < len(buffer) or eof:
+                    index += 1
+                    yield index, obj
+                    buffer, expect = buffer[end:], 'separator'
+                    continue
+        if eof:
+            if expect == '[':
+                return  # Empty file
+            raise ValueError('Unexpected end of JSON input.')
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+READERS = {
+    'csv': _read_csv,
+    'json': _read_json_array,
+    'jsonl': _read_jsonl,
+}
+
+
+# ==================== Importer ====================
+
+@dataclass
+class ImportReport:
+    """Outcome of one import run."""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deactivated: int = 0
+    rejects: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.unchanged + len(self.rejects)
+
+    @property
+    def rows_per_second(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f'{self.created} created, {self.updated} updated, {self.unchanged} unchanged, '
+            f'{self.deactivated} deactivated, {len(self.rejects)} rejected'
+        )
+
+
+class TenderImporter:
+    """
+    Upsert tenders from an ERP dump.
+
+    Rows are validated with TenderSerializer rules (FastRowValidator for the plainly
+    valid ones), then diffed per batch against existing tenders fetched as plain
+    values in a single reference_number__in lookup. Only new or changed rows are
+    written (one executemany INSERT / bulk_update). Tenders missing from a complete
+    dump are deactivated at the end.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, deactivate_missing=True):
+        self.batch_size = batch_size
+        self.deactivate_missing = deactivate_missing
+        self.validator = TenderImportSerializer()
+        self.fast_validator = FastRowValidator(self.validator)
+
+    def run(self, stream, fmt='csv'):
+        report = ImportReport()
+        self.changed_pks = set()
+        started = time.monotonic()
+        seen = set()
+        batch = []
+        tz = timezone.get_current_timezone()
+
+        for line, row in READERS[fmt](stream):
+            reference = str(row.get('reference_number') or '').strip() if isinstance(row, dict) else ''
+            if reference in seen:
+                report.rejects.append((line, reference, {'reference_number': ['Duplicate reference_number in file.']}))
+                continue
+            if reference:
+                # Rejected rows still count as present so a bad row never deactivates its tender.
+                seen.add(reference)
+            data = self.fast_validator.validate(row, tz)
+            if data is None:
+                try:
+                    data = self.validator.run_validation(row)
+                except serializers.ValidationError as exc:
+                    report.rejects.append((line, reference, exc.detail))
+                    continue
+            batch.append(data)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._write_batch(batch, report)
+        if self.deactivate_missing:
+            report.deactivated = self._deactivate_missing(seen)
+        if report.created or report.updated or report.deactivated:
+            # bulk_create/bulk_update/update() send no model signals.
+            invalidate_dashboard_stats()
+            if settings.SNAPSHOT_AUTO_PUBLISH:
+                schedule_publish(Tender, self.changed_pks)
+
+        report.elapsed = time.monotonic() - started
+        return report
+
+    def _write_batch(self, rows, report):
+        # Plain tuples: no model instance is built for the (usually many) unchanged rows.
+        columns = ['pk', 'is_active', 'status', *IMPORT_FIELDS]
+        existing = {
+            values[3 + IMPORT_FIELDS.index('reference_number')]: dict(zip(columns, values))
+            for values in Tender.objects.filter(
+                reference_number__in=[row['reference_number'] for row in rows]
+            ).values_list(*columns)
+        }
+        now = timezone.now()
+        cutoff = Tender.deadline_cutoff(now)
+        to_create, to_update = [], []
+        changed_fields = set()
+
+        for row in rows:
+            for name in NULLABLE_FIELDS:
+                if name in row and not row[name]:
+                    row[name] = None
+            current = existing.get(row['reference_number'])
+            if current is None:
+                to_create.append({**row, 'status': CLOSED if row['deadline'] <= cutoff else OPEN})
+                continue
+            changed = [name for name, value in row.items() if current[name] != value]
+            # bulk writes skip save(), so keep status in step with a moved deadline here.
+            status = CLOSED if row.get('deadline', current['deadline']) <= cutoff else OPEN
+            if status != current['status']:
+                changed.append('status')
+            if changed or not current['is_active']:
+                changed_fields.update(changed)
+                tender = Tender(**{**current, **row, 'status': status, 'is_active': True, 'updated_at': now})
+                to_update.append(tender)
+            else:
+                report.unchanged += 1
+
+        with transaction.atomic():
+            if to_create:
+                self.changed_pks.update(self._insert(to_create, now))
+            if to_update:
+                # Only the columns that differ anywhere in the batch go into the CASE expressions.
+                Tender.objects.bulk_update(to_update, sorted(changed_fields) + ['is_active', 'updated_at'])
+        self.changed_pks.update(tender.pk for tender in to_update)
+        report.created += len(to_create)
+        report.updated += len(to_update)
+
+    def _insert(self, rows, now):
+        """
+        INSERT validated rows with one executemany and return their primary keys.
+        bulk_create would build a model instance and run get_db_prep_save for every cell;
+        here only datetime columns need adapting and the row-independent ones are done once.
+        """
+        ops = connection.ops
+        fields = [f for f in Tender._meta.concrete_fields if not f.primary_key]
+        constant = {'created_at': now, 'updated_at': now, 'is_active': True}
+        for field_obj in fields:
+            if field_obj.name not in IMPORT_FIELDS and field_obj.name not in constant and field_obj.name != 'status':
+                constant[field_obj.name] = field_obj.get_default()
+        adapt = {
+            f.name: ops.adapt_datetimefield_value for f in fields if isinstance(f, models.DateTimeField)
+        }
+        constant = {name: adapt[name](value) if name in adapt else value for name, value in constant.items()}
+
+        params = []
+        for row in rows:
+            values = []
+            for field_obj in fields:
+                name = field_obj.name
+                if name in constant:
+                    values.append(constant[name])
+                else:
+                    value = row.get(name, field_obj.get_default())
+                    values.append(adapt[name](value) if name in adapt else value)
+            params.append(values)
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            ops.quote_name(Tender._meta.db_table),
+            ', '.join(ops.quote_name(f.column) for f in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+        return Tender.objects.filter(
+            reference_number__in=[row['reference_number'] for row in rows]
+        ).values_list('pk', flat=True)
+
+    def _deactivate_missing(self, seen):
+        missing = [
+            pk for pk, reference in Tender.objects.filter(is_active=True)
+            .values_list('pk', 'reference_number').iterator(chunk_size=self.batch_size)
+            if reference not in seen
+        ]
+        now = timezone.now()
+        for start in range(0, len(missing), self.batch_size):
+            Tender.objects.filter(pk__in=missing[start:start + self.batch_size]).update(
+                is_active=False, updated_at=now
+            )
+        self.changed_pks.update(missing)
+        return len(missing)
+
+
+def format_errors(errors):
+    """Flatten serializer errors into one readable line."""
+    if isinstance(errors, dict):
+        return '; '.join(f'{name}: {format_errors(value)}' for name, value in errors.items())
+    if isinstance(errors, list):
+        return ' '.join(format_errors(value) for value in errors)
+    return str(errors)
+
+
+def write_rejects(rejects, stream):
+    """Write rejected rows as CSV (line, reference_number, errors)."""
+    writer = csv.writer(stream)
+    writer.writerow(['line', 'reference_number', 'errors'])
+    for line, reference, errors in rejects:
+        writer.writerow([line, reference, json.dumps(errors)])
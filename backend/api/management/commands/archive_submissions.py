@@ -0,0 +1,46 @@
+"""
+Move old, handled contact messages and job applications to the archive table.
+Run: python manage.py archive_submissions
+     python manage.py archive_submissions --days 730 --dry-run
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.archive import ARCHIVE_RULES, archive_batch, eligible
+from api.dashboard import invalidate_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Archive read messages and reviewed applications older than ARCHIVE_AFTER_DAYS in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help='Archive handled rows created more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                            help='Rows moved per transaction')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches (eases load on a busy primary)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        for model in ARCHIVE_RULES:
+            name = model._meta.verbose_name_plural
+            if options['dry_run']:
+                self.stdout.write(f'{eligible(model, cutoff).count()} {name} would be archived')
+                continue
+            moved = 0
+            while True:
+                count = archive_batch(model, cutoff, options['batch_size'])
+                moved += count
+                if count < options['batch_size']:
+                    break
+                time.sleep(options['pause'])
+            self.stdout.write(self.style.SUCCESS(f'🗄️  Archived {moved} {name}'))
+        if not options['dry_run']:
+            invalidate_dashboard_stats()
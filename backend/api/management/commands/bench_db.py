@@ -0,0 +1,125 @@
+"""
+Database connection benchmark.
+Run: python manage.py bench_db --threads 64 --requests 200
+
+Simulates many concurrent workers that each open a connection, run a
+typical list query and release the connection, as a request would.
+Compare DB_POOL_MODE=persistent / native / pgbouncer against a local
+Postgres (DATABASE_URL=postgresql://postgres@localhost:5432/rampal).
+
+With --write-ratio, that share of requests is a contact-form style write
+(a read and an insert in one transaction), which exercises locking:
+compare SQLITE_MODE=default with SQLITE_MODE=tuned on SQLite. The inserted
+messages, and the outbox and tombstone rows their signals write, are removed
+afterwards.
+"""
+
+import random
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from api.models import ContactMessage, Notification, Tender, Tombstone
+from api.views import database_pool_stats
+
+BENCH_EMAIL = 'bench@example.com'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark connection handling under many concurrent workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=64)
+        parser.add_argument('--requests', type=int, default=200, help='Requests per thread')
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--read-database', help='Alias for reads (e.g. sqlite_read); defaults to --database')
+        parser.add_argument('--write-ratio', type=float, default=0.0, help='Share of requests that write (0-1)')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        read_alias = options['read_database'] or alias
+        latencies, errors = [], []
+        counts = {'reads': 0, 'writes': 0}
+        lock = threading.Lock()
+        start_gate = threading.Barrier(options['threads'])
+
+        def read():
+            list(Tender.objects.using(read_alias).filter(is_active=True).values_list('pk', flat=True)[:10])
+
+        def write():
+            with transaction.atomic(using=alias):
+                ContactMessage.objects.using(alias).filter(email=BENCH_EMAIL).exists()
+                ContactMessage.objects.using(alias).create(
+                    name='Bench', email=BENCH_EMAIL, subject='Benchmark', message='bench_db write',
+                )
+
+        def worker():
+            local, failures = [], []
+            local_counts = {'reads': 0, 'writes': 0}
+            start_gate.wait()
+            for _ in range(options['requests']):
+                is_write = random.random() < options['write_ratio']
+                started = time.perf_counter()
+                try:
+                    write() if is_write else read()
+                except Exception as exc:  # noqa: BLE001 - counted and reported
+                    failures.append(repr(exc))
+                finally:
+                    # Request end: returns the connection to the pool or keeps it (persistent mode).
+                    for name in {alias, read_alias}:
+                        connections[name].close_if_unusable_or_obsolete()
+                local.append(time.perf_counter() - started)
+                local_counts['writes' if is_write else 'reads'] += 1
+            connections.close_all()
+            with lock:
+                latencies.extend(local)
+                errors.extend(failures)
+                for key, value in local_counts.items():
+                    counts[key] += value
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            if options['write_ratio']:
+                self.clean_up_writes(alias)
+
+        latencies.sort()
+        total = len(latencies)
+        self.stdout.write(self.style.SUCCESS(
+            f'⚡ {total} requests on {options["threads"]} threads in {elapsed:.2f}s ({total / elapsed:,.0f} req/s)'
+        ))
+        if counts['writes']:
+            self.stdout.write(
+                f'📝 {counts["reads"] / elapsed:,.0f} reads/s, {counts["writes"] / elapsed:,.0f} writes/s'
+            )
+        self.stdout.write(
+            f'⏱️  p50 {statistics.median(latencies) * 1000:.2f} ms, '
+            f'p95 {latencies[int(total * 0.95) - 1] * 1000:.2f} ms, '
+            f'p99 {latencies[int(total * 0.99) - 1] * 1000:.2f} ms'
+        )
+        if errors:
+            self.stdout.write(self.style.ERROR(f'❌ {len(errors)} errors, first: {errors[0]}'))
+        self.stdout.write(f'📊 Pool: {database_pool_stats().get(alias)}')
+
+    def clean_up_writes(self, alias, chunk_size=500):
+        """Delete the benchmark's messages and the Notification/Tombstone rows their signals wrote."""
+        messages = ContactMessage.objects.using(alias).filter(email=BENCH_EMAIL)
+        pks = list(messages.values_list('pk', flat=True))
+        for start in range(0, len(pks), chunk_size):
+            chunk = pks[start:start + chunk_size]
+            with transaction.atomic(using=alias):
+                Notification.objects.using(alias).filter(kind='contact', object_id__in=chunk).delete()
+                ContactMessage.objects.using(alias).filter(pk__in=chunk).delete()
+                Tombstone.objects.using(alias).filter(
+                    model=ContactMessage._meta.label_lower, object_id__in=chunk
+                ).delete()
+        self.stdout.write(f'🧹 Removed {len(pks)} benchmark message(s) and their outbox/tombstone rows')
@@ -0,0 +1,196 @@
+"""
+Compare EXPLAIN plans of the hot API/admin queries with the committed snapshot.
+Run: python manage.py check_query_plans
+     python manage.py check_query_plans --update    (after reviewing an intended change)
+     DATABASE_URL=postgresql://postgres@localhost:5432/rampal python manage.py check_query_plans
+
+Seeds a throwaway test database (the configured one is not touched), requests every
+viewset list, list action and filter plus every admin changelist and filter, and
+EXPLAINs the SELECTs they run. Fails when a query gains a full table scan or a sort
+that its snapshot does not have, or when a query has no snapshot yet.
+"""
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api import queryplans
+from api.events import to_cursor
+from api.sync import DeltaSyncMixin
+from api.urls import router
+
+
+DEFAULT_ROWS = 20000
+
+# Filters that are not discoverable from the viewset/admin attributes
+EXTRA_CASES = [
+    ('/api/applications/', {'career': 'first:api.career'}),
+    ('/api/archive/', {'model': 'application'}),
+    ('/api/archive/', {'email': 'user1@example.com'}),
+    ('/api/archive/', {'model': 'contact', 'created_after': '2025-01-01T00:00:00Z'}),
+    ('/admin/api/jobapplication/', {'career__id__exact': 'first:api.career'}),
+    ('/admin/api/archivedrecord/', {'q': 'user1@example.com'}),
+]
+
+
+def api_cases():
+    """(path, params) for each viewset's list, detail=False GET actions and known filters."""
+    cases = []
+    for prefix, viewset, _ in router.registry:
+        base = f'/api/{prefix}/'
+        if hasattr(viewset, 'list'):
+            cases.append((base, {}))
+            if issubclass(viewset, DeltaSyncMixin):
+                cases.append((base, {'updated_since': 'cursor:1'}))
+            cases += [(base, {f'{field}_min': '1'}) for field in getattr(viewset, 'range_filter_fields', ())]
+            cases += [(base, {'ordering': f'-{field}'}) for field in getattr(viewset, 'ordering_fields', None) or ()]
+            cases += [(base, {'expand': name}) for name in getattr(viewset, 'expandable', {})]
+        for extra in viewset.get_extra_actions():
+            if not extra.detail and 'get' in extra.mapping:
+                cases.append((f'{base}{extra.url_path}/', {}))
+        cases.append((f'{base}first:{viewset.queryset.model._meta.label_lower}/', {}))
+    return cases
+
+
+def admin_cases():
+    """(path, params) for each api changelist, each of its field filters and its search."""
+    cases = []
+    for model, model_admin in admin.site._registry.items():
+        if model._meta.app_label != 'api':
+            continue
+        base = f'/admin/api/{model._meta.model_name}/'
+        cases.append((base, {}))
+        for item in model_admin.list_filter:
+            if not isinstance(item, str):
+                continue
+            field = model._meta.get_field(item)
+            if isinstance(field, models.ForeignKey):
+                cases.append((base, {f'{item}__id__exact': f'first:{field.related_model._meta.label_lower}'}))
+            elif isinstance(field, (models.DateTimeField, models.DateField)):
+                cases.append((base, {f'{item}__gte': 'date:7'}))
+            else:
+                cases.append((base, {f'{item}__exact': f'value:{model._meta.label_lower}.{item}'}))
+        if model_admin.search_fields:
+            cases.append((base, {'q': 'text 1'}))
+    return cases
+
+
+def resolve(value):
+    """
+    Fill placeholders from the seeded data: 'first:<model>' (lowest pk), 'value:<model>.<field>'
+    (the field of that row), 'cursor:<days>' / 'date:<days>' (midnight that many days ago, as
+    in the admin's own date filter links).
+    Cases are labelled with the placeholders, so labels are the same on every run.
+    """
+    kind, _, target = value.partition(':')
+    if kind == 'first':
+        return str(apps.get_model(target).objects.order_by('pk').values_list('pk', flat=True).first())
+    if kind == 'value':
+        label, _, field = target.rpartition('.')
+        found = apps.get_model(label).objects.order_by('pk').values_list(field, flat=True).first()
+        return str(int(found)) if isinstance(found, bool) else str(found)
+    if kind in ('cursor', 'date'):
+        moment = timezone.localtime() - timedelta(days=int(target))
+        return str(to_cursor(moment)) if kind == 'cursor' else str(moment.replace(hour=0, minute=0, second=0, microsecond=0))
+    return value
+
+
+class Command(BaseCommand):
+    help = 'Check EXPLAIN plans of hot API and admin queries against the committed snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, help=f'Seed size (default: the snapshot\'s, else {DEFAULT_ROWS})')
+        parser.add_argument('--update', action='store_true', help='Write the current plans as the new snapshot')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not just differences')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        snapshot = queryplans.load_snapshot(vendor)
+        rows = options['rows'] or (snapshot or {}).get('rows') or DEFAULT_ROWS
+        if snapshot is None and not options['update']:
+            raise CommandError(f'No snapshot for {vendor}; run with --update to create {queryplans.snapshot_path(vendor)}.')
+        if snapshot and snapshot['rows'] != rows and not options['update']:
+            self.stdout.write(self.style.WARNING(f"⚠️  Snapshot was taken with --rows {snapshot['rows']}; plans may differ."))
+
+        old_name = connection.settings_dict['NAME']
+        self.stdout.write(f'🌱 Seeding a test {vendor} database with --rows {rows}...')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Reads stay on the test database; the seeded image URLs are not fetched.
+            with override_settings(ALLOWED_HOSTS=['testserver'], DATABASE_REPLICAS=[], IMAGE_VARIANT_FORMATS=[]):
+                queryplans.seed(rows)
+                plans = self.capture(options['verbose_plans'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['update']:
+            queryplans.write_snapshot(vendor, {'vendor': vendor, 'rows': rows, 'cases': plans})
+            self.stdout.write(self.style.SUCCESS(f'✅ Wrote {len(plans)} cases to {queryplans.snapshot_path(vendor)}'))
+            return
+        self.compare(snapshot['cases'], plans)
+
+    def capture(self, verbose):
+        user = get_user_model().objects.create_superuser('plans', 'plans@example.com', 'plans')
+        client = Client()
+        client.force_login(user)
+        plans = {}
+        for path, params in api_cases() + admin_cases() + EXTRA_CASES:
+            label = ' '.join([path] + [f'{key}={value}' for key, value in sorted(params.items())])
+            path = '/'.join(resolve(part) for part in path.split('/'))
+            params = {key: resolve(value) for key, value in params.items()}
+            for cache in caches.all():
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path, params)
+            if response.status_code >= 400:
+                raise CommandError(f'{label} returned {response.status_code}')
+            case = {}
+            for query in queries.captured_queries:
+                if queryplans.is_captured(query['sql']):
+                    case.setdefault(queryplans.query_shape(query['sql']), queryplans.explain(query['sql']))
+            plans[label] = case
+            if verbose:
+                self.stdout.write(f'📋 {label}')
+                for shape, lines in case.items():
+                    self.stdout.write(f'   {shape[:150]}')
+                    self.stdout.write('\n'.join(f'      {line}' for line in lines))
+        return plans
+
+    def compare(self, expected, plans):
+        failures, changed = 0, 0
+        for label, case in plans.items():
+            known = expected.get(label)
+            if known is None:
+                self.stdout.write(self.style.ERROR(f'❌ {label}: no snapshot'))
+                failures += 1
+                continue
+            problems = []
+            for shape, lines in case.items():
+                if shape not in known:
+                    problems.append(f'query not in snapshot: {shape[:150]}')
+                else:
+                    problems += [f'{issue}: {shape[:150]}' for issue in queryplans.regressions(known[shape], lines)]
+                    changed += lines != known[shape]
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'❌ {label}'))
+                for problem in problems:
+                    self.stdout.write(f'   {problem}')
+            else:
+                self.stdout.write(f'✅ {label} ({len(case)} queries)')
+        for label in expected.keys() - plans.keys():
+            self.stdout.write(self.style.WARNING(f'⚠️  {label}: in snapshot but no longer requested'))
+
+        if failures:
+            raise CommandError(f'{failures} case(s) regressed or are not in the snapshot; '
+                               'fix the query/index, or review and run with --update.')
+        note = f' ({changed} plans changed without new scans or sorts; --update to record them)' if changed else ''
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(plans)} cases match the snapshot{note}'))
@@ -0,0 +1,60 @@
+"""
+Close tenders and careers whose deadline has passed.
+Run: python manage.py close_expired            (once, e.g. from cron)
+     python manage.py close_expired --loop     (stays up and wakes at each deadline)
+"""
+
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.dashboard import invalidate_dashboard_stats
+from api.models import Career, Tender
+from api.snapshots import schedule_publish
+
+
+class Command(BaseCommand):
+    help = 'Flip expired tenders and careers to closed in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and close rows as deadlines pass')
+        parser.add_argument('--max-sleep', type=int, default=300,
+                            help='Longest wait between passes in --loop mode, in seconds (picks up new deadlines)')
+
+    def handle(self, *args, **options):
+        while True:
+            now = timezone.now()
+            if settings.SNAPSHOT_AUTO_PUBLISH:
+                expired_tenders = list(Tender.objects.expired(now).values_list('pk', flat=True))
+            tenders = Tender.objects.close_expired(now)
+            careers = Career.objects.close_expired(now)
+            if tenders or careers:
+                # update() sends no model signals.
+                invalidate_dashboard_stats()
+                if settings.SNAPSHOT_AUTO_PUBLISH and tenders:
+                    schedule_publish(Tender, expired_tenders)
+                self.stdout.write(self.style.SUCCESS(f'🔒 Closed {tenders} tender(s) and {careers} career(s)'))
+            elif not options['loop']:
+                self.stdout.write('Nothing to close.')
+
+            if not options['loop']:
+                return
+            time.sleep(self.seconds_until_next_deadline(options['max_sleep']))
+
+    def seconds_until_next_deadline(self, max_sleep):
+        """Sleep until the earliest open deadline passes, but never longer than max_sleep."""
+        now = timezone.now()
+        wake_times = []
+        tender_deadline = Tender.objects.next_deadline()
+        if tender_deadline is not None:
+            wake_times.append(tender_deadline)
+        career_deadline = Career.objects.next_deadline()
+        if career_deadline is not None:
+            # Careers close at the start of the day after their deadline.
+            wake_times.append(timezone.make_aware(datetime.combine(career_deadline + timedelta(days=1), dt_time.min)))
+        if not wake_times:
+            return max_sleep
+        return min(max(0.0, (min(wake_times) - now).total_seconds()) + 1, max_sleep)
@@ -0,0 +1,59 @@
+"""
+Delete rows and their cascades in small batches (no collector, no giant transaction).
+Run: python manage.py delete_batched api.Career --pk 12
+     python manage.py delete_batched api.ContactMessage --filter is_read=True --filter created_at__lt=2024-01-01
+Interrupted runs are resumed by running the same command again.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.deletion import ProtectedError, RestrictedError
+
+from api.deletion import BatchedDeletion, count_rows
+
+
+class Command(BaseCommand):
+    help = 'Batched, resumable deletion of rows and everything that cascades from them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. api.Career')
+        parser.add_argument('--pk', type=int, action='append', default=[], help='Row to delete (repeatable)')
+        parser.add_argument('--filter', action='append', default=[], metavar='LOOKUP=VALUE',
+                            help='Delete rows matching this ORM lookup (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=settings.DELETE_BATCH_SIZE, help='Rows per transaction')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(exc)
+        if not options['pk'] and not options['filter']:
+            raise CommandError('Give --pk or --filter; refusing to delete the whole table.')
+
+        queryset = model._base_manager.all()
+        if options['pk']:
+            queryset = queryset.filter(pk__in=options['pk'])
+        for condition in options['filter']:
+            lookup, sep, value = condition.partition('=')
+            if not sep:
+                raise CommandError(f'Bad --filter {condition!r}; expected LOOKUP=VALUE.')
+            queryset = queryset.filter(**{lookup: value})
+
+        if options['dry_run']:
+            for counted, count in count_rows(queryset).items():
+                self.stdout.write(f'{count} {counted._meta.verbose_name_plural} would be deleted')
+            return
+
+        def progress(done, total, message):
+            self.stdout.write(f'  {done}/{total} {message}')
+
+        deletion = BatchedDeletion(queryset, options['batch_size'], options['pause'], progress)
+        try:
+            deleted = deletion.run()
+        except (ProtectedError, RestrictedError) as exc:
+            raise CommandError(exc.args[0])
+        for deleted_model, count in deleted.items():
+            self.stdout.write(self.style.SUCCESS(f'🗑️  Deleted {count} {deleted_model._meta.verbose_name_plural}'))
@@ -0,0 +1,34 @@
+"""
+Render responsive image variants for every image_url.
+Run: python manage.py generate_image_variants [--missing-only]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+
+from api import imaging
+from api.images import render_now
+from api.models import BoardMember, CSRInitiative, ImageAsset, News, Project
+
+
+class Command(BaseCommand):
+    help = 'Render AVIF/WebP/JPEG variants for News, Project, BoardMember and CSRInitiative images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='Skip images that already have variants (failed ones are retried)')
+
+    def handle(self, *args, **options):
+        if not imaging.available_formats(settings.IMAGE_VARIANT_FORMATS):
+            raise CommandError('Pillow is not installed (or supports none of IMAGE_VARIANT_FORMATS).')
+
+        urls = set()
+        for model in (News, Project, BoardMember, CSRInitiative):
+            urls.update(model.objects.exclude(image_url__isnull=True).exclude(image_url='')
+                        .values_list('image_url', flat=True))
+        if options['missing_only']:
+            urls -= set(ImageAsset.objects.filter(source_url__in=urls, failures=0).values_list('source_url', flat=True))
+
+        failures = render_now(sorted(urls))
+        for url, exc in failures.items():
+            self.stdout.write(self.style.ERROR(f'❌ {url}: {exc}'))
+        self.stdout.write(self.style.SUCCESS(f'🖼️  Rendered variants for {len(urls) - len(failures)} image(s)'))
@@ -0,0 +1,56 @@
+"""
+Import tenders from the procurement ERP dump.
+Run: python manage.py import_tenders tenders.csv --rejects rejects.csv
+
+Accepts CSV, JSON array (.json) or JSON Lines (.jsonl/.ndjson) files.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importers import (
+    DEFAULT_BATCH_SIZE, READERS, TenderImporter, detect_format, write_rejects
+)
+
+
+class Command(BaseCommand):
+    help = 'Upsert tenders from an ERP dump keyed on reference_number'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the dump file ("-" reads stdin)')
+        parser.add_argument('--format', choices=sorted(READERS), help='Override format detection')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--keep-missing', action='store_true',
+            help='Do not deactivate tenders that are absent from the dump',
+        )
+        parser.add_argument('--rejects', help='Write rejected rows to this CSV file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        importer = TenderImporter(
+            batch_size=options['batch_size'],
+            deactivate_missing=not options['keep_missing'],
+        )
+
+        try:
+            if path == '-':
+                report = importer.run(sys.stdin, fmt)
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = importer.run(stream, fmt)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Import failed: {exc}')
+
+        self.stdout.write(self.style.SUCCESS(f'📥 {report.summary()}'))
+        self.stdout.write(f'⏱️  {report.processed} rows in {report.elapsed:.2f}s ({report.rows_per_second:,.0f} rows/s)')
+
+        if report.rejects:
+            if options['rejects']:
+                with open(options['rejects'], 'w', newline='') as out:
+                    write_rejects(report.rejects, out)
+                self.stdout.write(self.style.WARNING(f'⚠️  Rejects written to {options["rejects"]}'))
+            else:
+                write_rejects(report.rejects, self.stdout)
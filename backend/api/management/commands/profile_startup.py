@@ -0,0 +1,78 @@
+"""
+Measure cold-start and per-request overhead of the process profiles.
+Run: python manage.py profile_startup --runs 5 --requests 2000
+
+Each profile is measured in fresh interpreters: the time to import Django,
+load settings and apps, build the WSGI handler and import the URLconf, then
+the mean time to push a GET of /api/ through the full middleware stack.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+PROFILES = ['core.settings', 'core.settings_admin', 'core.settings_api']
+
+PROBE = '''
+import json, os, sys, time
+started = time.perf_counter()
+os.environ['DJANGO_SETTINGS_MODULE'] = sys.argv[1]
+from django.core.wsgi import get_wsgi_application
+from django.conf import settings
+from django.urls import get_resolver
+handler = get_wsgi_application()
+get_resolver().url_patterns
+startup = time.perf_counter() - started
+
+from wsgiref.util import setup_testing_defaults
+settings.ALLOWED_HOSTS = ['*']
+def start_response(status, headers):
+    assert status.startswith('200'), status
+environ = {'PATH_INFO': '/api/', 'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT': 'application/json'}
+setup_testing_defaults(environ)
+for _ in range(50):
+    b''.join(handler(dict(environ), start_response))
+requests = int(sys.argv[2])
+started = time.perf_counter()
+for _ in range(requests):
+    b''.join(handler(dict(environ), start_response))
+per_request = (time.perf_counter() - started) / requests
+print(json.dumps({
+    'startup': startup,
+    'per_request': per_request,
+    'apps': len(settings.INSTALLED_APPS),
+    'middleware': len(settings.MIDDLEWARE),
+    'modules': len(sys.modules),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Compare cold-start time and per-request middleware overhead across settings profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per profile')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per interpreter')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"profile":<22}{"apps":>6}{"mw":>5}{"modules":>9}{"startup ms":>12}{"request µs":>12}')
+        for profile in PROFILES:
+            results = []
+            for _ in range(options['runs']):
+                output = subprocess.run(
+                    [sys.executable, '-c', PROBE, profile, str(options['requests'])],
+                    capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+                ).stdout
+                results.append(json.loads(output.strip().splitlines()[-1]))
+            startup = statistics.median(r['startup'] for r in results) * 1000
+            per_request = statistics.median(r['per_request'] for r in results) * 1_000_000
+            last = results[-1]
+            self.stdout.write(
+                f'{profile:<22}{last["apps"]:>6}{last["middleware"]:>5}{last["modules"]:>9}'
+                f'{startup:>12.1f}{per_request:>12.1f}'
+            )
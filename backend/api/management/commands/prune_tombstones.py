@@ -0,0 +1,25 @@
+"""
+Delete tombstones older than the delta-sync retention.
+Run: python manage.py prune_tombstones
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Remove delete records that delta-sync cursors can no longer reach'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+                            help='Keep tombstones for this many days (cursors older than this get 410 Gone)')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        count, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'🪦 Removed {count} tombstone(s) older than {options["days"]} day(s)'))
@@ -0,0 +1,36 @@
+"""
+Render the public read API to static JSON files.
+Run: python manage.py publish_snapshots [--only news tenders ...]
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.snapshots import SNAPSHOT_ENDPOINTS, brotli, publish_model
+
+
+class Command(BaseCommand):
+    help = 'Write list and detail snapshots of the public API (with .gz/.br) to SNAPSHOT_ROOT'
+
+    def add_arguments(self, parser):
+        prefixes = [prefix for prefix, _ in SNAPSHOT_ENDPOINTS.values()]
+        parser.add_argument('--only', nargs='+', choices=prefixes, help='Publish only these endpoints')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if brotli is None:
+            self.stdout.write(self.style.WARNING('⚠️  brotli is not installed; writing .gz siblings only'))
+
+        total = 0
+        for model, (prefix, _) in SNAPSHOT_ENDPOINTS.items():
+            if options['only'] and prefix not in options['only']:
+                continue
+            written = publish_model(model)
+            total += written
+            self.stdout.write(f'  /api/{prefix}/: {written} file(s) updated')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'📦 {total} snapshot(s) updated in {settings.SNAPSHOT_ROOT} ({time.monotonic() - started:.1f}s)'
+        ))
@@ -0,0 +1,17 @@
+"""
+Delete stored Idempotency-Key responses past their replay window.
+Run: python manage.py purge_idempotency_keys
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = f'Remove Idempotency-Key records older than IDEMPOTENCY_KEY_TTL_HOURS ({settings.IDEMPOTENCY_KEY_TTL_HOURS}h)'
+
+    def handle(self, *args, **options):
+        count = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'🔑 Removed {count} expired idempotency key(s)'))
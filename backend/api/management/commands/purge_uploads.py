@@ -0,0 +1,56 @@
+"""
+Remove abandoned uploads and stored files nothing refers to.
+Run: python manage.py purge_uploads
+"""
+
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.files import discard_session, storage_path, temp_dir
+from api.models import StoredFile, UploadSession
+
+
+class Command(BaseCommand):
+    help = 'Delete expired upload sessions, stale temp files and unreferenced stored files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.UPLOAD_SESSION_TTL_HOURS,
+                            help='Age after which unfinished or unreferenced uploads are removed')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+
+        sessions = 0
+        for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+            discard_session(session)
+            sessions += 1
+
+        # Temp files left behind by interrupted workers.
+        temp_files = 0
+        directory = temp_dir()
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.getmtime(path) < time.time() - options['hours'] * 3600:
+                os.unlink(path)
+                temp_files += 1
+
+        unreferenced = StoredFile.objects.filter(created_at__lt=cutoff)
+        for relation in StoredFile._meta.related_objects:
+            unreferenced = unreferenced.filter(**{f'{relation.name}__isnull': True})
+        files = 0
+        for stored_file in unreferenced.iterator():
+            try:
+                os.unlink(storage_path(stored_file.relative_path))
+            except FileNotFoundError:
+                pass
+            stored_file.delete()
+            files += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🧹 Removed {sessions} expired session(s), {temp_files} temp file(s) and {files} unreferenced file(s)'
+        ))
@@ -0,0 +1,22 @@
+"""
+Repair the denormalized application counters on Career.
+Run: python manage.py recount_career_applications
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.models import Career
+
+
+class Command(BaseCommand):
+    help = 'Recompute application counters for every career in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pks = list(Career.objects.order_by('pk').values_list('pk', flat=True))
+        for start in range(0, len(pks), batch_size):
+            Career.objects.filter(pk__in=pks[start:start + batch_size]).refresh_application_counters()
+        self.stdout.write(self.style.SUCCESS(f'🔢 Recounted applications for {len(pks)} career(s)'))
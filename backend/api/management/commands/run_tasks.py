@@ -0,0 +1,42 @@
+"""
+Run queued background tasks (api.tasks) on thread and process pools.
+Run: python manage.py run_tasks               (stays up; stop with Ctrl+C or SIGTERM)
+     python manage.py run_tasks --once        (runs what is due now, then exits)
+"""
+
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.taskqueue import REGISTRY, Worker
+
+
+class Command(BaseCommand):
+    help = 'Claim and run background tasks stored in the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.TASK_WORKER_THREADS,
+                            help='Thread pool size (I/O-bound tasks)')
+        parser.add_argument('--processes', type=int, default=settings.TASK_WORKER_PROCESSES,
+                            help='Process pool size for CPU-bound tasks (0 runs them on threads)')
+        parser.add_argument('--poll-interval', type=float, default=settings.TASK_POLL_INTERVAL,
+                            help='Seconds between checks for new tasks when idle')
+        parser.add_argument('--once', action='store_true', help='Exit when nothing is due')
+
+    def handle(self, *args, **options):
+        unknown = sorted(set(settings.TASK_PERIODIC) - set(REGISTRY))
+        if unknown:
+            self.stdout.write(self.style.WARNING(f"⚠️  Unknown periodic task(s): {', '.join(unknown)}"))
+
+        worker = Worker(options['threads'], options['processes'], options['poll_interval'], log=self.stdout.write)
+        if not options['once']:
+            # Finish the running tasks, then exit.
+            signal.signal(signal.SIGTERM, worker.stop)
+            signal.signal(signal.SIGINT, worker.stop)
+        self.stdout.write(self.style.SUCCESS(
+            f"⚙️  Worker {worker.worker_id}: {options['threads']} thread(s), {options['processes']} process(es), "
+            f"{len(REGISTRY)} task type(s)"
+        ))
+        worker.run(once=options['once'])
+        self.stdout.write('Worker stopped.')
@@ -0,0 +1,41 @@
+"""
+Deliver queued email notifications (new contact messages and job applications).
+Run: python manage.py send_notifications            (one pass, e.g. from cron)
+     python manage.py send_notifications --loop     (stays up and polls the outbox)
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.notifications import deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Send pending notification emails over one SMTP connection per batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and send new notifications as they arrive')
+        parser.add_argument('--interval', type=float, default=10,
+                            help='Seconds to wait between polls in --loop mode when the outbox is empty')
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFY_BATCH_SIZE,
+                            help='Notifications claimed per pass (bursts in one pass are sent as digests)')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_due(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(self.style.SUCCESS(f'📧 Sent {sent} notification(s)'))
+                if failed:
+                    self.stdout.write(self.style.WARNING(f'⚠️  {failed} notification(s) failed and will be retried'))
+            elif not options['loop']:
+                self.stdout.write('Nothing to send.')
+
+            if not options['loop']:
+                return
+            if sent + failed < options['batch_size']:
+                # Caught up; a full batch means more may be waiting, so go again at once.
+                time.sleep(options['interval'])
+            close_old_connections()
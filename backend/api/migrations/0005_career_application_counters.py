@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-19 21:45
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Career = apps.get_model('api', 'Career')
+    JobApplication = apps.get_model('api', 'JobApplication')
+    applications = JobApplication.objects.filter(career=OuterRef('pk')).order_by().values('career')
+    Career.objects.update(
+        application_count=Coalesce(Subquery(applications.annotate(n=Count('pk')).values('n')), 0),
+        unreviewed_application_count=Coalesce(
+            Subquery(applications.filter(is_reviewed=False).annotate(n=Count('pk')).values('n')), 0
+        ),
+        last_application_at=Subquery(applications.annotate(latest=Max('created_at')).values('latest')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_created_at_deadline_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='career',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='last_application_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='unreviewed_application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 23:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_resume_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tender',
+            name='document',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='tenders', to='api.storedfile'),
+        ),
+        migrations.AddField(
+            model_name='tender',
+            name='download_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
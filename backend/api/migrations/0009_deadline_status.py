@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-19 23:30
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def close_expired(apps, schema_editor):
+    now = timezone.now()
+    Tender = apps.get_model('api', 'Tender')
+    Career = apps.get_model('api', 'Career')
+    Tender.objects.filter(deadline__lte=now).update(status='closed')
+    Career.objects.filter(deadline__lt=timezone.localdate(now)).update(status='closed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_tender_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='career',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('closed', 'Closed')], default='open', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='tender',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('closed', 'Closed')], default='open', editable=False, max_length=10),
+        ),
+        migrations.RunPython(close_expired, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['deadline'], name='career_open_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-created_at'], name='career_open_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tender',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['deadline'], name='tender_open_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+from api.units import parse_capacity_mw, parse_efficiency_percent
+
+
+BATCH_SIZE = 500
+
+
+def backfill(apps, schema_editor):
+    Project = apps.get_model('api', 'Project')
+    last_pk = 0
+    while True:
+        batch = list(Project.objects.filter(pk__gt=last_pk).order_by('pk')
+                     .only('pk', 'capacity', 'efficiency')[:BATCH_SIZE])
+        if not batch:
+            return
+        for project in batch:
+            project.capacity_mw = parse_capacity_mw(project.capacity)
+            project.efficiency_percent = parse_efficiency_percent(project.efficiency)
+        Project.objects.bulk_update(batch, ['capacity_mw', 'efficiency_percent'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='capacity_mw',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='efficiency_percent',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=5, null=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 6.0.1 on 2026-10-19 17:05
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+from api.fingerprints import submission_fingerprint
+
+
+BATCH_SIZE = 500
+
+# Historical models have no methods, so the fingerprint fields are listed here.
+FINGERPRINT_FIELDS = {
+    'ContactMessage': ('email', 'subject', 'message'),
+    'JobApplication': ('email', 'career_id', 'cover_letter'),
+}
+
+
+def backfill(apps, schema_editor):
+    for model_name, fields in FINGERPRINT_FIELDS.items():
+        model = apps.get_model('api', model_name)
+        last_pk = 0
+        while True:
+            batch = list(model.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', *fields)[:BATCH_SIZE])
+            if not batch:
+                break
+            for row in batch:
+                row.submission_hash = submission_fingerprint(*(getattr(row, field) for field in fields))
+            model.objects.bulk_update(batch, ['submission_hash'])
+            last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_project_numeric_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=255)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('response_body', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Idempotency Records',
+            },
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='submission_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='submission_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['submission_hash', 'created_at'], name='contactmessage_submission_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['submission_hash', 'created_at'], name='jobapplication_submission_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencyrecord',
+            constraint=models.UniqueConstraint(fields=('scope', 'key'), name='idempotency_scope_key_uniq'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-19 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('email', models.EmailField(max_length=254)),
+                ('original_created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.BinaryField()),
+                ('attachment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_records', to='api.storedfile')),
+            ],
+            options={
+                'ordering': ['-original_created_at'],
+                'indexes': [models.Index(fields=['model', 'original_created_at'], name='archive_model_created_idx'), models.Index(fields=['email', '-original_created_at'], name='archive_email_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'object_id'), name='archive_model_object_uniq')],
+            },
+        ),
+    ]
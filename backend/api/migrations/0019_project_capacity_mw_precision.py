@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+from api.units import parse_capacity_mw
+
+
+BATCH_SIZE = 500
+
+
+def reparse(apps, schema_editor):
+    """Recompute capacity_mw at the new precision so kW plants stored as 0.00 get their value back."""
+    Project = apps.get_model('api', 'Project')
+    last_pk = 0
+    while True:
+        batch = list(Project.objects.filter(pk__gt=last_pk).order_by('pk')
+                     .only('pk', 'capacity')[:BATCH_SIZE])
+        if not batch:
+            return
+        for project in batch:
+            project.capacity_mw = parse_capacity_mw(project.capacity)
+        Project.objects.bulk_update(batch, ['capacity_mw'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_idempotencyrecord_locked_until'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='capacity_mw',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, editable=False, max_digits=12, null=True),
+        ),
+        migrations.RunPython(reparse, migrations.RunPython.noop),
+    ]
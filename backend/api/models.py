@@ -3,26 +3,131 @@ API Models for Power Company Website.
 Defines database structure for: Tenders, News, Careers, Contact.
 """
 
-from django.db import models
+import json
+import uuid
+import zlib
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .fingerprints import submission_fingerprint
+from .units import parse_capacity_mw, parse_efficiency_percent
 
 
 class BaseModel(models.Model):
     """Abstract base model with common fields."""
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         abstract = True
 
 
-class Tender(BaseModel):
+class SubmissionModel(BaseModel):
+    """
+    Abstract model for public form submissions. submission_hash fingerprints
+    fingerprint_fields; with created_at it is indexed so duplicates are found by an index probe.
+    """
+    fingerprint_fields = ()
+
+    submission_hash = models.CharField(max_length=64, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+        indexes = [
+            models.Index(fields=['submission_hash', 'created_at'], name='%(class)s_submission_idx'),
+        ]
+
+    def compute_submission_hash(self):
+        return submission_fingerprint(*(
+            self._meta.get_field(name).value_from_object(self) for name in self.fingerprint_fields
+        ))
+
+    @classmethod
+    def find_duplicate(cls, submission_hash, window):
+        """Most recent row with this fingerprint created within window (a timedelta), or None."""
+        return (cls._default_manager.filter(submission_hash=submission_hash, created_at__gte=timezone.now() - window)
+                .order_by('-created_at').first())
+
+    def save(self, *args, **kwargs):
+        if not self.submission_hash:
+            self.submission_hash = self.compute_submission_hash()
+        # post_save side effects (notification outbox, counters) commit or roll back with the row.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+OPEN = 'open'
+CLOSED = 'closed'
+STATUS_CHOICES = [(OPEN, 'Open'), (CLOSED, 'Closed')]
+
+
+class DeadlineQuerySet(models.QuerySet):
+
+    def open(self):
+        """Active rows still accepting submissions (served by the open-only partial indexes)."""
+        return self.filter(status=OPEN, is_active=True)
+
+    def expired(self, now):
+        """Open rows whose deadline has passed."""
+        return self.filter(status=OPEN, deadline__lte=self.model.deadline_cutoff(now))
+
+    def close_expired(self, now=None):
+        """Close every open row whose deadline has passed, in one UPDATE. Returns the row count."""
+        now = now or timezone.now()
+        return self.expired(now).update(status=CLOSED, updated_at=now)
+
+    def next_deadline(self):
+        """Earliest deadline among open rows, or None."""
+        return self.filter(status=OPEN).order_by('deadline').values_list('deadline', flat=True).first()
+
+
+class DeadlineModel(BaseModel):
+    """
+    Abstract model with an open/closed status that closes when the deadline passes.
+    save() keeps status in step with deadline; close_expired flips expired rows in bulk.
+    """
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=OPEN, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def deadline_cutoff(cls, now):
+        """Rows whose deadline is at or before this value are closed."""
+        return now
+
+    def status_at(self, now):
+        return CLOSED if self.deadline <= self.deadline_cutoff(now) else OPEN
+
+    def save(self, *args, **kwargs):
+        self.status = self.status_at(timezone.now())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'deadline' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'status'}
+        super().save(*args, **kwargs)
+
+
+class Tender(DeadlineModel):
     """Tender/Bid announcements."""
     title = models.CharField(max_length=255)
     description = models.TextField()
     reference_number = models.CharField(max_length=50, unique=True)
-    deadline = models.DateTimeField()
+    deadline = models.DateTimeField(db_index=True)
     document_url = models.URLField(blank=True, null=True)
+    document = models.ForeignKey(
+        'StoredFile',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='tenders'
+    )
+    download_count = models.PositiveIntegerField(default=0, editable=False)
     category = models.CharField(max_length=100, choices=[
         ('goods', 'Goods'),
         ('works', 'Works'),
@@ -30,9 +135,14 @@ class Tender(BaseModel):
         ('consultancy', 'Consultancy'),
     ])
 
+    objects = DeadlineQuerySet.as_manager()
+
     class Meta:
         ordering = ['-deadline']
         verbose_name_plural = 'Tenders'
+        indexes = [
+            models.Index(fields=['deadline'], condition=Q(status=OPEN), name='tender_open_deadline_idx'),
+        ]
 
     def __str__(self):
         return f"{self.reference_number} - {self.title}"
@@ -54,7 +164,23 @@ class News(BaseModel):
         return self.title
 
 
-class Career(BaseModel):
+class CareerQuerySet(DeadlineQuerySet):
+
+    def refresh_application_counters(self):
+        """Recompute the denormalized application counters from JobApplication."""
+        applications = JobApplication.objects.filter(career=OuterRef('pk')).order_by().values('career')
+        return self.update(
+            application_count=Coalesce(
+                Subquery(applications.annotate(n=Count('pk')).values('n')), 0
+            ),
+            unreviewed_application_count=Coalesce(
+                Subquery(applications.filter(is_reviewed=False).annotate(n=Count('pk')).values('n')), 0
+            ),
+            last_application_at=Subquery(applications.annotate(latest=Max('created_at')).values('latest')),
+        )
+
+
+class Career(DeadlineModel):
     """Job postings."""
     title = models.CharField(max_length=255)
     department = models.CharField(max_length=100)
@@ -70,16 +196,34 @@ class Career(BaseModel):
     deadline = models.DateField()
     vacancies = models.PositiveIntegerField(default=1)
 
+    # Denormalized from JobApplication (see api.signals); repair with recount_career_applications
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    unreviewed_application_count = models.PositiveIntegerField(default=0, editable=False)
+    last_application_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = CareerQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Careers'
+        indexes = [
+            models.Index(fields=['deadline'], condition=Q(status=OPEN), name='career_open_deadline_idx'),
+            models.Index(fields=['-created_at'], condition=Q(status=OPEN), name='career_open_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.department}"
 
+    @classmethod
+    def deadline_cutoff(cls, now):
+        # deadline is a date: applications are accepted through the whole deadline day.
+        return timezone.localdate(now) - timedelta(days=1)
 
-class ContactMessage(BaseModel):
+
+class ContactMessage(SubmissionModel):
     """Contact form submissions."""
+    fingerprint_fields = ('email', 'subject', 'message')
+
     name = models.CharField(max_length=100)
     email = models.EmailField()
     phone = models.CharField(max_length=20, blank=True)
@@ -87,7 +231,7 @@ class ContactMessage(BaseModel):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
 
-    class Meta:
+    class Meta(SubmissionModel.Meta):
         ordering = ['-created_at']
         verbose_name_plural = 'Contact Messages'
 
@@ -150,6 +294,11 @@ class Project(BaseModel):
     image_url = models.URLField(blank=True, null=True)
     efficiency = models.CharField(max_length=20, blank=True)
     is_featured = models.BooleanField(default=False)
+    # Parsed from capacity/efficiency on save, for filtering, sorting and totals.
+    capacity_mw = models.DecimalField(max_digits=12, decimal_places=3, null=True, blank=True, editable=False,
+                                      db_index=True)
+    efficiency_percent = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True,
+                                             editable=False)
 
     class Meta:
         ordering = ['-created_at']
@@ -158,6 +307,15 @@ class Project(BaseModel):
     def __str__(self):
         return f"{self.name} ({self.capacity})"
 
+    def save(self, *args, **kwargs):
+        self.capacity_mw = parse_capacity_mw(self.capacity)
+        self.efficiency_percent = parse_efficiency_percent(self.efficiency)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            derived = {'capacity': 'capacity_mw', 'efficiency': 'efficiency_percent'}
+            kwargs['update_fields'] = {*update_fields, *(derived[f] for f in update_fields if f in derived)}
+        super().save(*args, **kwargs)
+
 
 class Milestone(BaseModel):
     """Company milestones and timeline."""
@@ -211,8 +369,32 @@ class CSRInitiative(BaseModel):
         return self.title
 
 
-class JobApplication(BaseModel):
+class JobApplicationQuerySet(models.QuerySet):
+
+    def set_reviewed(self, reviewed=True):
+        """Bulk (un)review applications, adjusting Career counters in the same transaction."""
+        with transaction.atomic():
+            rows = list(
+                self.filter(is_reviewed=not reviewed).select_for_update().values_list('pk', 'career_id')
+            )
+            JobApplication.objects.filter(pk__in=[pk for pk, _ in rows]).update(
+                is_reviewed=reviewed, updated_at=timezone.now()
+            )
+            deltas = {}
+            for _, career_id in rows:
+                deltas[career_id] = deltas.get(career_id, 0) + 1
+            sign = -1 if reviewed else 1
+            for career_id, n in deltas.items():
+                Career.objects.filter(pk=career_id).update(
+                    unreviewed_application_count=F('unreviewed_application_count') + sign * n
+                )
+        return len(rows)
+
+
+class JobApplication(SubmissionModel):
     """Job application submissions."""
+    fingerprint_fields = ('email', 'career', 'cover_letter')
+
     career = models.ForeignKey(
         Career,
         on_delete=models.CASCADE,
@@ -223,13 +405,250 @@ class JobApplication(BaseModel):
     phone = models.CharField(max_length=20)
     cover_letter = models.TextField(blank=True)
     resume_url = models.URLField(blank=True)  # For external resume links (optional)
+    resume_file = models.ForeignKey(
+        'StoredFile',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='job_applications'
+    )
     experience_years = models.PositiveIntegerField(default=0)
     current_position = models.CharField(max_length=100, blank=True)
     is_reviewed = models.BooleanField(default=False)
 
-    class Meta:
+    objects = JobApplicationQuerySet.as_manager()
+
+    class Meta(SubmissionModel.Meta):
         ordering = ['-created_at']
         verbose_name_plural = 'Job Applications'
 
     def __str__(self):
         return f"{self.name} - {self.career.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so post_save can adjust Career counters by difference.
+        instance._loaded_state = (instance.__dict__.get('career_id'), instance.__dict__.get('is_reviewed'))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_state = (self.career_id, self.is_reviewed)
+
+
+class ImageAsset(models.Model):
+    """Generated responsive variants of an image_url, or its last failed render (see api.images)."""
+    source_url = models.CharField(max_length=500, unique=True)
+    content_hash = models.CharField(max_length=64, db_index=True, blank=True)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    variants = models.JSONField(default=dict)  # {format: {width: path under MEDIA_ROOT}}
+    failures = models.PositiveIntegerField(default=0)  # consecutive failed renders
+    last_error = models.CharField(max_length=500, blank=True)
+    retry_at = models.DateTimeField(null=True, blank=True)  # set while failed: not rendered again before
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Image Assets'
+
+    def __str__(self):
+        return self.source_url
+
+
+class StoredFile(models.Model):
+    """Uploaded file stored once per content hash under FILE_STORAGE_ROOT (see api.files)."""
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100)
+    extension = models.CharField(max_length=10)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'Stored Files'
+
+    def __str__(self):
+        return f"{self.sha256[:12]}.{self.extension}"
+
+    @property
+    def relative_path(self):
+        return f"files/{self.sha256[:2]}/{self.sha256}"
+
+
+class UploadSession(models.Model):
+    """Resumable chunked upload; bytes are appended to a part file until size is reached."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    stored_file = models.ForeignKey(StoredFile, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Upload Sessions'
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    @property
+    def is_complete(self):
+        return self.stored_file_id is not None
+
+
+class Tombstone(models.Model):
+    """Hard-deleted row, kept so delta-sync clients (?updated_since=) can drop their copy."""
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id}"
+
+
+class IdempotencyRecord(models.Model):
+    """Response to a POST sent with an Idempotency-Key header, replayed when the client retries."""
+    scope = models.CharField(max_length=50)  # Viewset basename
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # None while the first request runs
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    locked_until = models.DateTimeField(null=True, blank=True)  # Lease of the running request; retries may take over after it
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_scope_key_uniq'),
+        ]
+        verbose_name_plural = 'Idempotency Records'
+
+    def __str__(self):
+        return f"{self.scope}: {self.key}"
+
+
+class Notification(models.Model):
+    """
+    Outbound email, written in the same transaction as the submission that caused it
+    and delivered later by the send_notifications worker (api.notifications).
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')]
+
+    kind = models.CharField(max_length=20)  # 'contact' or 'application'
+    object_id = models.PositiveBigIntegerField()
+    recipients = models.JSONField(default=list)
+    reply_to = models.EmailField(blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.UUIDField(null=True, blank=True, editable=False)  # Set by the worker holding the row
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='notification_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+
+class Task(models.Model):
+    """Background job run by the run_tasks worker (api.taskqueue)."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'), (RUNNING, 'Running'), (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'), (CANCELLED, 'Cancelled'),
+    ]
+    ACTIVE = (QUEUED, RUNNING)
+
+    name = models.CharField(max_length=200)  # Registered task name, e.g. 'api.tasks.warm_caches'
+    args = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    priority = models.SmallIntegerField(default=0)  # Higher runs first
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True)  # At most one queued/running task per key
+    claimed_by = models.CharField(max_length=100, blank=True)
+    lease_until = models.DateTimeField(null=True, blank=True)  # A running task past this is assumed lost
+    progress = models.PositiveSmallIntegerField(default=0)  # Percent
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_at'], name='task_due_idx'),
+            models.Index(fields=['status', 'lease_until'], name='task_lease_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedupe_key'], condition=Q(status__in=['queued', 'running']),
+                                    name='task_active_dedupe_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class ArchivedRecord(models.Model):
+    """
+    Cold copy of an old, handled contact message or job application, moved out of the
+    hot tables by archive_submissions (api.archive). The row itself is zlib-compressed JSON.
+    """
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.BigIntegerField()
+    email = models.EmailField()
+    original_created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.BinaryField()
+    attachment = models.ForeignKey(  # Keeps an application's resume from being purged
+        StoredFile,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='archived_records'
+    )
+
+    class Meta:
+        ordering = ['-original_created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'object_id'], name='archive_model_object_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['model', 'original_created_at'], name='archive_model_created_idx'),
+            models.Index(fields=['email', '-original_created_at'], name='archive_email_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} ({self.email})"
+
+    @staticmethod
+    def pack(payload):
+        return zlib.compress(json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode(), 9)
+
+    @property
+    def payload(self):
+        return json.loads(zlib.decompress(bytes(self.data)))
@@ -0,0 +1,186 @@
+"""
+Email notifications for new contact messages and job applications.
+A Notification row is written in the submission's own transaction (an outbox), so the
+public request never talks to SMTP. The send_notifications worker claims due rows,
+sends them over one reused SMTP connection, folds bursts into digests and retries
+failures with exponential backoff.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from contextlib import suppress
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ContactMessage, JobApplication, Notification
+
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_ERRORS = (OSError, SMTPException)  # socket errors and SMTP refusals
+
+
+def render_contact(message):
+    subject = f'New contact message: {message.subject}'
+    body = (
+        f'From: {message.name} <{message.email}>\n'
+        f'Phone: {message.phone or "-"}\n'
+        f'Subject: {message.subject}\n\n'
+        f'{message.message}\n'
+    )
+    return subject, body
+
+
+def render_application(application):
+    title = application.career.title
+    subject = f'New application: {title} - {application.name}'
+    body = (
+        f'Position: {title}\n'
+        f'Applicant: {application.name} <{application.email}>\n'
+        f'Phone: {application.phone}\n'
+        f'Current position: {application.current_position or "-"}\n'
+        f'Experience: {application.experience_years} year(s)\n'
+        f'Resume: {"attached file" if application.resume_file_id else application.resume_url or "-"}\n\n'
+        f'{application.cover_letter or "(no cover letter)"}\n'
+    )
+    return subject, body
+
+
+# Model -> (kind, recipients setting, renderer, digest noun)
+NOTIFY_KINDS = {
+    ContactMessage: ('contact', 'NOTIFY_CONTACT_RECIPIENTS', render_contact, 'contact messages'),
+    JobApplication: ('application', 'NOTIFY_APPLICATION_RECIPIENTS', render_application, 'job applications'),
+}
+DIGEST_NOUNS = {kind: noun for kind, _, _, noun in NOTIFY_KINDS.values()}
+
+
+def record_notification(instance):
+    """Queue the email for a new submission; call inside its transaction. No-op without recipients."""
+    kind, recipients_setting, render, _ = NOTIFY_KINDS[type(instance)]
+    recipients = getattr(settings, recipients_setting)
+    if not recipients:
+        return None
+    subject, body = render(instance)
+    # Subjects embed user input; a CR/LF in a header makes the mail backend refuse the message.
+    subject = ' '.join(subject.split())
+    return Notification.objects.create(
+        kind=kind, object_id=instance.pk, recipients=list(recipients),
+        reply_to=instance.email, subject=subject[:255], body=body,
+    )
+
+
+def claim_due(batch_size, now=None):
+    """
+    Take up to batch_size due notifications for this worker. Claimed rows are pushed
+    NOTIFY_CLAIM_SECONDS into the future, so a crashed worker's rows are retried later
+    and concurrent workers never send the same row.
+    """
+    now = now or timezone.now()
+    token = uuid.uuid4()
+    due = list(
+        Notification.objects.filter(status=Notification.PENDING, next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'pk').values_list('pk', flat=True)[:batch_size]
+    )
+    if not due:
+        return []
+    Notification.objects.filter(pk__in=due, status=Notification.PENDING, next_attempt_at__lte=now).update(
+        claim_token=token, next_attempt_at=now + timedelta(seconds=settings.NOTIFY_CLAIM_SECONDS),
+    )
+    return list(Notification.objects.filter(claim_token=token).order_by('pk'))
+
+
+def build_messages(notifications):
+    """
+    Yield (EmailMessage, notifications) pairs. Per kind and recipient list, a burst of at
+    least NOTIFY_DIGEST_THRESHOLD rows becomes one digest email instead of one each.
+    """
+    groups = defaultdict(list)
+    for notification in notifications:
+        groups[(notification.kind, tuple(notification.recipients))].append(notification)
+
+    for (kind, recipients), group in groups.items():
+        if len(group) < settings.NOTIFY_DIGEST_THRESHOLD:
+            for notification in group:
+                reply_to = [notification.reply_to] if notification.reply_to else None
+                yield EmailMessage(notification.subject, notification.body, to=list(recipients), reply_to=reply_to), [notification]
+            continue
+        separator = '\n' + '-' * 60 + '\n\n'
+        body = separator.join(f'{n.subject}\n\n{n.body}' for n in group)
+        subject = f'{len(group)} new {DIGEST_NOUNS.get(kind, kind)}'
+        yield EmailMessage(subject, body, to=list(recipients)), group
+
+
+def backoff(attempts):
+    """Delay before retry number `attempts`: doubles from NOTIFY_RETRY_BASE_SECONDS up to the cap."""
+    return timedelta(seconds=min(settings.NOTIFY_RETRY_MAX_SECONDS,
+                                 settings.NOTIFY_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1)))
+
+
+def mark_sent(notifications):
+    Notification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+        status=Notification.SENT, sent_at=timezone.now(), attempts=F('attempts') + 1,
+        claim_token=None, last_error='',
+    )
+
+
+def mark_failed(notifications, error):
+    """Schedule a retry with backoff, or give up after NOTIFY_MAX_ATTEMPTS."""
+    now = timezone.now()
+    for notification in notifications:
+        notification.attempts += 1
+        notification.claim_token = None
+        notification.last_error = f'{type(error).__name__}: {error}'[:2000]
+        if notification.attempts >= settings.NOTIFY_MAX_ATTEMPTS:
+            notification.status = Notification.FAILED
+        else:
+            notification.next_attempt_at = now + backoff(notification.attempts)
+    Notification.objects.bulk_update(
+        notifications, ['attempts', 'claim_token', 'last_error', 'status', 'next_attempt_at']
+    )
+
+
+def deliver_due(batch_size=None):
+    """Send one batch of due notifications. Returns (sent, failed) counts of notifications."""
+    claimed = claim_due(batch_size or settings.NOTIFY_BATCH_SIZE)
+    if not claimed:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except DELIVERY_ERRORS as exc:
+        logger.warning('Could not connect to the mail server: %s', exc)
+        mark_failed(claimed, exc)
+        return 0, len(claimed)
+
+    sent = failed = 0
+    try:
+        for message, notifications in build_messages(claimed):
+            message.connection = connection
+            try:
+                message.send()
+            except DELIVERY_ERRORS as exc:
+                logger.warning('Notification %s not sent: %s', [n.pk for n in notifications], exc)
+                mark_failed(notifications, exc)
+                failed += len(notifications)
+                # The session may be unusable now; start a fresh one for the rest.
+                with suppress(*DELIVERY_ERRORS):
+                    connection.close()
+                    connection.open()
+            except Exception as exc:  # noqa: BLE001 - e.g. BadHeaderError; one bad row must not stall the outbox
+                logger.exception('Notification %s could not be sent', [n.pk for n in notifications])
+                mark_failed(notifications, exc)
+                failed += len(notifications)
+            else:
+                mark_sent(notifications)
+                sent += len(notifications)
+    finally:
+        with suppress(*DELIVERY_ERRORS):
+            connection.close()
+    return sent, failed
@@ -0,0 +1,54 @@
+"""
+Project portfolio summary.
+Capacity and efficiency totals per category and status come from one GROUP BY
+query over the numeric project columns and are cached until a project changes.
+Saves clear only the cache of their own process, so unless the cache is shared
+the summary also expires after PROJECT_SUMMARY_CACHE_TIMEOUT (one short API TTL).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+
+from .models import Project
+
+
+SUMMARY_CACHE_KEY = 'api:project-summary'
+
+
+def compute_portfolio_summary():
+    groups = list(
+        Project.objects.filter(is_active=True)
+        .values('category', 'status')
+        .annotate(
+            projects=Count('id'),
+            total_capacity_mw=Sum('capacity_mw'),
+            average_capacity_mw=Avg('capacity_mw'),
+            average_efficiency_percent=Avg('efficiency_percent'),
+        )
+        .order_by('category', 'status')
+    )
+    for group in groups:
+        for key, places in (('average_capacity_mw', 3), ('average_efficiency_percent', 2)):
+            if group[key] is not None:
+                group[key] = round(group[key], places)
+    return {
+        'projects': sum(group['projects'] for group in groups),
+        'total_capacity_mw': sum(group['total_capacity_mw'] or 0 for group in groups),
+        'groups': groups,
+    }
+
+
+def get_portfolio_summary():
+    """Return the cached summary, recomputing it on a miss."""
+    summary = cache.get(SUMMARY_CACHE_KEY)
+    if summary is None:
+        summary = compute_portfolio_summary()
+        cache.set(SUMMARY_CACHE_KEY, summary, settings.PROJECT_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_portfolio_summary():
+    """Drop the cached summary once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(SUMMARY_CACHE_KEY))
@@ -0,0 +1,222 @@
+"""
+EXPLAIN-plan snapshots for the hot API and admin queries.
+check_query_plans seeds a throwaway database, requests every list/filter endpoint and
+admin changelist, and EXPLAINs each SELECT they run. Plans are reduced to their access
+paths (which table, which index, any sort) and compared with the committed snapshot in
+api/plan_snapshots/<vendor>.json, so a query that stops using its index shows up in review.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection, models
+from django.utils import timezone
+
+from .models import (
+    ArchivedRecord, BoardMember, CSRInitiative, Career, ContactMessage, IdempotencyRecord, ImageAsset,
+    JobApplication, Milestone, News, Notification, Project, ProjectStat, StoredFile, SustainabilityStat,
+    Task, Tender, Tombstone, UploadSession
+)
+
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'plan_snapshots')
+
+# Rows seeded per model, as a share of --rows (in dependency order: parents first)
+SEED_SHARES = [
+    (StoredFile, 0.01), (ImageAsset, 0.01), (UploadSession, 0.01),
+    (Career, 0.01), (Tender, 0.25), (News, 0.25), (Project, 0.05),
+    (ProjectStat, 0.005), (BoardMember, 0.005), (Milestone, 0.005),
+    (SustainabilityStat, 0.005), (CSRInitiative, 0.005),
+    (ContactMessage, 1), (JobApplication, 1),
+    (Tombstone, 0.5), (ArchivedRecord, 0.5), (Task, 0.25), (Notification, 0.25), (IdempotencyRecord, 0.1),
+]
+
+# Share of rows that are True; other booleans (is_featured, is_chairman...) are rare
+BOOLEAN_SHARES = {'is_active': 0.95, 'is_read': 0.7, 'is_reviewed': 0.6}
+
+# Tables whose queries come from sessions/auth, not from the code under test
+IGNORED_TABLES = ('django_session', 'auth_user', 'auth_group', 'auth_permission', 'django_content_type')
+
+
+# ==================== Seeding ====================
+
+@contextmanager
+def _manual_timestamps(model):
+    """Let bulk_create keep the spread-out created_at/updated_at values instead of now()."""
+    fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _unique_fields(model):
+    """Fields that must differ per row: unique ones, and the last field of each unique constraint."""
+    names = {f.name for f in model._meta.concrete_fields if f.unique and not f.primary_key}
+    for constraint in model._meta.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            names.add(constraint.fields[-1])
+    return names
+
+
+def _value(field, index, rows, rng, now, parents, unique):
+    if field.null and not isinstance(field, models.ForeignKey) and rng.random() < 0.1:
+        return None
+    if isinstance(field, models.ForeignKey):
+        choices = parents.get(field.related_model)
+        return rng.choice(choices) if choices and not field.null else None
+    if field.choices:
+        return rng.choice([value for value, _ in field.flatchoices])
+    if isinstance(field, models.BooleanField):
+        return rng.random() < BOOLEAN_SHARES.get(field.name, 0.05)
+    if isinstance(field, (models.DateTimeField, models.DateField)):
+        if field.name == 'deadline':
+            moment = now + timedelta(minutes=rng.randrange(-90 * 1440, 90 * 1440))
+        else:
+            moment = now - timedelta(minutes=rng.randrange(3 * 365 * 1440))
+        return moment if isinstance(field, models.DateTimeField) else moment.date()
+    if isinstance(field, models.DecimalField):
+        return Decimal(rng.uniform(0, 10 ** (field.max_digits - field.decimal_places - 1))).quantize(
+            Decimal(1).scaleb(-field.decimal_places)
+        )
+    if isinstance(field, (models.IntegerField, models.BigIntegerField)):
+        return index if field.name in unique or field.name == 'object_id' else rng.randrange(100)
+    if isinstance(field, models.BinaryField):
+        return ArchivedRecord.pack({'seeded': index})  # ArchivedRecord.data is the only binary column
+    if isinstance(field, (models.JSONField, models.UUIDField)):
+        return field.get_default()
+    if isinstance(field, models.EmailField):
+        return f'user{rng.randrange(rows)}@example.com'
+    if isinstance(field, models.URLField):
+        return f'https://example.com/{field.name}/{index}'
+    if isinstance(field, models.TextField):
+        return f'{field.name} text {index}'
+    if field.name == 'model':
+        return rng.choice(['api.contactmessage', 'api.jobapplication', 'api.tender', 'api.news'])
+    if field.name in unique or field.name in ('submission_hash', 'sha256', 'content_hash'):
+        value = hashlib.sha256(f'{field.name}{index}'.encode()).hexdigest()
+    else:
+        value = f'{field.name} {rng.randrange(50)}'
+    return value[:field.max_length] if field.max_length else value
+
+
+def seed(rows, seed=0, batch_size=2000):
+    """Fill the (empty) database with reproducible, roughly realistic data; returns {model: rows}."""
+    now = timezone.now()
+    parents, counts = {}, {}
+    for model, share in SEED_SHARES:
+        # One generator per model, so a column added to one model leaves the others' data alone.
+        rng = random.Random(f'{seed}:{model._meta.label_lower}')
+        count = max(10, int(rows * share))
+        fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+        unique = _unique_fields(model)
+        objects = []
+        for index in range(count):
+            values = {f.attname: _value(f, index, count, rng, now, parents, unique) for f in fields}
+            if 'updated_at' in values and 'created_at' in values:
+                values['updated_at'] = values['created_at'] + timedelta(minutes=rng.randrange(60 * 24 * 30))
+            objects.append(model(**values))
+        with _manual_timestamps(model):
+            model.objects.bulk_create(objects, batch_size=batch_size)
+        parents[model] = list(model.objects.values_list('pk', flat=True))
+        counts[model] = count
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return counts
+
+
+# ==================== Plans ====================
+
+def query_shape(sql):
+    """SQL with literals replaced, so the same query with other values gets the same key."""
+    sql = re.sub(r"'(?:[^']|'')*'(::\w+)?", '?', sql)
+    sql = re.sub(r'(?<![\w"])-?\d+(\.\d+)?\b', '?', sql)
+    sql = re.sub(r'\((\?,\s*)+\?\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def is_captured(sql):
+    sql = sql.lstrip()
+    return sql[:6].upper() == 'SELECT' and not any(f'"{table}"' in sql for table in IGNORED_TABLES)
+
+
+def explain(sql):
+    """The access-path lines of sql's plan, one per plan node, indented by depth."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            plan = cursor.fetchone()[0]
+            return _postgres_lines(json.loads(plan)[0]['Plan'] if isinstance(plan, str) else plan[0]['Plan'])
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return _sqlite_lines(cursor.fetchall())
+
+
+def _sqlite_lines(rows):
+    depth, lines = {0: -1}, []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node_id] + re.sub(r'\b\d+\b', 'N', detail))
+    return lines
+
+
+def _postgres_lines(node, depth=0):
+    line = node['Node Type']
+    if 'Index Name' in node:
+        line += f" using {node['Index Name']}"
+    if 'Relation Name' in node:
+        line += f" on {node['Relation Name']}"
+    lines = ['  ' * depth + line]
+    for child in node.get('Plans', ()):
+        lines += _postgres_lines(child, depth + 1)
+    return lines
+
+
+def full_scans(lines):
+    """Tables read start to end without an index (Seq Scan / SQLite SCAN without USING)."""
+    tables = set()
+    for line in lines:
+        match = re.match(r'\s*(?:Seq Scan on|SCAN) (\S+)$', line)
+        if match and match.group(1) != 'CONSTANT':
+            tables.add(match.group(1))
+    return tables
+
+
+def sorts(lines):
+    return sum(1 for line in lines if re.match(r'\s*(Sort|Incremental Sort)$', line) or 'TEMP B-TREE' in line)
+
+
+def regressions(old, new):
+    """Ways the new plan is worse than the snapshot: new full scans or more sorts."""
+    problems = [f'full scan of {table}' for table in sorted(full_scans(new) - full_scans(old))]
+    if sorts(new) > sorts(old):
+        problems.append(f'sorts {sorts(old)} -> {sorts(new)}')
+    return problems
+
+
+def snapshot_path(vendor):
+    return os.path.join(SNAPSHOT_DIR, f'{vendor}.json')
+
+
+def load_snapshot(vendor):
+    try:
+        with open(snapshot_path(vendor), encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(vendor, data):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(snapshot_path(vendor), 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write('\n')
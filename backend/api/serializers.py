@@ -2,52 +2,111 @@
 API Serializers - Convert models to/from JSON.
 """
 
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
+from .files import HashedUploadedFile
+from .idempotency import DuplicateSubmissionMixin
+from .images import needs_render, schedule_variants, variant_map
 from .models import (
+    ArchivedRecord,
     Tender, News, Career, ContactMessage, ProjectStat,
     BoardMember, SustainabilityStat, Project, Milestone, CSRInitiative,
-    JobApplication
+    JobApplication, ImageAsset, UploadSession
 )
 
 
+class ImageVariantListSerializer(serializers.ListSerializer):
+    """Loads the ImageAssets of a whole page in one query before the items are serialized."""
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        urls = {item.image_url for item in items if item.image_url}
+        self.context['image_assets'] = {
+            asset.source_url: asset for asset in ImageAsset.objects.filter(source_url__in=urls)
+        }
+        return super().to_representation(items)
+
+
+class ImageVariantsMixin(serializers.Serializer):
+    """Adds image_variants: srcset strings per format for image_url (None until rendered)."""
+    image_variants = serializers.SerializerMethodField()
+
+    def get_image_variants(self, obj):
+        if not obj.image_url:
+            return None
+        assets = self.context.get('image_assets')
+        if assets is None:
+            asset = ImageAsset.objects.filter(source_url=obj.image_url).first()
+        else:
+            asset = assets.get(obj.image_url)
+        if needs_render(asset):
+            # Render on first use (or once a failure's backoff ends), off the request path.
+            schedule_variants([obj.image_url])
+        return variant_map(asset)
+
+
 class TenderSerializer(serializers.ModelSerializer):
     """Serializer for Tender model."""
+    document = serializers.SerializerMethodField()
     
     class Meta:
         model = Tender
         fields = [
             'id', 'title', 'description', 'reference_number',
-            'deadline', 'document_url', 'category', 'created_at', 'is_active'
+            'deadline', 'status', 'document_url', 'document', 'download_count',
+            'category', 'created_at', 'is_active'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'status', 'download_count']
 
+    def get_document(self, obj):
+        if obj.document_id is None:
+            return None
+        return {
+            'size': obj.document.size,
+            'content_type': obj.document.content_type,
+            'sha256': obj.document.sha256,
+            'download_url': reverse('tender-document', args=[obj.pk]),
+        }
 
-class NewsSerializer(serializers.ModelSerializer):
+
+class NewsSerializer(ImageVariantsMixin, serializers.ModelSerializer):
     """Serializer for News model."""
     
     class Meta:
         model = News
+        list_serializer_class = ImageVariantListSerializer
         fields = [
             'id', 'title', 'content', 'summary',
-            'image_url', 'is_featured', 'created_at', 'is_active'
+            'image_url', 'image_variants', 'is_featured', 'created_at', 'is_active'
         ]
         read_only_fields = ['id', 'created_at']
 
 
 class CareerSerializer(serializers.ModelSerializer):
-    """Serializer for Career model."""
+    """Serializer for Career model. Application counters are only shown to staff."""
+    staff_fields = ['application_count', 'unreviewed_application_count', 'last_application_at']
     
     class Meta:
         model = Career
         fields = [
             'id', 'title', 'department', 'location',
             'description', 'requirements', 'job_type',
-            'deadline', 'vacancies', 'created_at', 'is_active'
+            'deadline', 'status', 'vacancies', 'created_at', 'is_active',
+            'application_count', 'unreviewed_application_count', 'last_application_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'status']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if not getattr(getattr(request, 'user', None), 'is_staff', False):
+            for name in self.staff_fields:
+                fields.pop(name, None)
+        return fields
 
-class ContactMessageSerializer(serializers.ModelSerializer):
+
+class ContactMessageSerializer(DuplicateSubmissionMixin, serializers.ModelSerializer):
     """Serializer for ContactMessage model."""
     
     class Meta:
@@ -68,13 +127,14 @@ class ProjectStatSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class BoardMemberSerializer(serializers.ModelSerializer):
+class BoardMemberSerializer(ImageVariantsMixin, serializers.ModelSerializer):
     """Serializer for BoardMember model."""
     
     class Meta:
         model = BoardMember
+        list_serializer_class = ImageVariantListSerializer
         fields = [
-            'id', 'name', 'title', 'bio', 'image_url',
+            'id', 'name', 'title', 'bio', 'image_url', 'image_variants',
             'is_chairman', 'order', 'is_active'
         ]
         read_only_fields = ['id']
@@ -89,17 +149,18 @@ class SustainabilityStatSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(ImageVariantsMixin, serializers.ModelSerializer):
     """Serializer for Project model."""
     
     class Meta:
         model = Project
+        list_serializer_class = ImageVariantListSerializer
         fields = [
-            'id', 'name', 'location', 'description', 'capacity',
-            'status', 'category', 'image_url', 'efficiency',
+            'id', 'name', 'location', 'description', 'capacity', 'capacity_mw',
+            'status', 'category', 'image_url', 'image_variants', 'efficiency', 'efficiency_percent',
             'is_featured', 'is_active', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'capacity_mw', 'efficiency_percent']
 
 
 class MilestoneSerializer(serializers.ModelSerializer):
@@ -111,27 +172,103 @@ class MilestoneSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class CSRInitiativeSerializer(serializers.ModelSerializer):
+class CSRInitiativeSerializer(ImageVariantsMixin, serializers.ModelSerializer):
     """Serializer for CSRInitiative model."""
     
     class Meta:
         model = CSRInitiative
+        list_serializer_class = ImageVariantListSerializer
         fields = [
             'id', 'title', 'description', 'category',
-            'impact_metric', 'image_url', 'is_active', 'created_at'
+            'impact_metric', 'image_url', 'image_variants', 'is_active', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
 
 
-class JobApplicationSerializer(serializers.ModelSerializer):
-    """Serializer for JobApplication model."""
+class JobApplicationSerializer(DuplicateSubmissionMixin, serializers.ModelSerializer):
+    """
+    Serializer for JobApplication model.
+    A CV is attached either as a multipart resume_file or, after a resumable
+    upload, by passing the upload session id as resume_upload.
+    """
     career_title = serializers.CharField(source='career.title', read_only=True)
+    resume_file = serializers.FileField(write_only=True, required=False)
+    resume_upload = serializers.UUIDField(write_only=True, required=False)
+    resume = serializers.SerializerMethodField()
     
     class Meta:
         model = JobApplication
         fields = [
             'id', 'career', 'career_title', 'name', 'email', 'phone',
-            'cover_letter', 'resume_url', 'experience_years',
-            'current_position', 'is_reviewed', 'created_at'
+            'cover_letter', 'resume_url', 'resume_file', 'resume_upload', 'resume',
+            'experience_years', 'current_position', 'is_reviewed', 'created_at'
         ]
         read_only_fields = ['id', 'created_at', 'is_reviewed', 'career_title']
+
+    def validate_resume_file(self, value):
+        if not isinstance(value, HashedUploadedFile):
+            raise serializers.ValidationError('Upload could not be processed.')
+        return value
+
+    def validate_resume_upload(self, value):
+        session = UploadSession.objects.select_related('stored_file').filter(pk=value).first()
+        if session is None or not session.is_complete:
+            raise serializers.ValidationError('Upload is missing or incomplete.')
+        return session.stored_file
+
+    def validate(self, attrs):
+        stored_file = attrs.pop('resume_upload', None)
+        if stored_file is not None:
+            attrs['resume_file'] = stored_file
+        return super().validate(attrs)
+
+    def create(self, validated_data):
+        upload = validated_data.get('resume_file')
+        if isinstance(upload, HashedUploadedFile):
+            validated_data['resume_file'] = upload.store()
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        upload = validated_data.get('resume_file')
+        if isinstance(upload, HashedUploadedFile):
+            validated_data['resume_file'] = upload.store()
+        return super().update(instance, validated_data)
+
+    def get_resume(self, obj):
+        if obj.resume_file_id is None:
+            return None
+        return {
+            'size': obj.resume_file.size,
+            'content_type': obj.resume_file.content_type,
+            'download_url': reverse('application-resume', args=[obj.pk]),
+        }
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Resumable upload session: create with filename and size, then PUT chunks with Content-Range."""
+    complete = serializers.BooleanField(source='is_complete', read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'received', 'complete', 'created_at']
+        read_only_fields = ['id', 'received', 'created_at']
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.RESUME_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Size must be between 1 byte and {settings.RESUME_MAX_SIZE // (1024 * 1024)} MB.'
+            )
+        return value
+
+
+class ArchivedRecordSerializer(serializers.ModelSerializer):
+    """Serializer for ArchivedRecord; `data` is the archived row, decompressed."""
+    data = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedRecord
+        fields = ['id', 'model', 'object_id', 'email', 'original_created_at', 'archived_at', 'data']
+        read_only_fields = fields
+
+    def get_data(self, obj):
+        return obj.payload
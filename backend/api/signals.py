@@ -0,0 +1,135 @@
+"""
+Model signal handlers for the api app.
+Connected in ApiConfig.ready().
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .dashboard import STATS_MODELS, invalidate_dashboard_stats
+from .events import hub
+from .images import schedule_variants
+from .notifications import record_notification
+from .portfolio import invalidate_portfolio_summary
+from .models import (
+    BaseModel, BoardMember, CSRInitiative, Career, ContactMessage, ImageAsset, JobApplication, News, Project,
+    Tombstone
+)
+from .snapshots import SNAPSHOT_ENDPOINTS, schedule_publish
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def refresh_dashboard_stats(sender, **kwargs):
+    """Keep the admin dashboard counters in step with their tables."""
+    if sender in STATS_MODELS:
+        invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=ContactMessage)
+@receiver(post_save, sender=JobApplication)
+def wake_change_feed(sender, raw=False, **kwargs):
+    """Let this process's change feed pick up the row now instead of at its next poll."""
+    if not raw:
+        transaction.on_commit(hub.notify)
+
+
+# ==================== Notifications ====================
+
+@receiver(post_save, sender=ContactMessage)
+@receiver(post_save, sender=JobApplication)
+def queue_submission_email(sender, instance, created, raw=False, **kwargs):
+    """Write the staff email to the outbox; SubmissionModel.save() makes this part of the row's transaction."""
+    if created and not raw:
+        record_notification(instance)
+
+
+# ==================== Delta Sync ====================
+
+@receiver(post_delete)
+def record_tombstone(sender, instance, **kwargs):
+    """Remember hard deletes so delta-sync clients (?updated_since=) can drop the row."""
+    if isinstance(instance, BaseModel) and instance.pk is not None:
+        Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+# ==================== Project Portfolio ====================
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def refresh_portfolio_summary(sender, **kwargs):
+    """Keep /api/projects/summary/ in step with the projects table."""
+    invalidate_portfolio_summary()
+
+
+# ==================== Career Application Counters ====================
+
+@receiver(post_save, sender=JobApplication)
+def count_saved_application(sender, instance, created, raw=False, **kwargs):
+    """Adjust Career counters for a new application or a review/career change."""
+    if raw:
+        return
+    careers = Career.objects.filter(pk=instance.career_id)
+    if created:
+        careers.update(
+            application_count=F('application_count') + 1,
+            unreviewed_application_count=F('unreviewed_application_count') + (0 if instance.is_reviewed else 1),
+            last_application_at=instance.created_at,
+        )
+        return
+
+    old_career_id, old_reviewed = getattr(instance, '_loaded_state', (None, None))
+    if old_career_id != instance.career_id:
+        # Moved between careers, or saved without being loaded first: recount both sides.
+        Career.objects.filter(pk__in={old_career_id, instance.career_id} - {None}).refresh_application_counters()
+    elif old_reviewed != instance.is_reviewed:
+        careers.update(
+            unreviewed_application_count=F('unreviewed_application_count') + (-1 if instance.is_reviewed else 1)
+        )
+
+
+@receiver(post_delete, sender=JobApplication)
+def count_deleted_application(sender, instance, origin=None, **kwargs):
+    """Recount the career of a deleted application (skipped when the career itself is going)."""
+    if isinstance(origin, Career) or (isinstance(origin, QuerySet) and origin.model is Career):
+        return
+    Career.objects.filter(pk=instance.career_id).refresh_application_counters()
+
+
+# ==================== Image Variants ====================
+
+@receiver(post_save, sender=News)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BoardMember)
+@receiver(post_save, sender=CSRInitiative)
+def render_image_variants(sender, instance, raw=False, **kwargs):
+    """Render responsive variants of a saved image_url in the background."""
+    if raw or not settings.IMAGE_VARIANTS_ON_SAVE or not instance.image_url:
+        return
+    transaction.on_commit(lambda: schedule_variants([instance.image_url]))
+
+
+# ==================== Static API Snapshots ====================
+
+@receiver(post_save)
+@receiver(post_delete)
+def publish_changed_snapshots(sender, instance, raw=False, **kwargs):
+    """Refresh the list and detail snapshots affected by a changed row once it commits."""
+    if raw or not settings.SNAPSHOT_AUTO_PUBLISH or sender not in SNAPSHOT_ENDPOINTS:
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: schedule_publish(sender, [pk]))
+
+
+@receiver(post_save, sender=ImageAsset)
+def publish_rendered_variants(sender, instance, **kwargs):
+    """Snapshots embed image_variants, so refresh rows using an image once its variants exist."""
+    if not settings.SNAPSHOT_AUTO_PUBLISH or instance.failures:
+        return
+    for model in (News, Project, BoardMember, CSRInitiative):
+        pks = list(model.objects.filter(image_url=instance.source_url).values_list('pk', flat=True))
+        if pks:
+            schedule_publish(model, pks)
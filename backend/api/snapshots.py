@@ -0,0 +1,322 @@
+"""
+Static JSON snapshots of the public read API.
+Public list and detail endpoints are rendered through their real views into
+SNAPSHOT_ROOT, laid out like the URLs (api/news/5/index.json), with .gz/.br siblings,
+so nginx or a CDN can serve them without Django. Brotli output needs the 'brotli'
+package; without it no .br files are written and stale ones are removed.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import resolve
+from rest_framework.response import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+from .models import (
+    BoardMember, CSRInitiative, Milestone, News, Project, ProjectStat, SustainabilityStat, Tender
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Model -> (URL prefix under /api/, extra list actions)
+SNAPSHOT_ENDPOINTS = {
+    ProjectStat: ('stats', ()),
+    BoardMember: ('board', ()),
+    Milestone: ('milestones', ()),
+    Project: ('projects', ('featured', 'summary')),
+    SustainabilityStat: ('sustainability', ()),
+    CSRInitiative: ('csr', ()),
+    News: ('news', ('featured',)),
+    Tender: ('tenders', ('open',)),
+}
+
+PAGE_FILE = re.compile(r'^index\.page-(\d+)\.json(?:\.gz|\.br)?$')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+ORDER_FILE = '.order.json'  # pks of a list as last published, to find the pages a change touches
+
+
+class SnapshotRequest(HttpRequest):
+    """GET request for SNAPSHOT_BASE_URL + path, so absolute pagination links match the site."""
+
+    def __init__(self, path, query=''):
+        super().__init__()
+        base = urlsplit(settings.SNAPSHOT_BASE_URL)
+        self._scheme = base.scheme
+        self.method = 'GET'
+        self.path = self.path_info = path
+        self.GET = QueryDict(query)
+        self.META = {
+            'REQUEST_METHOD': 'GET',
+            'HTTP_ACCEPT': 'application/json',
+            'HTTP_HOST': base.netloc,
+            'SERVER_NAME': base.hostname,
+            'SERVER_PORT': str(base.port or (443 if base.scheme == 'https' else 80)),
+            'QUERY_STRING': query,
+        }
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def snapshot_path(url_path, page=1):
+    """File for a URL such as /api/news/; page N of a list is index.page-N.json."""
+    name = 'index.json' if page == 1 else f'index.page-{page}.json'
+    return os.path.join(settings.SNAPSHOT_ROOT, url_path.strip('/'), name)
+
+
+def render(url_path, page=1):
+    """GET url_path through its view; returns (status code, body, response data)."""
+    request = SnapshotRequest(url_path, f'page={page}' if page > 1 else '')
+    match = resolve(url_path)
+    response = match.func(request, *match.args, **match.kwargs)
+    response.render()
+    return response.status_code, response.content, getattr(response, 'data', None)
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def write_snapshot(path, body):
+    """Atomically replace path (and its compressed siblings) if body changed. Returns True if written."""
+    siblings_current = os.path.exists(path + '.gz') and os.path.exists(path + '.br') == (brotli is not None)
+    try:
+        with open(path, 'rb') as current:
+            if current.read() == body and siblings_current:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _write_atomic(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(path + '.br', brotli.compress(body))
+    else:
+        _unlink(path + '.br')  # left by an install that had brotli; would serve the old body
+    _write_atomic(path, body)
+    return True
+
+
+def remove_snapshot(path):
+    for target in (path, *(path + suffix for suffix in COMPRESSED_SUFFIXES)):
+        _unlink(target)
+
+
+class PageCollector:
+    """
+    Paginator swapped into a list view by publish_list. Reads the list's pks in one query,
+    picks the pages to refresh (stale_pages) and returns only their rows, so the view
+    serializes them in one pass instead of once per page request.
+    """
+
+    def __init__(self, paginator_class, known, changed):
+        self.paginator_class = paginator_class
+        self.known = known
+        self.changed = changed
+        self.pks = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.paginator_class().get_page_size(request)
+        self.pks = list(queryset.values_list('pk', flat=True))
+        self.pages = stale_pages(self.pks, self.page_size, self.known, self.changed)
+        rows, runs = [], []
+        for page in self.pages:
+            if runs and runs[-1][1] == page - 1:
+                runs[-1][1] = page
+            else:
+                runs.append([page, page])
+        for first, last in runs:
+            rows += queryset[(first - 1) * self.page_size:last * self.page_size]
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(data)
+
+
+def stale_pages(pks, page_size, known, changed):
+    """
+    Page numbers whose rows differ from the last published order, or hold a changed pk.
+    Every page carries the row count, so all pages are stale when it changes, when there
+    is no previous order, or when changed is None (full republish).
+    """
+    last = max(1, -(-len(pks) // page_size))
+    if changed is None or known is None or known['page_size'] != page_size or len(known['pks']) != len(pks):
+        return list(range(1, last + 1))
+    changed = set(changed)
+    stale = []
+    for page in range(1, last + 1):
+        rows = pks[(page - 1) * page_size:page * page_size]
+        if rows != known['pks'][(page - 1) * page_size:page * page_size] or changed.intersection(rows):
+            stale.append(page)
+    return stale
+
+
+def _read_order(directory):
+    try:
+        with open(os.path.join(directory, ORDER_FILE), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _render_as(template, response):
+    """Render response with the renderer the view negotiated for template."""
+    response.accepted_renderer = template.accepted_renderer
+    response.accepted_media_type = template.accepted_media_type
+    response.renderer_context = template.renderer_context
+    response.render()
+    return response.content
+
+
+def publish_list(url_path, pks=None):
+    """
+    Refresh the pages of a list endpoint that the changed pks (all rows when None) or a
+    change in order touch, and drop pages past the new last one.
+    """
+    directory = os.path.dirname(snapshot_path(url_path))
+    view = resolve(url_path).func
+    collector = PageCollector(view.cls.pagination_class, _read_order(directory), pks)
+    collecting = view.cls.as_view(view.actions, **{**view.initkwargs, 'pagination_class': lambda: collector})
+    response = collecting(SnapshotRequest(url_path))
+    response.render()
+    if response.status_code != 200:
+        return 0
+
+    written, last = 0, 1
+    if collector.pks is None:
+        # Not paginated (e.g. featured): the response is the whole list.
+        written += write_snapshot(snapshot_path(url_path), response.content)
+    else:
+        rows = iter(response.data)
+        pages = Paginator(collector.pks, collector.page_size)
+        last = pages.num_pages
+        for number in collector.pages:
+            page = pages.page(number)
+            paginator = collector.paginator_class()
+            paginator.request, paginator.page = SnapshotRequest(url_path, f'page={number}' if number > 1 else ''), page
+            items = [item for _, item in zip(page.object_list, rows)]
+            body = _render_as(response, paginator.get_paginated_response(items))
+            written += write_snapshot(snapshot_path(url_path, number), body)
+        os.makedirs(directory, exist_ok=True)
+        order = {'page_size': collector.page_size, 'pks': collector.pks}
+        _write_atomic(os.path.join(directory, ORDER_FILE), json.dumps(order).encode())
+
+    for name in os.listdir(directory) if os.path.isdir(directory) else ():
+        match = PAGE_FILE.match(name)
+        if match and int(match.group(1)) > last:
+            _unlink(os.path.join(directory, name))
+    return written
+
+
+def publish_detail(prefix, pk):
+    """Render one detail endpoint, or remove its snapshot if the row is gone."""
+    url_path = f'/api/{prefix}/{pk}/'
+    status, body, _ = render(url_path)
+    if status == 200:
+        return write_snapshot(snapshot_path(url_path), body)
+    remove_snapshot(snapshot_path(url_path))
+    return False
+
+
+def publish_model(model, pks=None):
+    """
+    Refresh the detail snapshots of pks and the list pages they (or the rows they
+    displaced) appear on; all rows, removing snapshots of deleted ones, when pks is None.
+    Only files whose content changed are rewritten. Returns the number written.
+    """
+    prefix, actions = SNAPSHOT_ENDPOINTS[model]
+    written = publish_list(f'/api/{prefix}/', pks)
+    for action in actions:
+        written += publish_list(f'/api/{prefix}/{action}/', pks)
+
+    if pks is None:
+        pks = set(model.objects.values_list('pk', flat=True))
+        directory = os.path.join(settings.SNAPSHOT_ROOT, 'api', prefix)
+        for name in os.listdir(directory) if os.path.isdir(directory) else ():
+            if name.isdigit() and int(name) not in pks:
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    for pk in sorted(pks):
+        written += publish_detail(prefix, pk)
+    return written
+
+
+# ==================== Incremental Publishing ====================
+# Changes are queued per model and published by one background thread, so a burst of
+# saves becomes one refresh. The thread is not a daemon: a management command that
+# changed rows waits for its snapshots before exiting.
+
+_dirty = {}
+_lock = threading.Lock()
+_worker = None
+
+FULL = object()  # Marker: republish every row of the model.
+
+
+def schedule_publish(model, pks=None):
+    """Queue a snapshot refresh for some rows of model (all rows when pks is None)."""
+    global _worker
+    if model not in SNAPSHOT_ENDPOINTS:
+        return
+    with _lock:
+        if pks is None:
+            _dirty[model] = FULL
+        elif _dirty.get(model) is not FULL:
+            _dirty.setdefault(model, set()).update(pks)
+        if _worker is None:
+            _worker = threading.Thread(target=_publish_pending, name='snapshot-publisher')
+            _worker.start()
+
+
+def _publish_pending():
+    global _worker
+    try:
+        while True:
+            time.sleep(settings.SNAPSHOT_DEBOUNCE_SECONDS)
+            with _lock:
+                if not _dirty:
+                    _worker = None
+                    return
+                pending = dict(_dirty)
+                _dirty.clear()
+            for model, pks in pending.items():
+                try:
+                    publish_model(model, None if pks is FULL else pks)
+                except Exception:  # noqa: BLE001 - keep publishing the other models
+                    logger.exception('Could not publish %s snapshots', model.__name__)
+    finally:
+        connections.close_all()
+        with _lock:
+            if _worker is threading.current_thread():
+                _worker = None
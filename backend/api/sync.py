@@ -0,0 +1,137 @@
+"""
+Incremental delta sync for mirroring clients.
+GET /api/<prefix>/?updated_since=<cursor> returns rows whose updated_at changed after
+the cursor, tombstones for rows that were deactivated or deleted, and the cursor for the
+next call. Start with updated_since=0 (or an ISO 8601 timestamp) for a full copy.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .events import from_cursor, to_cursor
+from .models import Tombstone
+
+
+def parse_sync_cursor(value):
+    """
+    '<micros>' or '<micros>-<pk>' (as returned in next_cursor), or an ISO 8601 timestamp.
+    Returns (micros, pk or None); raises ValidationError otherwise.
+    """
+    micros, _, pk = value.partition('-')
+    if micros.isdigit() and (not pk or pk.isdigit()):
+        cursor = (int(micros), int(pk) if pk else None)
+    else:
+        parsed = parse_datetime(value.replace(' ', '+'))  # '+' arrives as a space when not URL-encoded
+        if parsed is None:
+            raise ValidationError({'updated_since': 'Expected a cursor from next_cursor or an ISO 8601 timestamp.'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        cursor = (to_cursor(parsed), None)
+    try:
+        from_cursor(cursor[0])
+    except OverflowError:
+        raise ValidationError({'updated_since': 'Cursor is out of range.'})
+    return cursor
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def has_changes(*querysets):
+    """True if any queryset has a row, checked with one SELECT of EXISTS subqueries."""
+    columns, params = [], []
+    for queryset in querysets:
+        sql, sql_params = queryset.order_by().values('pk').query.sql_with_params()
+        columns.append(f'EXISTS ({sql})')
+        params.extend(sql_params)
+    with connections[querysets[0].db].cursor() as cursor:
+        cursor.execute('SELECT ' + ' OR '.join(columns), params)
+        return bool(cursor.fetchone()[0])
+
+
+def changes_since(queryset, cursor, limit):
+    """
+    Rows of queryset changed after cursor, plus tombstones, as a response dict.
+    Rows still being committed may carry an earlier updated_at, so the window stops
+    SYNC_COMMIT_WINDOW_SECONDS before now and the next call picks those up.
+    """
+    since, after_pk = cursor
+    until = max(since, to_cursor(timezone.now() - timedelta(seconds=settings.SYNC_COMMIT_WINDOW_SECONDS)))
+
+    rows = queryset.filter(updated_at__lte=from_cursor(until))
+    if after_pk is None:
+        rows = rows.filter(updated_at__gt=from_cursor(since))
+    else:
+        # Continuing inside a group of rows sharing one updated_at (bulk updates).
+        rows = rows.filter(updated_at__gte=from_cursor(since)).exclude(
+            updated_at=from_cursor(since), pk__lte=after_pk
+        )
+    deleted = Tombstone.objects.using(queryset.db).filter(
+        model=model_label(queryset.model),
+        deleted_at__gt=from_cursor(since),
+        deleted_at__lte=from_cursor(until),
+    )
+
+    # A client that is already current costs this one statement.
+    if not has_changes(rows, deleted):
+        return {'results': [], 'tombstones': [], 'next_cursor': str(until), 'has_more': False}
+
+    changed = list(rows.order_by('updated_at', 'pk')[:limit + 1])
+    has_more = len(changed) > limit
+    if has_more:
+        changed = changed[:limit]
+        last = changed[-1]
+        next_cursor = f'{to_cursor(last.updated_at)}-{last.pk}'
+        deleted = deleted.filter(deleted_at__lte=last.updated_at)
+    else:
+        next_cursor = str(until)
+
+    tombstones = [
+        {'id': row.pk, 'reason': 'deactivated', 'at': row.updated_at}
+        for row in changed if not row.is_active
+    ]
+    tombstones += [
+        {'id': tombstone.object_id, 'reason': 'deleted', 'at': tombstone.deleted_at}
+        for tombstone in deleted.order_by('deleted_at')
+    ]
+    return {
+        'results': [row for row in changed if row.is_active],
+        'tombstones': tombstones,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    }
+
+
+class DeltaSyncMixin:
+    """
+    Adds ?updated_since= to a BaseModel viewset's list. The 'sync' action sees the viewset's
+    detail queryset (inactive rows included) so deactivations can be reported.
+    """
+    sync_page_size = None
+
+    def list(self, request, *args, **kwargs):
+        value = request.query_params.get('updated_since')
+        if value is None:
+            return super().list(request, *args, **kwargs)
+
+        self.action = 'sync'
+        cursor = parse_sync_cursor(value.strip())
+        retention = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if cursor[0] and from_cursor(cursor[0]) < retention:
+            # Tombstones older than this are pruned, so deletions could be missed.
+            return Response(
+                {'detail': 'Cursor is older than the tombstone retention; refetch the full list.'},
+                status=status.HTTP_410_GONE,
+            )
+
+        data = changes_since(self.filter_queryset(self.get_queryset()), cursor, self.sync_page_size or settings.SYNC_PAGE_SIZE)
+        data['results'] = self.get_serializer(data['results'], many=True).data
+        return Response(data)
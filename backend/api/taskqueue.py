@@ -0,0 +1,282 @@
+"""
+Database-backed background tasks.
+Tasks are rows in the Task table, so no broker is needed: code calls some_task.enqueue(...)
+(inside its own transaction if it likes) and `python manage.py run_tasks` claims due rows
+and runs them on a thread pool, or a process pool for CPU-bound work. Functions are
+registered with @task, in api.tasks.
+"""
+
+import contextvars
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+THREAD = 'thread'
+PROCESS = 'process'
+
+REGISTRY = {}
+
+_running = contextvars.ContextVar('running_task', default=None)
+
+
+class TaskSpec:
+    """A registered task function; call it directly or queue it with enqueue()."""
+
+    def __init__(self, func, name, priority, max_attempts, pool):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.pool = pool
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, priority=None, run_at=None, dedupe_key=None, **kwargs):
+        return enqueue(
+            self.name, args, kwargs,
+            priority=self.priority if priority is None else priority,
+            run_at=run_at, max_attempts=self.max_attempts, dedupe_key=dedupe_key,
+        )
+
+
+def task(name=None, priority=0, max_attempts=3, pool=THREAD):
+    """Register a function as a background task. Arguments and results must be JSON-serializable."""
+    def decorator(func):
+        spec = TaskSpec(func, name or f'{func.__module__}.{func.__name__}', priority, max_attempts, pool)
+        REGISTRY[spec.name] = spec
+        return spec
+    return decorator
+
+
+def enqueue(name, args=(), kwargs=None, priority=0, run_at=None, max_attempts=3, dedupe_key=None):
+    """
+    Queue a task by name. With dedupe_key, an already queued or running task with the
+    same key is returned instead of adding another.
+    """
+    fields = {
+        'name': name, 'args': list(args), 'kwargs': kwargs or {}, 'priority': priority,
+        'run_at': run_at or timezone.now(), 'max_attempts': max_attempts, 'dedupe_key': dedupe_key,
+    }
+    if dedupe_key is None:
+        return Task.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Task.objects.create(**fields)
+    except IntegrityError:
+        existing = Task.objects.using('default').filter(dedupe_key=dedupe_key, status__in=Task.ACTIVE).first()
+        return existing or Task.objects.create(**fields)
+
+
+def set_progress(done, total=None, message=''):
+    """
+    Report progress from inside a running task: a percent, or done out of total.
+    One UPDATE by primary key, skipped when nothing changed; a no-op outside the worker.
+    """
+    state = _running.get()
+    if state is None:
+        return
+    percent = done if total is None else (100 * done // total if total else 100)
+    report = (max(0, min(100, int(percent))), message[:255])
+    if report != state['last']:
+        state['last'] = report
+        Task.objects.filter(pk=state['pk']).update(progress=report[0], progress_message=report[1])
+
+
+def run_task(task_id, name, args, kwargs):
+    """
+    Run one claimed task in a pool worker. Returns (True, result) or (False, traceback);
+    exceptions are not raised so they survive the trip back from a process pool.
+    """
+    token = _running.set({'pk': task_id, 'last': None})
+    close_old_connections()
+    try:
+        result = REGISTRY[name].func(*args, **kwargs)
+        json.dumps(result, cls=DjangoJSONEncoder)  # Fail here rather than when storing it
+        return True, result
+    except Exception:  # noqa: BLE001 - stored on the task row
+        return False, traceback.format_exc()
+    finally:
+        _running.reset(token)
+        close_old_connections()
+
+
+def retry_delay(attempts):
+    """Doubles from TASK_RETRY_BASE_SECONDS up to TASK_RETRY_MAX_SECONDS."""
+    return timedelta(seconds=min(settings.TASK_RETRY_MAX_SECONDS,
+                                 settings.TASK_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1)))
+
+
+def claim(worker_id, limit, names, now=None):
+    """
+    Mark up to limit due tasks (highest priority first) as running for this worker.
+    Uses SELECT ... FOR UPDATE SKIP LOCKED where supported, so concurrent workers never
+    wait on each other; elsewhere (SQLite) each candidate is claimed with a conditional UPDATE.
+    """
+    if limit <= 0 or not names:
+        return []
+    now = now or timezone.now()
+    due = (Task.objects.using('default').filter(status=Task.QUEUED, run_at__lte=now, name__in=names)
+           .order_by('-priority', 'run_at', 'pk'))
+    claimed = {
+        'status': Task.RUNNING, 'claimed_by': worker_id, 'started_at': now,
+        'lease_until': now + timedelta(seconds=settings.TASK_LEASE_SECONDS), 'attempts': F('attempts') + 1,
+    }
+    if connections['default'].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using='default'):
+            pks = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Task.objects.filter(pk__in=pks).update(**claimed)
+    else:
+        pks = [
+            pk for pk in due.values_list('pk', flat=True)[:limit]
+            if Task.objects.filter(pk=pk, status=Task.QUEUED).update(**claimed)
+        ]
+    return list(Task.objects.using('default').filter(pk__in=pks).order_by('-priority', 'run_at', 'pk'))
+
+
+def finish(task_obj, ok, payload):
+    """Store a task's outcome; failures are re-queued with backoff until max_attempts."""
+    now = timezone.now()
+    fields = {'lease_until': None}
+    if ok:
+        fields.update(status=Task.SUCCEEDED, result=payload, progress=100, error='', finished_at=now)
+    elif task_obj.attempts < task_obj.max_attempts:
+        fields.update(status=Task.QUEUED, run_at=now + retry_delay(task_obj.attempts), error=payload)
+    else:
+        fields.update(status=Task.FAILED, error=payload, finished_at=now)
+    # Only while this worker still holds it (an admin may have cancelled it meanwhile).
+    Task.objects.filter(pk=task_obj.pk, status=Task.RUNNING, claimed_by=task_obj.claimed_by).update(**fields)
+
+
+def recover_expired(now=None):
+    """Re-queue running tasks whose worker stopped renewing the lease (crashed or killed)."""
+    now = now or timezone.now()
+    lost = Task.objects.filter(status=Task.RUNNING, lease_until__lt=now)
+    retried = lost.filter(attempts__lt=F('max_attempts')).update(
+        status=Task.QUEUED, lease_until=None, run_at=now, error='Worker lost; retried.'
+    )
+    failed = lost.update(status=Task.FAILED, lease_until=None, finished_at=now, error='Worker lost.')
+    return retried + failed
+
+
+class Worker:
+    """
+    Claims and runs tasks until stopped. Thread-pool tasks and process-pool tasks are
+    claimed only while their pool has a free slot; without a process pool, process
+    tasks run on threads.
+    """
+
+    def __init__(self, threads, processes=0, poll_interval=1.0, log=None):
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+        self.poll_interval = poll_interval
+        self.log = log or logger.info
+        self.capacity = {THREAD: threads, PROCESS: processes}
+        self.pools = {THREAD: ThreadPoolExecutor(max_workers=threads, thread_name_prefix='task')}
+        if processes:
+            # Spawned (not forked) so children share no connections or locks with this process;
+            # each sets Django up once (DJANGO_SETTINGS_MODULE is inherited) before importing api.
+            self.pools[PROCESS] = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup,
+            )
+        self.running = {}  # future -> (Task, pool)
+        self.periodic_next = {}
+        self.stopping = False
+
+    def pool_for(self, name):
+        pool = REGISTRY[name].pool
+        return pool if pool in self.pools else THREAD
+
+    def free_slots(self):
+        busy = {pool: 0 for pool in self.pools}
+        for _, pool in self.running.values():
+            busy[pool] += 1
+        return {pool: self.capacity[pool] - busy[pool] for pool in self.pools}
+
+    def schedule_periodic(self, now):
+        """Keep one queued run of each TASK_PERIODIC entry, interval after the previous run."""
+        for name, interval in settings.TASK_PERIODIC.items():
+            if self.periodic_next.get(name, now) > now:
+                continue
+            key = f'periodic:{name}'
+            pending = Task.objects.using('default').filter(dedupe_key=key, status__in=Task.ACTIVE).values_list('run_at', flat=True).first()
+            if pending is None:
+                last = (Task.objects.using('default').filter(dedupe_key=key).order_by('-run_at')
+                        .values_list('run_at', flat=True).first())
+                run_at = max(now, last + timedelta(seconds=interval)) if last else now
+                pending = enqueue(name, run_at=run_at, max_attempts=1, dedupe_key=key).run_at
+            self.periodic_next[name] = max(pending, now + timedelta(seconds=self.poll_interval))
+
+    def renew_leases(self, now):
+        if self.running:
+            Task.objects.filter(pk__in=[t.pk for t, _ in self.running.values()], status=Task.RUNNING).update(
+                lease_until=now + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+            )
+
+    def tick(self):
+        """One scheduling pass; returns the number of tasks started."""
+        now = timezone.now()
+        recover_expired(now)
+        self.schedule_periodic(now)
+        self.renew_leases(now)
+        started = 0
+        for pool, free in self.free_slots().items():
+            names = [name for name in REGISTRY if self.pool_for(name) == pool]
+            for task_obj in claim(self.worker_id, free, names, now):
+                future = self.pools[pool].submit(run_task, task_obj.pk, task_obj.name, task_obj.args, task_obj.kwargs)
+                self.running[future] = (task_obj, pool)
+                self.log(f'▶️  {task_obj.name} #{task_obj.pk}')
+                started += 1
+        return started
+
+    def reap(self, timeout):
+        """Wait up to timeout for running tasks and record the finished ones."""
+        if not self.running:
+            time.sleep(timeout)
+            return
+        done, _ = wait(list(self.running), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            task_obj, _ = self.running.pop(future)
+            try:
+                ok, payload = future.result()
+            except Exception:  # noqa: BLE001 - e.g. a process pool worker died
+                ok, payload = False, traceback.format_exc()
+            finish(task_obj, ok, payload)
+            self.log(f"{'✅' if ok else '❌'} {task_obj.name} #{task_obj.pk}")
+
+    def run(self, once=False):
+        """Process tasks until stop() (or, with once, until nothing is due or running)."""
+        try:
+            while not self.stopping:
+                started = self.tick()
+                if once and not started and not self.running:
+                    return
+                # Straight back to claiming while there is work and free capacity.
+                self.reap(0 if started and any(self.free_slots().values()) else self.poll_interval)
+                close_old_connections()
+            while self.running:
+                self.reap(self.poll_interval)
+        finally:
+            for pool in self.pools.values():
+                pool.shutdown(wait=True)
+
+    def stop(self, *args):
+        self.stopping = True
@@ -0,0 +1,82 @@
+"""
+Background tasks for the run_tasks worker (see api.taskqueue).
+Queue one with e.g. recount_career_applications.enqueue([1, 2]); periodic ones are
+listed in settings.TASK_PERIODIC.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from . import imaging
+from .deletion import BatchedDeletion
+from .images import _render_args, record_failure, store_result
+from .models import Career, Task
+from .notifications import deliver_due
+from .taskqueue import PROCESS, set_progress, task
+
+
+@task()
+def send_notifications():
+    """Deliver queued notification emails (one batch)."""
+    sent, failed = deliver_due()
+    return {'sent': sent, 'failed': failed}
+
+
+@task()
+def recount_career_applications(career_ids=None, batch_size=500):
+    """Recompute Career application counters, for the given careers or all of them."""
+    careers = Career.objects.order_by('pk')
+    if career_ids is not None:
+        careers = careers.filter(pk__in=career_ids)
+    pks = list(careers.values_list('pk', flat=True))
+    for start in range(0, len(pks), batch_size):
+        Career.objects.filter(pk__in=pks[start:start + batch_size]).refresh_application_counters()
+        set_progress(min(start + batch_size, len(pks)), len(pks), 'Recounting applications')
+    return {'careers': len(pks)}
+
+
+@task(pool=PROCESS)
+def render_image_variants(source_urls):
+    """Render responsive variants for image URLs (CPU-bound, so on the process pool)."""
+    failures = {}
+    for done, source_url in enumerate(source_urls, 1):
+        try:
+            store_result(imaging.render_variants(*_render_args(source_url)))
+        except Exception as exc:  # noqa: BLE001 - one bad image must not fail the rest
+            record_failure(source_url, exc)  # Not retried before its backoff ends
+            failures[source_url] = str(exc)
+        set_progress(done, len(source_urls), source_url)
+    return {'rendered': len(source_urls) - len(failures), 'failures': failures}
+
+
+@task()
+def purge_expired_records():
+    """Daily housekeeping: tombstones, idempotency keys, abandoned uploads and old task rows."""
+    for command in ('prune_tombstones', 'purge_idempotency_keys', 'purge_uploads'):
+        call_command(command, stdout=StringIO())
+    cutoff = timezone.now() - timedelta(days=settings.TASK_RESULT_RETENTION_DAYS)
+    tasks, _ = Task.objects.exclude(status__in=Task.ACTIVE).filter(finished_at__lt=cutoff).delete()
+    return {'tasks': tasks}
+
+
+@task()
+def archive_submissions():
+    """Move old, handled messages and applications to the archive table."""
+    output = StringIO()
+    call_command('archive_submissions', stdout=output)
+    return {'output': output.getvalue().strip()}
+
+
+@task(max_attempts=5)
+def delete_rows(model_label, pks, batch_size=None):
+    """Batched delete of rows and their cascade; a retry carries on where the last attempt stopped."""
+    model = apps.get_model(model_label)
+    deletion = BatchedDeletion(
+        model._base_manager.filter(pk__in=pks), batch_size or settings.DELETE_BATCH_SIZE, progress=set_progress
+    )
+    return {deleted._meta.label_lower: count for deleted, count in deletion.run().items()}
@@ -0,0 +1,47 @@
+"""
+Parsing of free-text quantities entered in the admin.
+Project.capacity ("1320 MW", "1.32 GW") and Project.efficiency (">41%") are kept as
+typed; these helpers derive the numeric columns used for filtering and totals.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+
+
+NUMBER = r'(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?'
+CAPACITY = re.compile(NUMBER + r'\s*(GW|MW|kW)p?\b', re.IGNORECASE)  # MWp: solar peak rating
+PERCENT = re.compile(NUMBER + r'\s*%')
+
+MW_PER_UNIT = {'gw': Decimal(1000), 'mw': Decimal(1), 'kw': Decimal('0.001')}
+# Limits of the Project.capacity_mw column (max_digits=12, decimal_places=3): whole kW, under a million GW.
+MW_PLACES = Decimal('0.001')
+MW_LIMIT = Decimal(10) ** 9
+
+
+def _number(match):
+    try:
+        return Decimal(match.group(1).replace(',', '') + (match.group(2) or ''))
+    except InvalidOperation:
+        return None
+
+
+def parse_capacity_mw(text):
+    """'1320 MW' -> Decimal('1320'), '250 kW' -> Decimal('0.25'); None if no power unit is given
+    or the value does not fit the column."""
+    match = CAPACITY.search(text or '')
+    if match is None:
+        return None
+    value = _number(match)
+    if value is None:
+        return None
+    value = (value * MW_PER_UNIT[match.group(3).lower()]).quantize(MW_PLACES)
+    return value if value < MW_LIMIT else None
+
+
+def parse_efficiency_percent(text):
+    """'>41%' -> Decimal('41'), '38.5 %' -> Decimal('38.5'); None for 'N/A' and the like."""
+    match = PERCENT.search(text or '')
+    if match is None:
+        return None
+    value = _number(match)
+    return None if value is None or value > 100 else value.quantize(Decimal('0.01'))
@@ -11,7 +11,7 @@ from .views import (
     ContactMessageViewSet, ProjectStatViewSet,
     BoardMemberViewSet, SustainabilityStatViewSet,
     ProjectViewSet, MilestoneViewSet, CSRInitiativeViewSet,
-    JobApplicationViewSet
+    JobApplicationViewSet, UploadSessionViewSet, ArchivedRecordViewSet, batch, change_feed, db_pool_stats, task_status
 )
 
 # Create router and register viewsets
@@ -27,8 +27,14 @@ router.register(r'projects', ProjectViewSet, basename='project')
 router.register(r'milestones', MilestoneViewSet, basename='milestone')
 router.register(r'csr', CSRInitiativeViewSet, basename='csr')
 router.register(r'applications', JobApplicationViewSet, basename='application')
+router.register(r'uploads', UploadSessionViewSet, basename='upload')
+router.register(r'archive', ArchivedRecordViewSet, basename='archive')
 
 # URL patterns
 urlpatterns = [
+    path('health/db-pool/', db_pool_stats, name='db-pool-stats'),
+    path('events/', change_feed, name='change-feed'),
+    path('batch/', batch, name='api-batch'),
+    path('tasks/<int:pk>/', task_status, name='task-status'),
     path('', include(router.urls)),
 ]
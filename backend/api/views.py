@@ -3,26 +3,56 @@ API Views - Handle HTTP requests.
 Uses ViewSets for automatic CRUD operations.
 """
 
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils._os import safe_join
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+from rest_framework import mixins, viewsets, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 
+from core.replicas import replica_health
+
+from .archive import ARCHIVE_MODEL_NAMES
+from .batch import combined_cache_control, run_batch, validate_path
+from .caching import CachePolicyMixin
+from .events import hub, parse_cursor, replay_once
+from .expand import Expand, ExpandMixin
+from .filters import NumericRangeFilter
+from .idempotency import IdempotentCreateMixin
+from .files import (
+    DownloadCounter, StreamingUploadHandler, UploadConflict, UploadRejected, UploadRestart,
+    append_chunk, discard_session, is_new_download, sendfile_response
+)
 from .models import (
     Tender, News, Career, ContactMessage, ProjectStat,
     BoardMember, SustainabilityStat, Project, Milestone, CSRInitiative,
-    JobApplication
+    JobApplication, Task, UploadSession, ArchivedRecord
 )
+from .portfolio import get_portfolio_summary
+from .sync import DeltaSyncMixin
 from .serializers import (
     TenderSerializer, NewsSerializer, CareerSerializer,
     ContactMessageSerializer, ProjectStatSerializer,
     BoardMemberSerializer, SustainabilityStatSerializer,
     ProjectSerializer, MilestoneSerializer, CSRInitiativeSerializer,
-    JobApplicationSerializer
+    JobApplicationSerializer, UploadSessionSerializer, ArchivedRecordSerializer
 )
 
 
-class TenderViewSet(viewsets.ModelViewSet):
+tender_downloads = DownloadCounter(Tender, 'download_count')
+
+
+class TenderViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Tenders - Full CRUD."""
     queryset = Tender.objects.all()
     serializer_class = TenderSerializer
@@ -30,11 +60,34 @@ class TenderViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         if self.action == 'list':
-            return Tender.objects.filter(is_active=True)
-        return Tender.objects.all()
+            return Tender.objects.filter(is_active=True).select_related('document')
+        return Tender.objects.all().select_related('document')
 
-
-class NewsViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def open(self, request):
+        """Get tenders that are still accepting bids, closing soonest first."""
+        tenders = Tender.objects.open().select_related('document').order_by('deadline')
+        page = self.paginate_queryset(tenders)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def document(self, request, pk=None):
+        """Download the bidding document (supports Range/If-Range; sent by the web server in production)."""
+        tender = self.get_object()
+        if tender.document is None:
+            raise Http404('No document uploaded')
+        stored_file = tender.document
+        response = sendfile_response(
+            request, stored_file, f"{slugify(tender.reference_number.replace('/', '-'))}.{stored_file.extension}",
+            cache_control='public, max-age=300'
+        )
+        if is_new_download(request, response):
+            tender_downloads.add(tender.pk)
+        return response
+
+
+class NewsViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for News - Full CRUD."""
     queryset = News.objects.all()
     serializer_class = NewsSerializer
@@ -53,19 +106,32 @@ class NewsViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class CareerViewSet(viewsets.ModelViewSet):
+class CareerViewSet(CachePolicyMixin, ExpandMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Careers/Jobs - Full CRUD."""
     queryset = Career.objects.all()
     serializer_class = CareerSerializer
     permission_classes = [AllowAny]
+    expandable = {
+        'applications': Expand(
+            JobApplicationSerializer, limit=settings.EXPAND_PREFETCH_LIMIT, ordering=['-created_at'],
+            select_related=['resume_file'], staff_only=True
+        ),
+    }
 
     def get_queryset(self):
         if self.action == 'list':
             return Career.objects.filter(is_active=True)
         return Career.objects.all()
 
+    @action(detail=False, methods=['get'])
+    def open(self, request):
+        """Get job openings that are still accepting applications."""
+        page = self.paginate_queryset(self.filter_queryset(Career.objects.open()))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(CachePolicyMixin, IdempotentCreateMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Contact Messages."""
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
@@ -80,7 +146,7 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         return Response({'status': 'marked as read'})
 
 
-class ProjectStatViewSet(viewsets.ModelViewSet):
+class ProjectStatViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Project Statistics - Full CRUD."""
     queryset = ProjectStat.objects.all()
     serializer_class = ProjectStatSerializer
@@ -92,7 +158,7 @@ class ProjectStatViewSet(viewsets.ModelViewSet):
         return ProjectStat.objects.all()
 
 
-class BoardMemberViewSet(viewsets.ModelViewSet):
+class BoardMemberViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Board Members - Full CRUD."""
     queryset = BoardMember.objects.all()
     serializer_class = BoardMemberSerializer
@@ -104,7 +170,7 @@ class BoardMemberViewSet(viewsets.ModelViewSet):
         return BoardMember.objects.all()
 
 
-class SustainabilityStatViewSet(viewsets.ModelViewSet):
+class SustainabilityStatViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Sustainability Statistics - Full CRUD."""
     queryset = SustainabilityStat.objects.all()
     serializer_class = SustainabilityStatSerializer
@@ -116,11 +182,14 @@ class SustainabilityStatViewSet(viewsets.ModelViewSet):
         return SustainabilityStat.objects.all()
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
-    """API endpoint for Projects - Full CRUD."""
+class ProjectViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
+    """API endpoint for Projects - Full CRUD. Lists filter by ?capacity_mw_min=/_max= and sort by ?ordering=."""
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [AllowAny]
+    filter_backends = [NumericRangeFilter, OrderingFilter]
+    range_filter_fields = ['capacity_mw', 'efficiency_percent']
+    ordering_fields = ['capacity_mw', 'efficiency_percent', 'name', 'created_at']
 
     def get_queryset(self):
         if self.action == 'list':
@@ -134,8 +203,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(featured, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Total and average capacity/efficiency of active projects per category and status."""
+        return Response(get_portfolio_summary())
+
 
-class MilestoneViewSet(viewsets.ModelViewSet):
+class MilestoneViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Milestones - Full CRUD."""
     queryset = Milestone.objects.all()
     serializer_class = MilestoneSerializer
@@ -147,7 +221,7 @@ class MilestoneViewSet(viewsets.ModelViewSet):
         return Milestone.objects.all()
 
 
-class CSRInitiativeViewSet(viewsets.ModelViewSet):
+class CSRInitiativeViewSet(CachePolicyMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for CSR Initiatives - Full CRUD."""
     queryset = CSRInitiative.objects.all()
     serializer_class = CSRInitiativeSerializer
@@ -159,15 +233,31 @@ class CSRInitiativeViewSet(viewsets.ModelViewSet):
         return CSRInitiative.objects.all()
 
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(CachePolicyMixin, IdempotentCreateMixin, ExpandMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     """API endpoint for Job Applications - Create and List."""
     queryset = JobApplication.objects.all()
     serializer_class = JobApplicationSerializer
     permission_classes = [AllowAny]
+    expandable = {'career': Expand(CareerSerializer)}
+    upload_handler = None
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Stream resume uploads straight to disk instead of Django's in-memory handler.
+        if request.method in ('POST', 'PUT', 'PATCH'):
+            self.upload_handler = StreamingUploadHandler(
+                request, settings.RESUME_MAX_SIZE, settings.RESUME_ALLOWED_TYPES
+            )
+            request.upload_handlers = [self.upload_handler]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        if 'data' in kwargs and self.upload_handler is not None and self.upload_handler.errors:
+            raise ValidationError(self.upload_handler.errors)
+        return super().get_serializer(*args, **kwargs)
 
     def get_queryset(self):
         """List all applications for admin, or filter by career."""
-        queryset = JobApplication.objects.all().select_related('career')
+        queryset = JobApplication.objects.all().select_related('career', 'resume_file')
         career_id = self.request.query_params.get('career', None)
         if career_id:
             queryset = queryset.filter(career_id=career_id)
@@ -180,3 +270,195 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         application.is_reviewed = True
         application.save()
         return Response({'status': 'marked as reviewed'})
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAdminUser])
+    def resume(self, request, pk=None):
+        """Download the uploaded CV (sent by the web server when a sendfile backend is set)."""
+        application = self.get_object()
+        if application.resume_file is None:
+            raise Http404('No resume uploaded')
+        stored_file = application.resume_file
+        return sendfile_response(request, stored_file, f'resume-{slugify(application.name)}.{stored_file.extension}')
+
+
+class UploadSessionViewSet(
+    CachePolicyMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """
+    API endpoint for resumable uploads.
+    POST {filename, size} creates a session; PUT sends the bytes at an offset with
+    Content-Range: bytes <start>-<end>/<size>; GET returns how much has arrived.
+    """
+    queryset = UploadSession.objects.all()
+    serializer_class = UploadSessionSerializer
+    permission_classes = [AllowAny]
+
+    def update(self, request, pk=None):
+        session = self.get_object()
+        if session.is_complete:
+            return Response(self.get_serializer(session).data)
+        try:
+            unit, _, spec = request.META['HTTP_CONTENT_RANGE'].partition(' ')
+            span, _, total = spec.partition('/')
+            start, end = (int(n) for n in span.split('-'))
+            total = int(total)
+        except (KeyError, ValueError):
+            return Response(
+                {'detail': 'Content-Range: bytes <start>-<end>/<size> is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        length = end - start + 1
+        if (unit != 'bytes' or total != session.size or length <= 0 or end >= total
+                or int(request.META.get('CONTENT_LENGTH') or 0) != length):
+            return Response({'detail': 'Invalid Content-Range.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start != session.received:
+            return Response(self.get_serializer(session).data, status=status.HTTP_409_CONFLICT)
+
+        try:
+            append_chunk(
+                session, request.stream, start, length,
+                settings.RESUME_MAX_SIZE, settings.RESUME_ALLOWED_TYPES
+            )
+        except UploadRejected as exc:
+            discard_session(session)
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except UploadRestart as exc:
+            # Same shape as an offset mismatch: the client resumes from 'received' (now 0).
+            return Response({**self.get_serializer(session).data, 'detail': str(exc)}, status=status.HTTP_409_CONFLICT)
+        except UploadConflict as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(session).data)
+
+
+class ArchivedRecordViewSet(CachePolicyMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Staff lookup of archived messages and applications. Filter by ?email= (exact),
+    ?model=contact|application, ?object_id= and ?created_after= / ?created_before=.
+    """
+    queryset = ArchivedRecord.objects.all()
+    serializer_class = ArchivedRecordSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = ArchivedRecord.objects.all()
+        params = self.request.query_params
+        if 'model' in params:
+            model = ARCHIVE_MODEL_NAMES.get(params['model'])
+            if model is None:
+                raise ValidationError({'model': f"Choose from: {', '.join(ARCHIVE_MODEL_NAMES)}."})
+            queryset = queryset.filter(model=model._meta.label_lower)
+        if 'email' in params:
+            queryset = queryset.filter(email=params['email'].strip())
+        if 'object_id' in params:
+            if not params['object_id'].isdigit():
+                raise ValidationError({'object_id': 'Expected an integer.'})
+            queryset = queryset.filter(object_id=int(params['object_id']))
+        for param, lookup in (('created_after', 'gte'), ('created_before', 'lt')):
+            if param in params:
+                moment = parse_datetime(params[param].replace(' ', '+'))
+                if moment is None:
+                    raise ValidationError({param: 'Expected an ISO 8601 timestamp.'})
+                if timezone.is_naive(moment):
+                    moment = timezone.make_aware(moment)
+                queryset = queryset.filter(**{f'original_created_at__{lookup}': moment})
+        return queryset
+
+
+def database_pool_stats():
+    """Connection pool statistics (and replica health) for every database in this process."""
+    stats = {}
+    replicas = replica_health.status()
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, 'pool', None)
+        stats[alias] = {
+            'mode': settings.DB_POOL_MODE if connection.vendor == 'postgresql' else None,
+            'pool': pool.get_stats() if pool is not None else None,
+        }
+        if alias in replicas:
+            stats[alias]['healthy'] = replicas[alias]
+    return stats
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def batch(request):
+    """
+    Run several API GETs in one round trip: GET ?path=/api/stats/&path=/api/csr/
+    or POST {"paths": [...]}. Returns {"results": {path: {status, body, cache_control}}}.
+    """
+    paths = request.data.get('paths') if request.method == 'POST' else request.query_params.getlist('path')
+    if not isinstance(paths, list) or not paths:
+        raise ValidationError({'paths': 'Give a non-empty list of /api/ paths.'})
+    if len(paths) > settings.BATCH_MAX_PATHS:
+        raise ValidationError({'paths': f'At most {settings.BATCH_MAX_PATHS} paths per batch.'})
+    errors = [error for error in map(validate_path, paths) if error]
+    if errors:
+        raise ValidationError({'paths': errors})
+
+    results = run_batch(request._request, paths)
+    response = Response({'results': results})
+    if request.method == 'GET':
+        response['Cache-Control'] = combined_cache_control(results.values())
+    else:
+        response['Cache-Control'] = 'no-store'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_pool_stats(request):
+    """Pool saturation metrics (size, available, waiting requests, wait time) and replica health for this worker."""
+    return Response(database_pool_stats())
+
+
+TASK_STATUS_FIELDS = ('id', 'name', 'status', 'progress', 'progress_message', 'attempts', 'max_attempts',
+                      'run_at', 'started_at', 'finished_at', 'result', 'error')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def task_status(request, pk):
+    """Progress of a background task, for admin pages to poll (one primary-key lookup)."""
+    task = Task.objects.filter(pk=pk).values(*TASK_STATUS_FIELDS).first()
+    if task is None:
+        raise Http404
+    response = Response(task)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def image_variant(request, path):
+    """
+    Serve a rendered image variant. Paths are content-addressed, so responses are immutable.
+    In production the web server should serve MEDIA_ROOT/variants/ directly with the same headers.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, 'variants', path)
+        response = FileResponse(open(full_path, 'rb'))
+    except (OSError, SuspiciousFileOperation):
+        raise Http404('Image variant not found')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+async def change_feed(request):
+    """
+    Server-Sent Events stream of contact message and job application changes (staff only).
+    Resumes after the Last-Event-ID header (or ?last_event_id=). Without ASGI the backlog is
+    sent once and EventSource reconnects after a long retry, i.e. it degrades to slow polling.
+    """
+    # The API profile has no auth middleware, so there is no user to check there.
+    user = await request.auser() if hasattr(request, 'auser') else None
+    if not getattr(user, 'is_staff', False):
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+
+    cursor = parse_cursor(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+    if isinstance(request, ASGIRequest):
+        body = hub.stream(cursor)
+    else:
+        body = await sync_to_async(replay_once)(cursor)
+    response = StreamingHttpResponse(body, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream.
+    return response
@@ -0,0 +1,147 @@
+"""
+Read-replica routing.
+
+Safe-method API requests read from a healthy replica; writes, admin traffic,
+management commands and recently-writing clients use the primary ('default').
+Replicas are health-checked lazily and dropped while their lag is too high.
+"""
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'db_pin'
+PIN_HEADER = 'DB-Pin'
+
+# Signs the pin token, so it cannot be forged and expires on its own (no server-side state).
+_pin_signer = signing.TimestampSigner(salt='core.replicas.pin')
+
+# Alias that reads should use for the current request (None means the primary).
+_read_alias = ContextVar('read_alias', default=None)
+
+LAG_SQL = {
+    'postgresql': (
+        'SELECT CASE WHEN NOT pg_is_in_recovery() '
+        'OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+    ),
+}
+
+
+class ReplicaHealth:
+    """Per-process replica health, refreshed at most every REPLICA_HEALTH_CHECK_INTERVAL seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = {}
+        self._healthy = {}
+
+    def healthy_aliases(self):
+        now = time.monotonic()
+        for alias in settings.DATABASE_REPLICAS:
+            if now - self._checked_at.get(alias, float('-inf')) >= settings.REPLICA_HEALTH_CHECK_INTERVAL:
+                # One thread refreshes; the others keep using the previous state meanwhile.
+                if self._lock.acquire(blocking=False):
+                    try:
+                        self._checked_at[alias] = now
+                        self._healthy[alias] = self.check(alias)
+                    finally:
+                        self._lock.release()
+        return [alias for alias in settings.DATABASE_REPLICAS if self._healthy.get(alias)]
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                sql = LAG_SQL.get(connection.vendor)
+                if sql is None:
+                    return True
+                cursor.execute(sql)
+                lag = float(cursor.fetchone()[0] or 0)
+        except Exception:  # noqa: BLE001 - any failure takes the replica out of rotation
+            connection.close()
+            return False
+        return lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+    def status(self):
+        return {alias: self._healthy.get(alias) for alias in settings.DATABASE_REPLICAS}
+
+
+replica_health = ReplicaHealth()
+
+
+class PrimaryReplicaRouter:
+    """Route reads to the alias chosen by ReplicaRoutingMiddleware; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def is_pinned(request):
+    """True while the client holds a pin from a write less than REPLICA_STICKY_SECONDS ago."""
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    token = request.headers.get(PIN_HEADER)
+    if not token:
+        return False
+    try:
+        _pin_signer.unsign(token, max_age=settings.REPLICA_STICKY_SECONDS)
+    except signing.BadSignature:  # Also raised once it has expired
+        return False
+    return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choose the read database per request.
+
+    After a write, the client is pinned to the primary for REPLICA_STICKY_SECONDS so it
+    reads its own writes: same-site browsers get a cookie, and every response to a write
+    carries a signed DB-Pin token that cross-origin clients (the SPA) echo back as a
+    request header. Both are checked without any shared state, so the pin holds across
+    worker processes and the separate API/admin profiles.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        alias = None
+        if settings.DATABASE_REPLICAS and self.can_use_replica(request):
+            healthy = replica_health.healthy_aliases()
+            if healthy:
+                alias = random.choice(healthy)
+
+        token = _read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+
+        if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+            response[PIN_HEADER] = _pin_signer.sign('primary')
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax')
+        return response
+
+    def can_use_replica(self, request):
+        return (
+            request.method in SAFE_METHODS
+            and request.path.startswith('/api/')
+            and not is_pinned(request)
+        )
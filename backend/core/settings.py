@@ -6,6 +6,7 @@ Configured for: REST API, CORS, Jazzmin Admin, and database integration.
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Load environment variables
 load_dotenv()
@@ -169,6 +170,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Must be at top
     'django.middleware.security.SecurityMiddleware',
+    'core.replicas.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -199,25 +201,120 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # ==================== Database ====================
 # Uses DATABASE_URL for Supabase, falls back to SQLite for local dev
+#
+# DB_POOL_MODE selects how Postgres connections are managed:
+#   persistent - one long-lived connection per worker thread (CONN_MAX_AGE)
+#   native     - Django's psycopg 3 connection pool shared by all threads of a process
+#   pgbouncer  - behind a transaction-mode pooler (PgBouncer / Supabase port 6543):
+#                no server-side cursors, no prepared statements
 
 import dj_database_url
 
-# Default SQLite for local development
+DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'persistent')
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+
+
+def database_config(url):
+    """Build a DATABASES entry for url according to DB_POOL_MODE."""
+    if DB_POOL_MODE == 'native':
+        config = dj_database_url.parse(url, conn_max_age=0)
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+            'max_idle': DB_POOL_MAX_IDLE,
+        }
+    elif DB_POOL_MODE == 'pgbouncer':
+        config = dj_database_url.parse(url, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True)
+        config['DISABLE_SERVER_SIDE_CURSORS'] = True
+        config.setdefault('OPTIONS', {})['prepare_threshold'] = None
+    else:
+        config = dj_database_url.parse(url, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True)
+    return config
+
+
+# Default SQLite for local development.
+# SQLITE_MODE=tuned is the supported setup for small single-node installs: WAL so readers
+# never block the writer, synchronous=NORMAL, memory-mapped I/O, a larger page cache, a busy
+# timeout, and BEGIN IMMEDIATE so write transactions queue instead of failing on lock upgrade.
+# SQLITE_READ_CONNECTION=True adds a read-only connection that API reads are routed to.
+SQLITE_MODE = os.getenv('SQLITE_MODE', 'default')
+SQLITE_PATH = Path(os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'))
+SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))  # milliseconds
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))  # bytes
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))  # negative = KiB
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': SQLITE_PATH,
     }
 }
 
+if SQLITE_MODE == 'tuned':
+    SQLITE_PRAGMAS = [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}',
+        f'PRAGMA cache_size={SQLITE_CACHE_SIZE}',
+        f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}',
+        'PRAGMA temp_store=MEMORY',
+    ]
+    DATABASES['default']['OPTIONS'] = {
+        'init_command': ';'.join(SQLITE_PRAGMAS),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': SQLITE_BUSY_TIMEOUT / 1000,
+    }
+    if os.getenv('SQLITE_READ_CONNECTION', 'False') == 'True':
+        DATABASES['sqlite_read'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': f'file:{SQLITE_PATH}?mode=ro',
+            'OPTIONS': {
+                'init_command': ';'.join(SQLITE_PRAGMAS[2:] + ['PRAGMA query_only=ON']),
+                'timeout': SQLITE_BUSY_TIMEOUT / 1000,
+            },
+            'TEST': {'MIRROR': 'default'},
+        }
+
 # Override with Supabase if DATABASE_URL is set
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL:
-    DATABASES['default'] = dj_database_url.config(
-        default=DATABASE_URL,
-        conn_max_age=600,
-        conn_health_checks=True,
-    )
+    DATABASES['default'] = database_config(DATABASE_URL)
+    DATABASES.pop('sqlite_read', None)
+
+# Read replicas (comma-separated URLs). Safe-method /api/ reads go to a healthy replica,
+# writes and admin traffic to the primary; a client that writes is pinned to the primary
+# for REPLICA_STICKY_SECONDS (by cookie, or by echoing the DB-Pin response header).
+DATABASE_REPLICAS = ['sqlite_read'] if 'sqlite_read' in DATABASES else []
+for index, url in enumerate(u.strip() for u in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if u.strip()):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {**database_config(url), 'TEST': {'MIRROR': 'default'}}
+    DATABASES[alias].setdefault('OPTIONS', {}).setdefault('connect_timeout', 2)
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.replicas.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '15'))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv('REPLICA_HEALTH_CHECK_INTERVAL', '10'))
+
+
+# ==================== Admin ====================
+# Scale mode: estimated changelist counts and a cheap date drill-down for very large tables
+
+ADMIN_SCALE_MODE = os.getenv('ADMIN_SCALE_MODE', 'False') == 'True'
+ADMIN_EXACT_COUNT_THRESHOLD = int(os.getenv('ADMIN_EXACT_COUNT_THRESHOLD', '10000'))
+
+# Dashboard statistics are cached briefly and invalidated by model signals
+ADMIN_STATS_CACHE_TIMEOUT = int(os.getenv('ADMIN_STATS_CACHE_TIMEOUT', '60'))
+
+# /api/projects/summary/ is cached until a project changes (or this many seconds). A save only
+# clears the cache of the process it ran in, and the default cache is per-process, so keep this
+# at the API short TTL unless CACHES points every profile at a shared backend (e.g. Redis).
+PROJECT_SUMMARY_CACHE_TIMEOUT = int(os.getenv('PROJECT_SUMMARY_CACHE_TIMEOUT', '60'))
 
 
 # ==================== REST Framework ====================
@@ -231,6 +328,68 @@ REST_FRAMEWORK = {
 }
 
 
+# ==================== HTTP Cache Policies ====================
+# Cache-Control for API responses, keyed by router basename ('tender') or basename.action
+# ('tender.open'); unset keys fall back to 'default'. Keys: max_age, s_maxage (shared caches),
+# stale_while_revalidate, stale_if_error, public (False = private), vary, no_store, and
+# deadline_floor (shorten TTLs so a cached list expires when an open row in it closes).
+
+API_CACHE_SHORT_TTL = int(os.getenv('API_CACHE_SHORT_TTL', '60'))
+API_CACHE_LONG_TTL = int(os.getenv('API_CACHE_LONG_TTL', '3600'))
+
+_LONG_LIVED = {
+    'max_age': API_CACHE_LONG_TTL,
+    's_maxage': API_CACHE_LONG_TTL * 6,
+    'stale_while_revalidate': API_CACHE_LONG_TTL,
+    'stale_if_error': 86400 * 7,
+}
+API_CACHE_POLICIES = {
+    'default': {
+        'max_age': API_CACHE_SHORT_TTL,
+        's_maxage': API_CACHE_SHORT_TTL * 5,
+        'stale_while_revalidate': API_CACHE_SHORT_TTL,
+        'stale_if_error': 86400,
+        'vary': ['Accept', 'Accept-Encoding'],
+    },
+    'board': _LONG_LIVED,
+    'milestone': _LONG_LIVED,
+    'stat': _LONG_LIVED,
+    'sustainability': _LONG_LIVED,
+    'tender': {'deadline_floor': 30},
+    'career': {'deadline_floor': 30},
+    'contact': {'no_store': True},
+    'application': {'no_store': True},
+    'upload': {'no_store': True},
+    'archive': {'no_store': True},
+}
+
+
+# ==================== Batch Requests ====================
+# /api/batch/ runs up to BATCH_MAX_PATHS API GETs in one request, BATCH_MAX_WORKERS at a time.
+# File downloads and the batch endpoint itself cannot be batched.
+
+BATCH_MAX_PATHS = int(os.getenv('BATCH_MAX_PATHS', '10'))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '4'))
+BATCH_EXCLUDED_URL_NAMES = ['api-batch', 'tender-document', 'application-resume', 'db-pool-stats']
+
+
+# ==================== Relation Expansion ====================
+# ?expand= embeds related rows; reverse relations return at most this many per parent.
+
+EXPAND_PREFETCH_LIMIT = int(os.getenv('EXPAND_PREFETCH_LIMIT', '20'))
+
+
+# ==================== Duplicate Submissions ====================
+# Responses to POSTs with an Idempotency-Key are replayed for this long
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+# A retry may take over a key whose first request has not finished after this many seconds
+# (its process died), instead of getting 409 until the key expires
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv('IDEMPOTENCY_LEASE_SECONDS', '60'))
+
+# Identical contact messages / applications within this window are rejected (409)
+DUPLICATE_SUBMISSION_WINDOW_MINUTES = int(os.getenv('DUPLICATE_SUBMISSION_WINDOW_MINUTES', '60'))
+
+
 # ==================== CORS Settings ====================
 # Allow frontend to communicate with backend
 
@@ -241,6 +400,10 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Idempotency-Key is sent by the public forms, DB-Pin echoed back after writes (core.replicas)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key', 'db-pin')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed', 'DB-Pin']
+
 
 # ==================== Password Validation ====================
 
@@ -265,4 +428,140 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = Path(os.getenv('MEDIA_ROOT', BASE_DIR / 'media'))
+
+
+# ==================== Responsive Images ====================
+# Resized AVIF/WebP/JPEG variants of image_url fields, rendered by the render_image_variants
+# task (run_tasks worker; generate_image_variants uses IMAGE_PIPELINE_WORKERS processes) and
+# stored content-addressed under MEDIA_ROOT/variants/ (serve with immutable cache headers).
+# Site-relative image URLs such as /images/hero-1.png are read from IMAGE_SOURCE_ROOT.
+# Absolute http(s) URLs are only fetched from hosts in IMAGE_SOURCE_HOSTS (none by default),
+# since image_url can be written by anonymous API clients. A failed render is retried after
+# IMAGE_RETRY_SECONDS, doubling per failure up to a day.
+
+IMAGE_SOURCE_ROOT = Path(os.getenv('IMAGE_SOURCE_ROOT', BASE_DIR.parent / 'frontend' / 'public'))
+IMAGE_SOURCE_HOSTS = [h.strip().lower() for h in os.getenv('IMAGE_SOURCE_HOSTS', '').split(',') if h.strip()]
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv('IMAGE_VARIANT_WIDTHS', '320,640,1024,1600').split(',')]
+IMAGE_VARIANT_FORMATS = os.getenv('IMAGE_VARIANT_FORMATS', 'avif,webp,jpeg').split(',')
+IMAGE_VARIANTS_ON_SAVE = os.getenv('IMAGE_VARIANTS_ON_SAVE', 'True') == 'True'
+IMAGE_PIPELINE_WORKERS = int(os.getenv('IMAGE_PIPELINE_WORKERS', '2'))
+IMAGE_RETRY_SECONDS = int(os.getenv('IMAGE_RETRY_SECONDS', '3600'))
+
+
+# ==================== File Uploads ====================
+# Uploads stream to disk under FILE_STORAGE_ROOT (not web-served) and are stored once per
+# SHA-256. Downloads are handed to the web server when FILE_SENDFILE_BACKEND is set:
+# 'nginx' sends X-Accel-Redirect to FILE_SENDFILE_URL_PREFIX (an internal location aliased
+# to FILE_STORAGE_ROOT), 'apache' sends X-Sendfile; 'django' streams the file itself.
+
+FILE_STORAGE_ROOT = Path(os.getenv('FILE_STORAGE_ROOT', BASE_DIR / 'private'))
+FILE_SENDFILE_BACKEND = os.getenv('FILE_SENDFILE_BACKEND', 'django')
+FILE_SENDFILE_URL_PREFIX = os.getenv('FILE_SENDFILE_URL_PREFIX', '/protected/')
+RESUME_MAX_SIZE = int(os.getenv('RESUME_MAX_SIZE', str(10 * 1024 * 1024)))
+RESUME_ALLOWED_TYPES = os.getenv('RESUME_ALLOWED_TYPES', 'pdf,doc,docx,rtf').split(',')
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', '24'))
+TENDER_DOCUMENT_MAX_SIZE = int(os.getenv('TENDER_DOCUMENT_MAX_SIZE', str(500 * 1024 * 1024)))
+TENDER_DOCUMENT_TYPES = os.getenv('TENDER_DOCUMENT_TYPES', 'pdf,zip').split(',')
+# Tender document downloads are counted in memory and written in batches
+DOWNLOAD_COUNT_FLUSH_EVERY = int(os.getenv('DOWNLOAD_COUNT_FLUSH_EVERY', '100'))
+DOWNLOAD_COUNT_FLUSH_SECONDS = int(os.getenv('DOWNLOAD_COUNT_FLUSH_SECONDS', '30'))
+
+
+# ==================== Static API Snapshots ====================
+# publish_snapshots renders the public read API to SNAPSHOT_ROOT (api/news/index.json,
+# api/news/index.page-2.json, api/news/5/index.json, plus .gz/.br) for nginx or a CDN.
+# SNAPSHOT_AUTO_PUBLISH refreshes the affected files in the background after each change.
+# SNAPSHOT_BASE_URL is the public origin used for pagination links (must be in ALLOWED_HOSTS).
+
+SNAPSHOT_ROOT = Path(os.getenv('SNAPSHOT_ROOT', BASE_DIR / 'snapshots'))
+SNAPSHOT_BASE_URL = os.getenv('SNAPSHOT_BASE_URL', 'http://localhost:8000')
+SNAPSHOT_AUTO_PUBLISH = os.getenv('SNAPSHOT_AUTO_PUBLISH', 'False') == 'True'
+SNAPSHOT_DEBOUNCE_SECONDS = float(os.getenv('SNAPSHOT_DEBOUNCE_SECONDS', '1'))
+
+
+# ==================== Change Feed (SSE) ====================
+# /api/events/ streams contact/application changes to staff when served over ASGI
+# (uvicorn core.asgi:application). One poller per process reads updated_at every
+# SSE_POLL_INTERVAL seconds for all clients; SSE_COMMIT_WINDOW_SECONDS is re-read to
+# catch transactions that commit late. Under WSGI the endpoint answers once and the
+# browser reconnects after SSE_WSGI_RETRY_MS.
+
+SSE_POLL_INTERVAL = float(os.getenv('SSE_POLL_INTERVAL', '1'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_COMMIT_WINDOW_SECONDS = float(os.getenv('SSE_COMMIT_WINDOW_SECONDS', '5'))
+SSE_REPLAY_LIMIT = int(os.getenv('SSE_REPLAY_LIMIT', '1000'))
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', '3000'))
+SSE_WSGI_RETRY_MS = int(os.getenv('SSE_WSGI_RETRY_MS', '30000'))
+
+
+# ==================== Delta Sync ====================
+# List endpoints accept ?updated_since=<cursor> and return only changed rows plus
+# tombstones. Deletions are kept SYNC_TOMBSTONE_RETENTION_DAYS (prune_tombstones);
+# older cursors get 410 Gone and the client refetches the full list.
+
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+SYNC_COMMIT_WINDOW_SECONDS = float(os.getenv('SYNC_COMMIT_WINDOW_SECONDS', '5'))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
+
+# ==================== Email Notifications ====================
+# New contact messages / applications queue an email in the same transaction; the
+# send_notifications worker delivers them. Empty recipient lists disable a kind.
+# Local testing: python -m aiosmtpd -n -l localhost:1025 with EMAIL_PORT=1025.
+
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '10'))
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@bifpcl.com')
+
+NOTIFY_CONTACT_RECIPIENTS = [e.strip() for e in os.getenv('NOTIFY_CONTACT_RECIPIENTS', '').split(',') if e.strip()]
+NOTIFY_APPLICATION_RECIPIENTS = [e.strip() for e in os.getenv('NOTIFY_APPLICATION_RECIPIENTS', '').split(',') if e.strip()]
+NOTIFY_BATCH_SIZE = int(os.getenv('NOTIFY_BATCH_SIZE', '100'))
+NOTIFY_DIGEST_THRESHOLD = int(os.getenv('NOTIFY_DIGEST_THRESHOLD', '5'))  # per kind, within one batch
+NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS', '8'))
+NOTIFY_RETRY_BASE_SECONDS = int(os.getenv('NOTIFY_RETRY_BASE_SECONDS', '30'))
+NOTIFY_RETRY_MAX_SECONDS = int(os.getenv('NOTIFY_RETRY_MAX_SECONDS', '3600'))
+NOTIFY_CLAIM_SECONDS = int(os.getenv('NOTIFY_CLAIM_SECONDS', '300'))
+
+
+# ==================== Background Tasks ====================
+# Tasks are stored in the database and run by: python manage.py run_tasks
+# TASK_WORKER_PROCESSES > 0 adds a process pool for CPU-bound tasks (image rendering).
+
+TASK_WORKER_THREADS = int(os.getenv('TASK_WORKER_THREADS', '4'))
+TASK_WORKER_PROCESSES = int(os.getenv('TASK_WORKER_PROCESSES', '0'))
+TASK_POLL_INTERVAL = float(os.getenv('TASK_POLL_INTERVAL', '1'))
+TASK_LEASE_SECONDS = int(os.getenv('TASK_LEASE_SECONDS', '300'))  # A silent worker's tasks are retried after this
+TASK_RETRY_BASE_SECONDS = int(os.getenv('TASK_RETRY_BASE_SECONDS', '10'))
+TASK_RETRY_MAX_SECONDS = int(os.getenv('TASK_RETRY_MAX_SECONDS', '3600'))
+TASK_RESULT_RETENTION_DAYS = int(os.getenv('TASK_RESULT_RETENTION_DAYS', '7'))
+
+# Registered task name -> seconds between runs
+TASK_PERIODIC = {
+    'api.tasks.send_notifications': int(os.getenv('TASK_NOTIFY_INTERVAL', '30')),
+    'api.tasks.purge_expired_records': 24 * 3600,
+    'api.tasks.archive_submissions': 24 * 3600,
+}
+
+
+# ==================== Archive ====================
+# Read contact messages and reviewed applications older than this move to the archive
+# table (archive_submissions), ARCHIVE_BATCH_SIZE rows per transaction.
+
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '365'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '500'))
+
+
+# ==================== Batched Deletion ====================
+# Admin deletes and delete_batched remove cascades this many rows per transaction; admin
+# deletes larger than one batch are hidden at once and finished by a background task.
+
+DELETE_BATCH_SIZE = int(os.getenv('DELETE_BATCH_SIZE', '500'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
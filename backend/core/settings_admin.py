@@ -0,0 +1,14 @@
+"""
+Admin process profile.
+Run: gunicorn core.wsgi_admin
+
+The full stack (Jazzmin admin, sessions, CSRF, auth, messages) for /admin/
+and for session-authenticated staff calls under /api/. Public API traffic
+is served by the lean API profile (core.settings_api).
+"""
+
+from .settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = 'core.urls_admin'
+
+WSGI_APPLICATION = 'core.wsgi_admin.application'
@@ -0,0 +1,44 @@
+"""
+API-only process profile.
+Run: gunicorn core.wsgi_api (or uvicorn core.asgi_api:application)
+
+Loads only what the anonymous public /api/ needs: no Jazzmin, admin,
+sessions, messages or templates, and a middleware stack without session,
+CSRF, auth or message processing. Staff and admin traffic is served by
+the admin profile (core.settings_admin).
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+
+    # Third-party apps
+    'rest_framework',
+    'corsheaders',
+
+    # Local apps
+    'api',
+]
+
+MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',  # Must be at top
+    'django.middleware.security.SecurityMiddleware',
+    'core.replicas.ReplicaRoutingMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'core.urls_api'
+
+TEMPLATES = []
+
+WSGI_APPLICATION = 'core.wsgi_api.application'
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+}
@@ -5,29 +5,15 @@ Routes API requests to the api app.
 
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import status
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
 
+from api.views import image_variant
 
-@api_view(['GET'])
-def api_root(request):
-    """API root endpoint with documentation."""
-    return Response({
-        'message': 'Power Company API',
-        'version': '1.0',
-        'endpoints': {
-            'tenders': '/api/tenders/',
-            'news': '/api/news/',
-            'careers': '/api/careers/',
-            'contact': '/api/contact/',
-            'stats': '/api/stats/',
-        }
-    })
+from .views import api_root
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('media/variants/<path:path>', image_variant, name='image-variant'),
     path('', api_root, name='api-root'),
 ]
@@ -0,0 +1,12 @@
+"""
+URL configuration for the admin process profile.
+"""
+
+from django.contrib import admin
+from django.urls import path, include
+
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/', include('api.urls')),
+]
@@ -0,0 +1,16 @@
+"""
+URL configuration for the API-only process profile.
+"""
+
+from django.urls import path, include
+
+from api.views import image_variant
+
+from .views import api_root
+
+
+urlpatterns = [
+    path('api/', include('api.urls')),
+    path('media/variants/<path:path>', image_variant, name='image-variant'),
+    path('', api_root, name='api-root'),
+]
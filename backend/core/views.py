@@ -0,0 +1,22 @@
+"""
+Core views shared by the URL configurations.
+"""
+
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+
+@api_view(['GET'])
+def api_root(request):
+    """API root endpoint with documentation."""
+    return Response({
+        'message': 'Power Company API',
+        'version': '1.0',
+        'endpoints': {
+            'tenders': '/api/tenders/',
+            'news': '/api/news/',
+            'careers': '/api/careers/',
+            'contact': '/api/contact/',
+            'stats': '/api/stats/',
+        }
+    })
@@ -0,0 +1,13 @@
+"""
+WSGI config for the admin process profile (core.settings_admin).
+
+It exposes the WSGI callable as a module-level variable named ``application``.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings_admin')
+
+application = get_wsgi_application()
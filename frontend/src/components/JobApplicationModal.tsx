@@ -4,7 +4,7 @@
  */
 
 import { useState, useEffect } from 'react';
-import { submitJobApplication } from '../services/api';
+import { ApiError, submitJobApplication } from '../services/api';
 import type { Career } from '../services/api';
 import './JobApplicationModal.css';
 
@@ -42,6 +42,8 @@ function JobApplicationModal({ job, onClose }: JobApplicationModalProps) {
     const [errors, setErrors] = useState<FormErrors>({});
     const [isSubmitting, setIsSubmitting] = useState(false);
     const [isSuccess, setIsSuccess] = useState(false);
+    // One key per opened form: retries and double clicks are stored only once
+    const [idempotencyKey] = useState(() => crypto.randomUUID());
 
     // Prevent body scroll when modal is open
     useEffect(() => {
@@ -109,9 +111,14 @@ function JobApplicationModal({ job, onClose }: JobApplicationModalProps) {
                 resume_url: formData.resume_url.trim() || undefined,
                 experience_years: parseInt(formData.experience_years) || 0,
                 current_position: formData.current_position.trim() || undefined,
-            });
+            }, idempotencyKey);
             setIsSuccess(true);
         } catch (error) {
+            if (error instanceof ApiError && error.status === 409) {
+                // Already received (duplicate or still processing)
+                setIsSuccess(true);
+                return;
+            }
             console.error('Failed to submit application:', error);
             setErrors({ name: 'Failed to submit. Please try again.' });
         } finally {
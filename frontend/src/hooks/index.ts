@@ -100,4 +100,5 @@ export function useSmoothScroll() {
 
 // Re-export API hooks
 export * from './useApi';
+export * from './useChangeFeed';
 
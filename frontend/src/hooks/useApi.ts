@@ -6,7 +6,7 @@
 import { useState, useEffect } from 'react';
 import {
     getTenders, getNews, getFeaturedNews, getCareers, getProjectStats,
-    getSustainabilityStats, getCSRInitiatives,
+    getSustainabilityStats, getCSRInitiatives, getSustainabilityOverview,
 } from '../services/api';
 import type { Tender, News, Career, ProjectStat, SustainabilityStat, CSRInitiative } from '../services/api';
 
@@ -28,6 +28,13 @@ export function useCSRInitiatives() {
     return useApiData<CSRInitiative[]>(getCSRInitiatives);
 }
 
+/**
+ * Hook to fetch sustainability stats and CSR initiatives in one batched request
+ */
+export function useSustainabilityOverview() {
+    return useApiData<{ stats: SustainabilityStat[]; initiatives: CSRInitiative[] }>(getSustainabilityOverview);
+}
+
 
 // Generic hook for API calls
 function useApiData<T>(fetchFn: () => Promise<T>, dependencies: unknown[] = []) {
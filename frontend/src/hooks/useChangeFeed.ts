@@ -0,0 +1,76 @@
+/**
+ * Live admin updates from the staff change feed (/api/events/, Server-Sent Events).
+ * Replaces refetching whole lists: the browser keeps one connection open, reconnects
+ * on its own and resumes from the last event id it saw.
+ */
+
+import { useEffect, useRef } from 'react';
+
+const API_URL = 'http://localhost:8000/api';
+
+export interface ContactEvent {
+    id: number;
+    name: string;
+    email: string;
+    subject: string;
+    is_read: boolean;
+    created_at: string;
+    updated_at: string;
+}
+
+export interface ApplicationEvent {
+    id: number;
+    career_id: number;
+    career_title: string;
+    name: string;
+    email: string;
+    is_reviewed: boolean;
+    created_at: string;
+    updated_at: string;
+}
+
+export interface FeedStats {
+    tenders: number;
+    open_tenders: number;
+    news: number;
+    careers: number;
+    messages: number;
+    projects: number;
+    board_members: number;
+    applications: number;
+}
+
+export interface ChangeFeedHandlers {
+    contact?: (event: ContactEvent) => void;
+    application?: (event: ApplicationEvent) => void;
+    stats?: (stats: FeedStats) => void;
+    // Too much changed to replay: refetch the lists.
+    reset?: () => void;
+}
+
+export function useChangeFeed(handlers: ChangeFeedHandlers) {
+    const handlersRef = useRef(handlers);
+
+    useEffect(() => {
+        handlersRef.current = handlers;
+    });
+
+    useEffect(() => {
+        // Needs a Django staff session; otherwise the server answers 403 and the page
+        // simply keeps the data it fetched on load.
+        const source = new EventSource(`${API_URL}/events/`, { withCredentials: true });
+
+        const listen = (name: 'contact' | 'application' | 'stats') => {
+            source.addEventListener(name, (event) => {
+                const data = JSON.parse((event as MessageEvent).data);
+                (handlersRef.current[name] as ((data: unknown) => void) | undefined)?.(data);
+            });
+        };
+        listen('contact');
+        listen('application');
+        listen('stats');
+        source.addEventListener('reset', () => handlersRef.current.reset?.());
+
+        return () => source.close();
+    }, []);
+}
@@ -3,7 +3,7 @@ import { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { Header, Footer } from '../components/layout';
 import { COMPANY_INFO } from '../constants';
-import { useSustainabilityStats, useCSRInitiatives } from '../hooks/useApi';
+import { useSustainabilityOverview } from '../hooks/useApi';
 import type { SustainabilityStat, CSRInitiative } from '../services/api';
 import './SustainabilityPage.css';
 
@@ -115,8 +115,9 @@ function ImpactCard({ stat }: { stat: SustainabilityStat & { color: string, suff
 }
 
 function SustainabilityPage() {
-    const { data: stats, loading: statsLoading } = useSustainabilityStats();
-    const { data: csrInitiatives, loading: csrLoading } = useCSRInitiatives();
+    const { data: overview, loading } = useSustainabilityOverview();
+    const stats = overview?.stats;
+    const csrInitiatives = overview?.initiatives;
     const [activeProgram, setActiveProgram] = useState(0);
 
     const mapCategoryIcon = (category: string) => {
@@ -147,7 +148,7 @@ function SustainabilityPage() {
 
     const activeCsr = csrInitiatives && csrInitiatives.length > 0 ? csrInitiatives[activeProgram] : null;
 
-    if (statsLoading || csrLoading) {
+    if (loading) {
         return <div className="loading-screen"><div className="spinner"></div></div>;
     }
 
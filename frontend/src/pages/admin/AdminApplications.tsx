@@ -1,5 +1,7 @@
 // Admin Applications - View job applications
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
+import { useChangeFeed } from '../../hooks/useChangeFeed';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -24,25 +26,47 @@ function AdminApplications() {
     const [selectedApp, setSelectedApp] = useState<Application | null>(null);
     const [filter, setFilter] = useState<'all' | 'pending' | 'reviewed'>('all');
 
+    const fetchApplications = useCallback(async () => {
+        try {
+            const res = await pinnedFetch(`${API_URL}/applications/`);
+            const data = await res.json();
+            const appsData = data.results || data || [];
+            setApplications(appsData);
+        } catch (error) {
+            console.error('Error fetching applications:', error);
+        } finally {
+            setLoading(false);
+        }
+    }, []);
+
     useEffect(() => {
-        const fetchApplications = async () => {
+        fetchApplications();
+    }, [fetchApplications]);
+
+    // Live updates: merge changed applications, fetch the full record of new ones.
+    useChangeFeed({
+        application: async (event) => {
+            const { career_id, ...fields } = event;
+            if (applications.some(a => a.id === event.id)) {
+                setApplications(current => current.map(a => (
+                    a.id === event.id ? { ...a, ...fields, career: career_id } : a
+                )));
+                return;
+            }
             try {
-                const res = await fetch(`${API_URL}/applications/`);
-                const data = await res.json();
-                const appsData = data.results || data || [];
-                setApplications(appsData);
+                const res = await pinnedFetch(`${API_URL}/applications/${event.id}/`);
+                const application: Application = await res.json();
+                setApplications(current => [application, ...current.filter(a => a.id !== application.id)]);
             } catch (error) {
-                console.error('Error fetching applications:', error);
-            } finally {
-                setLoading(false);
+                console.error('Error fetching application:', error);
             }
-        };
-        fetchApplications();
-    }, []);
+        },
+        reset: fetchApplications,
+    });
 
     const markAsReviewed = async (id: number) => {
         try {
-            await fetch(`${API_URL}/applications/${id}/mark_reviewed/`, { method: 'POST' });
+            await pinnedFetch(`${API_URL}/applications/${id}/mark_reviewed/`, { method: 'POST' });
             setApplications(applications.map(a =>
                 a.id === id ? { ...a, is_reviewed: true } : a
             ));
@@ -57,7 +81,7 @@ function AdminApplications() {
     const deleteApplication = async (id: number) => {
         if (confirm('Are you sure you want to delete this application?')) {
             try {
-                await fetch(`${API_URL}/applications/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/applications/${id}/`, { method: 'DELETE' });
                 setApplications(applications.filter(a => a.id !== id));
                 if (selectedApp?.id === id) setSelectedApp(null);
             } catch (error) {
@@ -1,5 +1,6 @@
 // Admin Board Members Management
 import { useState, useEffect } from 'react';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -35,7 +36,7 @@ function AdminBoard() {
 
     const fetchMembers = async () => {
         try {
-            const res = await fetch(`${API_URL}/board/`);
+            const res = await pinnedFetch(`${API_URL}/board/`);
             const data = await res.json();
             setMembers(data.results || data || []);
         } catch (error) {
@@ -49,7 +50,7 @@ function AdminBoard() {
         e.preventDefault();
         try {
             if (editingItem) {
-                const res = await fetch(`${API_URL}/board/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/board/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -57,7 +58,7 @@ function AdminBoard() {
                 const updated = await res.json();
                 setMembers(members.map(m => m.id === editingItem.id ? updated : m));
             } else {
-                const res = await fetch(`${API_URL}/board/`, {
+                const res = await pinnedFetch(`${API_URL}/board/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -89,7 +90,7 @@ function AdminBoard() {
     const handleDelete = async (id: number) => {
         if (confirm('Delete this board member?')) {
             try {
-                await fetch(`${API_URL}/board/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/board/${id}/`, { method: 'DELETE' });
                 setMembers(members.filter(m => m.id !== id));
             } catch (error) {
                 console.error('Error deleting board member:', error);
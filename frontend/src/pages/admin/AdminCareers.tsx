@@ -1,5 +1,6 @@
 // Admin Careers Management
 import { useState, useEffect } from 'react';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -48,7 +49,7 @@ function AdminCareers() {
 
     const fetchCareers = async () => {
         try {
-            const res = await fetch(`${API_URL}/careers/`);
+            const res = await pinnedFetch(`${API_URL}/careers/`);
             const data = await res.json();
             setCareers(data.results || data || []);
         } catch (error) {
@@ -62,7 +63,7 @@ function AdminCareers() {
         e.preventDefault();
         try {
             if (editingItem) {
-                const res = await fetch(`${API_URL}/careers/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/careers/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -70,7 +71,7 @@ function AdminCareers() {
                 const updated = await res.json();
                 setCareers(careers.map(c => c.id === editingItem.id ? updated : c));
             } else {
-                const res = await fetch(`${API_URL}/careers/`, {
+                const res = await pinnedFetch(`${API_URL}/careers/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -104,7 +105,7 @@ function AdminCareers() {
     const handleDelete = async (id: number) => {
         if (confirm('Are you sure you want to delete this job posting?')) {
             try {
-                await fetch(`${API_URL}/careers/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/careers/${id}/`, { method: 'DELETE' });
                 setCareers(careers.filter(item => item.id !== id));
             } catch (error) {
                 console.error('Error deleting career:', error);
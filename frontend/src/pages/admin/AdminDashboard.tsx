@@ -1,6 +1,8 @@
 // Admin Dashboard - Overview with stats and quick actions
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
+import { useChangeFeed } from '../../hooks/useChangeFeed';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -39,16 +41,28 @@ function AdminDashboard() {
         fetchDashboardData();
     }, []);
 
+    // Counters pushed by the server after every inbox change, instead of refetching six lists.
+    useChangeFeed({
+        stats: (live) => setStats(current => ({
+            ...current,
+            news: live.news,
+            tenders: live.tenders,
+            careers: live.careers,
+            projects: live.projects,
+            board: live.board_members,
+        })),
+    });
+
     const fetchDashboardData = async () => {
         try {
             // Fetch stats from various endpoints
             const [newsRes, tendersRes, careersRes, projectsRes, boardRes, messagesRes] = await Promise.all([
-                fetch(`${API_URL}/news/`),
-                fetch(`${API_URL}/tenders/`),
-                fetch(`${API_URL}/careers/`),
-                fetch(`${API_URL}/projects/`),
-                fetch(`${API_URL}/board/`),
-                fetch(`${API_URL}/contact/`),
+                pinnedFetch(`${API_URL}/news/`),
+                pinnedFetch(`${API_URL}/tenders/`),
+                pinnedFetch(`${API_URL}/careers/`),
+                pinnedFetch(`${API_URL}/projects/`),
+                pinnedFetch(`${API_URL}/board/`),
+                pinnedFetch(`${API_URL}/contact/`),
             ]);
 
             const newsData = await newsRes.json();
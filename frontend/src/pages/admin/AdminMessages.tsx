@@ -1,6 +1,8 @@
 // Admin Messages - View contact form submissions
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { useOutletContext } from 'react-router-dom';
+import { useChangeFeed } from '../../hooks/useChangeFeed';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -23,27 +25,47 @@ function AdminMessages() {
 
     const context = useOutletContext<{ setUnreadMessages: (count: number) => void }>();
 
+    const fetchMessages = useCallback(async () => {
+        try {
+            const res = await pinnedFetch(`${API_URL}/contact/`);
+            const data = await res.json();
+            const messagesData = data.results || data || [];
+            setMessages(messagesData);
+            const unreadCount = messagesData.filter((m: Message) => !m.is_read).length;
+            context?.setUnreadMessages?.(unreadCount);
+        } catch (error) {
+            console.error('Error fetching messages:', error);
+        } finally {
+            setLoading(false);
+        }
+    }, [context]);
+
     useEffect(() => {
-        const fetchMessages = async () => {
+        fetchMessages();
+    }, [fetchMessages]);
+
+    // Live updates: merge changed messages, fetch the full body of new ones.
+    useChangeFeed({
+        contact: async (event) => {
+            if (messages.some(m => m.id === event.id)) {
+                setMessages(current => current.map(m => (m.id === event.id ? { ...m, ...event } : m)));
+                return;
+            }
             try {
-                const res = await fetch(`${API_URL}/contact/`);
-                const data = await res.json();
-                const messagesData = data.results || data || [];
-                setMessages(messagesData);
-                const unreadCount = messagesData.filter((m: Message) => !m.is_read).length;
-                context?.setUnreadMessages?.(unreadCount);
+                const res = await pinnedFetch(`${API_URL}/contact/${event.id}/`);
+                const message: Message = await res.json();
+                setMessages(current => [message, ...current.filter(m => m.id !== message.id)]);
             } catch (error) {
-                console.error('Error fetching messages:', error);
-            } finally {
-                setLoading(false);
+                console.error('Error fetching message:', error);
             }
-        };
-        fetchMessages();
-    }, [context]);
+        },
+        stats: (stats) => context?.setUnreadMessages?.(stats.messages),
+        reset: fetchMessages,
+    });
 
     const markAsRead = async (id: number) => {
         try {
-            await fetch(`${API_URL}/contact/${id}/mark_read/`, { method: 'POST' });
+            await pinnedFetch(`${API_URL}/contact/${id}/mark_read/`, { method: 'POST' });
             setMessages(messages.map(m =>
                 m.id === id ? { ...m, is_read: true } : m
             ));
@@ -57,7 +79,7 @@ function AdminMessages() {
     const deleteMessage = async (id: number) => {
         if (confirm('Are you sure you want to delete this message?')) {
             try {
-                await fetch(`${API_URL}/contact/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/contact/${id}/`, { method: 'DELETE' });
                 const msg = messages.find(m => m.id === id);
                 setMessages(messages.filter(m => m.id !== id));
                 if (msg && !msg.is_read) {
@@ -1,5 +1,6 @@
 // Admin News Management - CRUD operations for news articles
 import { useState, useEffect } from 'react';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -36,7 +37,7 @@ function AdminNews() {
 
     const fetchNews = async () => {
         try {
-            const res = await fetch(`${API_URL}/news/`);
+            const res = await pinnedFetch(`${API_URL}/news/`);
             const data = await res.json();
             setNews(data.results || data || []);
         } catch (error) {
@@ -50,7 +51,7 @@ function AdminNews() {
         e.preventDefault();
         try {
             if (editingItem) {
-                const res = await fetch(`${API_URL}/news/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/news/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -58,7 +59,7 @@ function AdminNews() {
                 const updated = await res.json();
                 setNews(news.map(n => n.id === editingItem.id ? updated : n));
             } else {
-                const res = await fetch(`${API_URL}/news/`, {
+                const res = await pinnedFetch(`${API_URL}/news/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -89,7 +90,7 @@ function AdminNews() {
     const handleDelete = async (id: number) => {
         if (confirm('Are you sure you want to delete this article?')) {
             try {
-                await fetch(`${API_URL}/news/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/news/${id}/`, { method: 'DELETE' });
                 setNews(news.filter(item => item.id !== id));
             } catch (error) {
                 console.error('Error deleting news:', error);
@@ -1,5 +1,6 @@
 // Admin Projects Management
 import { useState, useEffect } from 'react';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -49,7 +50,7 @@ function AdminProjects() {
 
     const fetchProjects = async () => {
         try {
-            const res = await fetch(`${API_URL}/projects/`);
+            const res = await pinnedFetch(`${API_URL}/projects/`);
             const data = await res.json();
             setProjects(data.results || data || []);
         } catch (error) {
@@ -63,7 +64,7 @@ function AdminProjects() {
         e.preventDefault();
         try {
             if (editingItem) {
-                const res = await fetch(`${API_URL}/projects/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/projects/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -71,7 +72,7 @@ function AdminProjects() {
                 const updated = await res.json();
                 setProjects(projects.map(p => p.id === editingItem.id ? updated : p));
             } else {
-                const res = await fetch(`${API_URL}/projects/`, {
+                const res = await pinnedFetch(`${API_URL}/projects/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -100,7 +101,7 @@ function AdminProjects() {
     const handleDelete = async (id: number) => {
         if (confirm('Delete this project?')) {
             try {
-                await fetch(`${API_URL}/projects/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/projects/${id}/`, { method: 'DELETE' });
                 setProjects(projects.filter(p => p.id !== id));
             } catch (error) {
                 console.error('Error deleting project:', error);
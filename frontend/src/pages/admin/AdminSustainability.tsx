@@ -1,5 +1,6 @@
 // Admin Sustainability Management
 import { useState, useEffect } from 'react';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -53,8 +54,8 @@ function AdminSustainability() {
     const fetchData = async () => {
         try {
             const [statsRes, csrRes] = await Promise.all([
-                fetch(`${API_URL}/sustainability/`),
-                fetch(`${API_URL}/csr/`)
+                pinnedFetch(`${API_URL}/sustainability/`),
+                pinnedFetch(`${API_URL}/csr/`)
             ]);
             const statsData = await statsRes.json();
             const csrData = await csrRes.json();
@@ -71,7 +72,7 @@ function AdminSustainability() {
         e.preventDefault();
         try {
             if (editingItem?.id) {
-                const res = await fetch(`${API_URL}/sustainability/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/sustainability/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...statForm, is_active: true })
@@ -79,7 +80,7 @@ function AdminSustainability() {
                 const updated = await res.json();
                 setStats(stats.map(s => s.id === editingItem.id ? updated : s));
             } else {
-                const res = await fetch(`${API_URL}/sustainability/`, {
+                const res = await pinnedFetch(`${API_URL}/sustainability/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...statForm, is_active: true })
@@ -99,7 +100,7 @@ function AdminSustainability() {
         e.preventDefault();
         try {
             if (editingItem?.id) {
-                const res = await fetch(`${API_URL}/csr/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/csr/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...csrForm, is_active: true })
@@ -107,7 +108,7 @@ function AdminSustainability() {
                 const updated = await res.json();
                 setCSR(csr.map(c => c.id === editingItem.id ? updated : c));
             } else {
-                const res = await fetch(`${API_URL}/csr/`, {
+                const res = await pinnedFetch(`${API_URL}/csr/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...csrForm, is_active: true })
@@ -139,7 +140,7 @@ function AdminSustainability() {
         if (confirm('Delete this item?')) {
             try {
                 const endpoint = type === 'stat' ? 'sustainability' : 'csr';
-                await fetch(`${API_URL}/${endpoint}/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/${endpoint}/${id}/`, { method: 'DELETE' });
                 if (type === 'stat') setStats(stats.filter(s => s.id !== id));
                 else setCSR(csr.filter(c => c.id !== id));
             } catch (error) {
@@ -1,5 +1,6 @@
 // Admin Tenders Management
 import { useState, useEffect } from 'react';
+import { pinnedFetch } from '../../services/api';
 
 const API_URL = 'http://localhost:8000/api';
 
@@ -44,7 +45,7 @@ function AdminTenders() {
 
     const fetchTenders = async () => {
         try {
-            const res = await fetch(`${API_URL}/tenders/`);
+            const res = await pinnedFetch(`${API_URL}/tenders/`);
             const data = await res.json();
             setTenders(data.results || data || []);
         } catch (error) {
@@ -58,7 +59,7 @@ function AdminTenders() {
         e.preventDefault();
         try {
             if (editingItem) {
-                const res = await fetch(`${API_URL}/tenders/${editingItem.id}/`, {
+                const res = await pinnedFetch(`${API_URL}/tenders/${editingItem.id}/`, {
                     method: 'PUT',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -66,7 +67,7 @@ function AdminTenders() {
                 const updated = await res.json();
                 setTenders(tenders.map(t => t.id === editingItem.id ? updated : t));
             } else {
-                const res = await fetch(`${API_URL}/tenders/`, {
+                const res = await pinnedFetch(`${API_URL}/tenders/`, {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({ ...formData, is_active: true })
@@ -98,7 +99,7 @@ function AdminTenders() {
     const handleDelete = async (id: number) => {
         if (confirm('Are you sure you want to delete this tender?')) {
             try {
-                await fetch(`${API_URL}/tenders/${id}/`, { method: 'DELETE' });
+                await pinnedFetch(`${API_URL}/tenders/${id}/`, { method: 'DELETE' });
                 setTenders(tenders.filter(item => item.id !== id));
             } catch (error) {
                 console.error('Error deleting tender:', error);
@@ -13,6 +13,7 @@ export interface Tender {
     description: string;
     reference_number: string;
     deadline: string;
+    status: 'open' | 'closed';
     document_url: string | null;
     category: 'goods' | 'works' | 'services' | 'consultancy';
     created_at: string;
@@ -37,6 +38,7 @@ export interface Career {
     requirements: string;
     job_type: 'full_time' | 'part_time' | 'contract' | 'internship';
     deadline: string;
+    status: 'open' | 'closed';
     vacancies: number;
     created_at: string;
 }
@@ -64,10 +66,12 @@ export interface Project {
     location: string;
     description: string;
     capacity: string;
+    capacity_mw: string | null;
     status: 'operational' | 'construction' | 'planning' | 'maintenance';
     category: 'coal' | 'solar' | 'wind' | 'hydro' | 'transmission';
     image_url: string | null;
     efficiency: string;
+    efficiency_percent: string | null;
     is_featured: boolean;
     created_at: string;
 }
@@ -80,9 +84,37 @@ interface PaginatedResponse<T> {
     results: T[];
 }
 
+// Error thrown for non-2xx responses; status lets callers tell e.g. 409 apart
+export class ApiError extends Error {
+    status: number;
+
+    constructor(status: number, statusText: string) {
+        super(`API Error: ${status} ${statusText}`);
+        this.status = status;
+    }
+}
+
+// Read-your-writes token: the backend returns DB-Pin after a write and reads from the
+// primary database (not a replica) while it is sent back, for a few seconds.
+let dbPin: string | null = null;
+
+// fetch() that echoes the DB-Pin token; use it for every API call
+export async function pinnedFetch(input: string, init?: RequestInit): Promise<Response> {
+    const headers = new Headers(init?.headers);
+    if (dbPin) {
+        headers.set('DB-Pin', dbPin);
+    }
+    const response = await fetch(input, { ...init, headers });
+    const pin = response.headers.get('DB-Pin');
+    if (pin) {
+        dbPin = pin;
+    }
+    return response;
+}
+
 // Generic fetch wrapper with error handling
 async function apiFetch<T>(endpoint: string, options?: RequestInit): Promise<T> {
-    const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+    const response = await pinnedFetch(`${API_BASE_URL}${endpoint}`, {
         ...options,
         headers: {
             'Content-Type': 'application/json',
@@ -91,7 +123,7 @@ async function apiFetch<T>(endpoint: string, options?: RequestInit): Promise<T>
     });
 
     if (!response.ok) {
-        throw new Error(`API Error: ${response.status} ${response.statusText}`);
+        throw new ApiError(response.status, response.statusText);
     }
 
     return response.json();
@@ -146,10 +178,10 @@ export async function getNewsArticle(id: number): Promise<News> {
 }
 
 /**
- * Get all job openings
+ * Get job openings that are still accepting applications
  */
 export async function getCareers(): Promise<Career[]> {
-    const data = await apiFetch<PaginatedResponse<Career> | Career[]>('/careers/');
+    const data = await apiFetch<PaginatedResponse<Career> | Career[]>('/careers/open/');
     return extractResults(data);
 }
 
@@ -161,12 +193,14 @@ export async function getCareer(id: number): Promise<Career> {
 }
 
 /**
- * Submit contact form
+ * Submit contact form. Pass the same idempotencyKey when retrying so the
+ * message is only stored once.
  */
-export async function submitContactForm(data: ContactMessage): Promise<{ id: number }> {
+export async function submitContactForm(data: ContactMessage, idempotencyKey?: string): Promise<{ id: number }> {
     return apiFetch('/contact/', {
         method: 'POST',
         body: JSON.stringify(data),
+        headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
     });
 }
 
@@ -241,6 +275,50 @@ export async function getFeaturedProjects(): Promise<Project[]> {
 }
 
 
+// ==================== Batched Reads ====================
+
+export interface BatchItem<T = unknown> {
+    status: number;
+    body: T;
+    cache_control?: string;
+}
+
+/**
+ * Run several GETs in one round trip. Paths are relative to the API root ('/csr/').
+ * Results are keyed by the same paths.
+ */
+export async function batchGet(paths: string[]): Promise<Record<string, BatchItem>> {
+    const query = paths.map(path => `path=${encodeURIComponent(`/api${path}`)}`).join('&');
+    const data = await apiFetch<{ results: Record<string, BatchItem> }>(`/batch/?${query}`);
+    const results: Record<string, BatchItem> = {};
+    for (const path of paths) {
+        results[path] = data.results[`/api${path}`];
+    }
+    return results;
+}
+
+function batchResults<T>(item: BatchItem | undefined): T[] {
+    if (!item || item.status !== 200) {
+        throw new Error(`API Error: ${item?.status ?? 'missing'}`);
+    }
+    return extractResults(item.body as PaginatedResponse<T> | T[]);
+}
+
+/**
+ * Sustainability stats and CSR initiatives in one request
+ */
+export async function getSustainabilityOverview(): Promise<{
+    stats: SustainabilityStat[];
+    initiatives: CSRInitiative[];
+}> {
+    const results = await batchGet(['/sustainability/', '/csr/']);
+    return {
+        stats: batchResults<SustainabilityStat>(results['/sustainability/']),
+        initiatives: batchResults<CSRInitiative>(results['/csr/']),
+    };
+}
+
+
 // ==================== Job Application ====================
 
 export interface JobApplicationData {
@@ -255,11 +333,13 @@ export interface JobApplicationData {
 }
 
 /**
- * Submit a job application
+ * Submit a job application. Pass the same idempotencyKey when retrying so the
+ * application is only stored once.
  */
-export async function submitJobApplication(data: JobApplicationData): Promise<{ id: number }> {
+export async function submitJobApplication(data: JobApplicationData, idempotencyKey?: string): Promise<{ id: number }> {
     return apiFetch('/applications/', {
         method: 'POST',
         body: JSON.stringify(data),
+        headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
     });
 }